@@ -0,0 +1,179 @@
+"""
+Benchmark results shared by the project suites: timing helpers, a JSON
+lines history stamped with the git commit, and the command line every
+suite's `main` runs.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_RESULTS = "benchmark_results.jsonl"
+
+
+@dataclass
+class Result:
+    """One benchmark number; `higher_is_better` for throughputs, not latencies."""
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool = False
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+def time_calls(fn: Callable[[], Any], repeat: int, warmup: int = 1) -> List[float]:
+    """Seconds taken by each of `repeat` calls, after `warmup` untimed ones."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def median_ms(timings: List[float]) -> float:
+    return statistics.median(timings) * 1000
+
+
+def git_revision() -> Tuple[Optional[str], bool]:
+    """(short commit, working tree has changes), or (None, False) outside git."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True
+        ).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+
+def machine() -> str:
+    """Results are only compared with runs on the same kind of machine."""
+    return f"{platform.system()}/{platform.machine()}/{os.cpu_count()}cpu/py{platform.python_version()}"
+
+
+class ResultStore:
+    """
+    Benchmark history in a JSON lines file, one line per result.
+
+    Every run is stamped with the git commit, so `compare` can show how the
+    current run moved against the latest run of another commit with the
+    same fake-model profile on the same kind of machine.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    @staticmethod
+    def new_run(suite: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Stamp for one suite run: commit, machine and the fake-model profile used."""
+        commit, dirty = git_revision()
+        return {
+            "suite": suite,
+            "commit": commit,
+            "dirty": dirty,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "machine": machine(),
+            "profile": profile,
+        }
+
+    def append(self, run: Dict[str, Any], results: List[Result]):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for result in results:
+                f.write(json.dumps({**run, **asdict(result)}, ensure_ascii=False) + "\n")
+
+    def baseline(self, run: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Latest stored result per benchmark from another commit; empty if there is none."""
+        earlier = [
+            r for r in self.load()
+            if r["suite"] == run["suite"] and r["machine"] == run["machine"] and r["profile"] == run["profile"]
+            and r["commit"] != run["commit"]
+        ]
+        return {r["name"]: r for r in earlier}
+
+    def compare(self, run: Dict[str, Any], results: List[Result], threshold: float = 0.10) -> List[Dict[str, Any]]:
+        """
+        Rows of name, value, baseline, relative change and whether it
+        regressed past `threshold`; call it before `append`.
+        """
+        baseline = self.baseline(run)
+        rows = []
+        for result in results:
+            before = baseline.get(result.name)
+            change = None
+            regressed = False
+            if before and before["value"]:
+                change = (result.value - before["value"]) / before["value"]
+                worse = -change if result.higher_is_better else change
+                regressed = worse > threshold
+            rows.append({
+                "name": result.name, "value": result.value, "unit": result.unit,
+                "baseline": before["value"] if before else None,
+                "baseline_commit": before["commit"] if before else None,
+                "change": change, "regressed": regressed,
+            })
+        return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]]):
+    print(f"{'benchmark':<34} {'value':>12} {'unit':<10} {'baseline':>12} {'change':>8}")
+    for row in rows:
+        baseline = "" if row["baseline"] is None else f"{row['baseline']:.2f}"
+        change = "" if row["change"] is None else f"{row['change'] * 100:+.1f}%"
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(f"{row['name']:<34} {row['value']:>12.2f} {row['unit']:<10} {baseline:>12} {change:>8}{flag}")
+
+
+def parse_args(description: str, repeat: int = 5, argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake model seconds per call")
+    parser.add_argument("--repeat", type=int, default=repeat)
+    parser.add_argument("--results", default=os.environ.get("BENCHMARK_RESULTS", DEFAULT_RESULTS))
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change counted as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(
+    suite: str,
+    run_suite: Callable[[float, int], List[Result]],
+    description: str,
+    repeat: int = 5,
+    argv: Optional[Sequence[str]] = None,
+) -> int:
+    """
+    Run `run_suite(latency, repeat)`, compare it with the stored baseline
+    and append it to the results file; the exit code is 1 on a regression
+    when --fail-on-regression is given.
+    """
+    args = parse_args(description, repeat, argv)
+    store = ResultStore(args.results)
+    run = store.new_run(suite, {"latency": args.latency, "repeat": args.repeat})
+
+    results = run_suite(args.latency, args.repeat)
+    rows = store.compare(run, results, args.threshold)
+    store.append(run, results)
+
+    print(f"suite={suite} commit={run['commit']}{'+dirty' if run['dirty'] else ''} latency={args.latency * 1000:.0f}ms")
+    print_comparison(rows)
+    print(f"results appended to {args.results}")
+    return 1 if args.fail_on_regression and any(row["regressed"] for row in rows) else 0
@@ -0,0 +1,85 @@
+import json
+
+import benchmark_results as results_module
+from benchmark_results import Result, ResultStore, main
+
+
+def run_at(monkeypatch, commit, profile=None):
+    monkeypatch.setattr(results_module, "git_revision", lambda: (commit, False))
+    return ResultStore.new_run("hello", profile or {"latency": 0.05})
+
+
+def test_first_run_has_no_baseline(tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path / "results.jsonl"))
+    run = run_at(monkeypatch, "aaa")
+
+    (row,) = store.compare(run, [Result("graph_invoke", 60.0, "ms")])
+
+    assert row["baseline"] is None
+    assert row["regressed"] is False
+
+
+def test_compares_with_the_latest_run_of_another_commit(tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path / "results.jsonl"))
+    store.append(run_at(monkeypatch, "aaa"), [Result("graph_invoke", 50.0, "ms")])
+    store.append(run_at(monkeypatch, "bbb"), [Result("graph_invoke", 60.0, "ms")])
+    store.append(run_at(monkeypatch, "ccc"), [Result("graph_invoke", 40.0, "ms")])
+
+    run = run_at(monkeypatch, "ccc")
+    (row,) = store.compare(run, [Result("graph_invoke", 45.0, "ms")])
+
+    assert row["baseline"] == 60.0
+    assert row["baseline_commit"] == "bbb"
+    assert row["change"] == -0.25
+    assert row["regressed"] is False
+
+
+def test_regression_direction_depends_on_the_metric(tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path / "results.jsonl"))
+    store.append(run_at(monkeypatch, "aaa"), [
+        Result("graph_invoke", 50.0, "ms"),
+        Result("throughput", 100.0, "sessions/s", higher_is_better=True),
+    ])
+
+    rows = store.compare(run_at(monkeypatch, "bbb"), [
+        Result("graph_invoke", 60.0, "ms"),
+        Result("throughput", 95.0, "sessions/s", higher_is_better=True),
+    ], threshold=0.10)
+
+    assert [row["regressed"] for row in rows] == [True, False]
+
+
+def test_runs_with_another_profile_are_not_compared(tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path / "results.jsonl"))
+    store.append(run_at(monkeypatch, "aaa", {"latency": 0.2}), [Result("graph_invoke", 250.0, "ms")])
+
+    (row,) = store.compare(run_at(monkeypatch, "bbb"), [Result("graph_invoke", 60.0, "ms")])
+
+    assert row["baseline"] is None
+
+
+def test_runs_of_the_same_commit_are_not_a_baseline(tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path / "results.jsonl"))
+    store.append(run_at(monkeypatch, "aaa"), [Result("graph_invoke", 50.0, "ms")])
+
+    (row,) = store.compare(run_at(monkeypatch, "aaa"), [Result("graph_invoke", 80.0, "ms")])
+
+    assert row["baseline"] is None
+    assert row["regressed"] is False
+
+
+def test_main_stores_results_and_fails_on_regression(tmp_path, monkeypatch):
+    path = str(tmp_path / "results.jsonl")
+    argv = ["--results", path, "--latency", "0", "--fail-on-regression"]
+
+    run_at(monkeypatch, "aaa")
+    assert main("hello", lambda latency, repeat: [Result("graph_invoke", 50.0, "ms")], "test", argv=argv) == 0
+    run_at(monkeypatch, "bbb")
+    assert main("hello", lambda latency, repeat: [Result("graph_invoke", 80.0, "ms")], "test", argv=argv) == 1
+
+    with open(path, encoding="utf-8") as f:
+        stored = [json.loads(line) for line in f]
+    assert [(r["commit"], r["value"], r["profile"]) for r in stored] == [
+        ("aaa", 50.0, {"latency": 0.0, "repeat": 5}),
+        ("bbb", 80.0, {"latency": 0.0, "repeat": 5}),
+    ]
@@ -0,0 +1,88 @@
+"""
+Per-invoke overhead of the hello graph's LLM node, offline.
+
+Run with:
+
+    python -m src.hello.benchmark
+
+The chat model talks to an in-process httpx MockTransport that returns a
+canned GreetingsResponse, so what is measured is model construction, schema
+binding and request/response handling — not network or generation time.
+"""
+
+import json
+import os
+import time
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from . import main_graph
+
+CANNED_RESPONSE = {
+    "id": "chatcmpl-benchmark",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-mini",
+    "choices": [
+        {
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {
+                "role": "assistant",
+                "content": json.dumps(
+                    {"greeting": "Oi!", "news": "The fly won the olimpic medal", "chat": "Uma mosca?"}
+                ),
+            },
+        }
+    ],
+    "usage": {"prompt_tokens": 120, "completion_tokens": 30, "total_tokens": 150},
+}
+
+
+def fake_http_client() -> httpx.Client:
+    return httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=CANNED_RESPONSE)))
+
+
+def fake_create_model(http_client: httpx.Client):
+    def create_model():
+        return ChatOpenAI(model="gpt-4o-mini", temperature=0.5, timeout=10, http_client=http_client)
+    return create_model
+
+
+def time_per_call(fn, runs: int) -> float:
+    fn()  # warm imports and caches
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) / runs
+
+
+def main(runs: int = 200):
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    http_client = fake_http_client()
+    main_graph.create_model = fake_create_model(http_client)
+
+    state = {
+        "messages": [{"role": "user", "content": "Oi"}],
+        "location": "Brazil",
+        "news": "The fly won the olimpic medal",
+    }
+
+    per_call = time_per_call(lambda: main_graph.node_llm_response(state), runs)
+
+    shared = main_graph.create_structured_model()
+    reused = time_per_call(lambda: main_graph.node_llm_response(state, structured_llm=shared), runs)
+
+    app = main_graph.build_graph()
+    graph = time_per_call(lambda: app.invoke({"messages": [{"role": "user", "content": "Oi"}]}), runs)
+
+    print(f"runs={runs}")
+    print(f"llm node, model built per call: {per_call * 1000:8.3f} ms")
+    print(f"llm node, shared model:         {reused * 1000:8.3f} ms")
+    print(f"full graph invoke (shared):     {graph * 1000:8.3f} ms")
+    print(f"overhead saved per invoke:      {(per_call - reused) * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
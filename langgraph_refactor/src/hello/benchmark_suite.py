@@ -0,0 +1,136 @@
+"""
+End-to-end benchmark suite for the hello graph and agent, with stored results.
+
+Run with:
+
+    python -m src.hello.benchmark_suite [--latency 0.05] [--fail-on-regression]
+
+The chat model is a real ChatOpenAI talking to an in-process httpx
+MockTransport that waits a fixed latency per call (the fake-model
+profile) and answers like the API would: the graph gets a GreetingsResponse,
+the agent gets scripted tool calls, then its structured response. Results
+are appended to benchmark_results.jsonl (or --results / BENCHMARK_RESULTS)
+with the git commit, and each run is compared with the latest run of
+another commit using the same profile.
+
+To drive the real entry points under load instead, record a cassette with
+hello.llm_server and point BASE_URL at it.
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Callable, List
+
+import httpx
+from langchain.agents import create_agent
+from langchain.agents.structured_output import ToolStrategy
+from langchain_openai import ChatOpenAI
+
+import benchmark_results
+from benchmark_results import Result, median_ms, time_calls
+
+from . import main_graph
+from .benchmark import CANNED_RESPONSE
+from .schemas import GreetingsResponse
+from .tools import get_local_news, get_user_location
+
+SUITE = "hello"
+INPUT = {"messages": [{"role": "user", "content": "Oi"}]}
+
+# Tool calls the fake model makes, in order, before answering
+AGENT_SCRIPT = [
+    ("get_user_location", {"user_greeting": "Oi"}),
+    ("get_local_news", {"city": "Brazil"}),
+    ("GreetingsResponse", json.loads(CANNED_RESPONSE["choices"][0]["message"]["content"])),
+]
+
+
+def agent_reply(request: httpx.Request) -> dict:
+    """Next scripted tool call, picked by how many tool results the request already has."""
+    messages = json.loads(request.content)["messages"]
+    step = min(sum(m["role"] == "tool" for m in messages), len(AGENT_SCRIPT) - 1)
+    name, arguments = AGENT_SCRIPT[step]
+    call = {"id": f"call_{step}", "type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}}
+    return {
+        **CANNED_RESPONSE,
+        "choices": [{"index": 0, "finish_reason": "tool_calls",
+                     "message": {"role": "assistant", "content": None, "tool_calls": [call]}}],
+    }
+
+
+def fake_model(latency: float, reply: Callable[[httpx.Request], dict] = lambda request: CANNED_RESPONSE) -> ChatOpenAI:
+    def handle(request):
+        time.sleep(latency)
+        return httpx.Response(200, json=reply(request))
+
+    async def ahandle(request):
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json=reply(request))
+
+    return ChatOpenAI(
+        model="gpt-4o-mini", temperature=0.5, timeout=10,
+        http_client=httpx.Client(transport=httpx.MockTransport(handle)),
+        http_async_client=httpx.AsyncClient(transport=httpx.MockTransport(ahandle)),
+    )
+
+
+def build_agent(model):
+    return create_agent(
+        model=model,
+        system_prompt=main_graph.SYSTEM_PROMPT,
+        tools=[get_user_location, get_local_news],
+        response_format=ToolStrategy(GreetingsResponse),
+    )
+
+
+async def sessions_per_second(app, sessions: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def session():
+        async with semaphore:
+            await app.ainvoke(INPUT)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(sessions)))
+    return sessions / (time.perf_counter() - start)
+
+
+def run_suite(latency: float, repeat: int) -> List[Result]:
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    instant, profiled = fake_model(0.0), fake_model(latency)
+    profiled_agent_model = fake_model(latency, agent_reply)
+    results = []
+
+    timings = time_calls(lambda: main_graph.build_graph(instant), repeat)
+    results.append(Result("graph_build", median_ms(timings), "ms"))
+
+    timings = time_calls(lambda: build_agent(instant), repeat)
+    results.append(Result("agent_build", median_ms(timings), "ms"))
+
+    app = main_graph.build_graph(instant)
+    timings = time_calls(lambda: app.invoke(INPUT), repeat * 5)
+    results.append(Result("graph_invoke_overhead", median_ms(timings), "ms"))
+
+    app = main_graph.build_graph(profiled)
+    timings = time_calls(lambda: app.invoke(INPUT), repeat)
+    results.append(Result("graph_invoke", median_ms(timings), "ms", params={"llm_calls": 1}))
+
+    agent = build_agent(profiled_agent_model)
+    timings = time_calls(lambda: agent.invoke(INPUT), repeat)
+    results.append(Result("agent_invoke", median_ms(timings), "ms", params={"llm_calls": len(AGENT_SCRIPT)}))
+
+    app = main_graph.build_graph(profiled, asynchronous=True)
+    asyncio.run(sessions_per_second(app, 10, 10))
+    throughput = asyncio.run(sessions_per_second(app, repeat * 20, 50))
+    results.append(Result("async_graph_throughput", throughput, "sessions/s", True, {"concurrency": 50}))
+    return results
+
+
+def main(argv=None) -> int:
+    return benchmark_results.main(SUITE, run_suite, "Benchmark the hello graph and agent.", repeat=10, argv=argv)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,353 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+# Histogram upper bounds in seconds, from fast tool lookups to slow LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, count) pairs, ending with +Inf."""
+        pairs, total = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            pairs.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return pairs
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items())) + "}"
+
+
+def _usage(response: LLMResult) -> Dict[str, int]:
+    """Token usage of one LLM call, from the message or the provider payload."""
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return {
+                    "input_tokens": usage.get("input_tokens", 0),
+                    "output_tokens": usage.get("output_tokens", 0),
+                    "total_tokens": usage.get("total_tokens", 0),
+                }
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    return {
+        "input_tokens": usage.get("prompt_tokens", 0),
+        "output_tokens": usage.get("completion_tokens", 0),
+        "total_tokens": usage.get("total_tokens", 0),
+    }
+
+
+class RunInstrumentation(BaseCallbackHandler):
+    """
+    Callback handler that times graph nodes, LLM calls and tools.
+
+    Pass it in the run config, `app.invoke(state, config={"callbacks": [handler]})`,
+    for the hand-built graph and for `create_agent` agents alike. Every
+    finished span (node, llm or tool) is:
+
+    - appended to `records` (the last `max_records`) and, when `jsonl_path`
+      is set, written to it as one JSON line
+    - aggregated into duration and time-to-first-token histograms and token,
+      error and retry counters, exported by `prometheus_text()` /
+      `write_prometheus()` in the Prometheus text format
+
+    With `prometheus_path` set, the file is rewritten when a span finishes
+    at least `prometheus_interval` seconds after the last write (0: after
+    every span, None: only by `close()` or an explicit `write_prometheus()`),
+    so a long-running process keeps it current.
+
+    Time to first token is measured when the model streams; spans are
+    attributed to the graph node they ran in. One handler can be shared by
+    concurrent runs and threads.
+    """
+
+    # Record timestamps as events happen instead of on the callback executor
+    run_inline = True
+
+    def __init__(
+        self,
+        jsonl_path: Optional[str] = None,
+        prometheus_path: Optional[str] = None,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        max_records: int = 10_000,
+        prometheus_interval: Optional[float] = 15.0,
+    ):
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self.prometheus_interval = prometheus_interval
+        self.buckets = tuple(buckets)
+        self.records: deque = deque(maxlen=max_records)
+        self.durations: Dict[Tuple[str, Tuple], Histogram] = {}
+        self.ttft: Dict[Tuple, Histogram] = {}
+        self.tokens: Dict[Tuple, int] = {}
+        self.errors: Dict[Tuple, int] = {}
+        self.retries: Dict[Tuple, int] = {}
+        self._open: Dict[UUID, Dict[str, Any]] = {}
+        self._written_at = float("-inf")
+        self._lock = threading.Lock()
+        self._jsonl = open(jsonl_path, "a", encoding="utf-8") if jsonl_path else None
+
+    def _start(self, kind: str, name: str, run_id: UUID, parent_run_id: Optional[UUID], metadata, **extra):
+        metadata = metadata or {}
+        span = {
+            "kind": kind,
+            "name": name,
+            "node": metadata.get("langgraph_node"),
+            "thread_id": metadata.get("thread_id"),
+            "run_id": str(run_id),
+            "parent_run_id": str(parent_run_id) if parent_run_id else None,
+            "started_at": time.time(),
+            "_start": time.perf_counter(),
+            **extra,
+        }
+        with self._lock:
+            self._open[run_id] = span
+
+    def _count_retry(self, tags, metadata):
+        # with_retry() tags every attempt after the first as "retry:attempt:N"
+        if any(tag.startswith("retry:attempt:") for tag in tags or ()):
+            labels = (("node", (metadata or {}).get("langgraph_node") or ""),)
+            with self._lock:
+                self.retries[labels] = self.retries.get(labels, 0) + 1
+
+    def _finish(self, run_id: UUID, error: Optional[BaseException] = None, **extra):
+        now = time.perf_counter()
+        with self._lock:
+            span = self._open.pop(run_id, None)
+            if span is None:
+                return
+            span.update(extra)
+            start = span.pop("_start")
+            first_token = span.pop("_first_token", None)
+            span["duration_s"] = now - start
+            if span["kind"] == "llm":
+                span["ttft_s"] = None if first_token is None else first_token - start
+            span["error"] = None if error is None else f"{type(error).__name__}: {error}"
+            self._aggregate(span)
+            self.records.append(span)
+            if self._jsonl is not None:
+                self._jsonl.write(json.dumps(span, ensure_ascii=False, default=str) + "\n")
+                self._jsonl.flush()
+            due = (
+                self.prometheus_path is not None
+                and self.prometheus_interval is not None
+                and now - self._written_at >= self.prometheus_interval
+            )
+            if due:
+                self._written_at = now
+        if due:
+            self.write_prometheus()
+
+    def _aggregate(self, span: Dict[str, Any]):
+        """Fold a finished span into the metrics; must hold the lock."""
+        kind = span["kind"]
+        if kind == "node":
+            labels = (("node", span["name"]),)
+        elif kind == "tool":
+            labels = (("node", span["node"] or ""), ("tool", span["name"]))
+        else:
+            labels = (("model", span["name"]), ("node", span["node"] or ""))
+
+        key = (kind, labels)
+        if key not in self.durations:
+            self.durations[key] = Histogram(self.buckets)
+        self.durations[key].observe(span["duration_s"])
+
+        if span["error"] is not None:
+            self.errors[key] = self.errors.get(key, 0) + 1
+        if kind == "llm":
+            if span["ttft_s"] is not None:
+                if labels not in self.ttft:
+                    self.ttft[labels] = Histogram(self.buckets)
+                self.ttft[labels].observe(span["ttft_s"])
+            for direction in ("input", "output"):
+                token_key = labels + (("type", direction),)
+                self.tokens[token_key] = self.tokens.get(token_key, 0) + span.get(f"{direction}_tokens", 0)
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        self._count_retry(tags, metadata)
+        node = (metadata or {}).get("langgraph_node")
+        if node is None or kwargs.get("name") != node:
+            return
+        # A node's own runnable may carry its name too; only time the outermost one
+        with self._lock:
+            parent = self._open.get(parent_run_id) if parent_run_id else None
+        if parent is not None and parent["kind"] == "node" and parent["name"] == node:
+            return
+        self._start("node", node, run_id, parent_run_id, metadata)
+
+    def on_chain_end(self, outputs, *, run_id, parent_run_id=None, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        self._finish(run_id, error)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        self._count_retry(tags, metadata)
+        model = (metadata or {}).get("ls_model_name") or kwargs.get("name") or "unknown"
+        self._start("llm", model, run_id, parent_run_id, metadata, input_tokens=0, output_tokens=0, total_tokens=0)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        self._count_retry(tags, metadata)
+        model = (metadata or {}).get("ls_model_name") or kwargs.get("name") or "unknown"
+        self._start("llm", model, run_id, parent_run_id, metadata, input_tokens=0, output_tokens=0, total_tokens=0)
+
+    def on_llm_new_token(self, token, *, chunk=None, run_id, parent_run_id=None, **kwargs):
+        now = time.perf_counter()
+        with self._lock:
+            span = self._open.get(run_id)
+            if span is not None and "_first_token" not in span:
+                span["_first_token"] = now
+
+    def on_llm_end(self, response: LLMResult, *, run_id, parent_run_id=None, **kwargs):
+        self._finish(run_id, **_usage(response))
+
+    def on_llm_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        self._finish(run_id, error)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        self._count_retry(tags, metadata)
+        name = kwargs.get("name") or (serialized or {}).get("name") or "unknown"
+        self._start("tool", name, run_id, parent_run_id, metadata)
+
+    def on_tool_end(self, output, *, run_id, parent_run_id=None, **kwargs):
+        self._finish(run_id)
+
+    def on_tool_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        self._finish(run_id, error)
+
+    def prometheus_text(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for kind in ("node", "llm", "tool"):
+                name = f"langgraph_{kind}_duration_seconds"
+                series = [(labels, h) for (k, labels), h in sorted(self.durations.items()) if k == kind]
+                self._histogram_lines(lines, name, f"Wall time of each {kind} run.", series)
+            self._histogram_lines(
+                lines, "langgraph_llm_ttft_seconds", "Time to the first streamed LLM token.",
+                sorted(self.ttft.items()),
+            )
+            self._counter_lines(lines, "langgraph_llm_tokens_total", "LLM tokens by direction.", self.tokens)
+            self._counter_lines(
+                lines, "langgraph_errors_total", "Failed runs.",
+                {(("kind", kind),) + labels: n for (kind, labels), n in self.errors.items()},
+            )
+            self._counter_lines(lines, "langgraph_retries_total", "Retried attempts of with_retry() runnables, by node.", self.retries)
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram_lines(lines: List[str], name: str, help_text: str, series):
+        if not series:
+            return
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for labels, histogram in series:
+            labels = dict(labels)
+            for le, count in histogram.cumulative():
+                lines.append(f"{name}_bucket{_labels({**labels, 'le': le})} {count}")
+            lines.append(f"{name}_sum{_labels(labels)} {histogram.sum!r}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+    @staticmethod
+    def _counter_lines(lines: List[str], name: str, help_text: str, counters: Dict[Tuple, int]):
+        if not counters:
+            return
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for labels, value in sorted(counters.items()):
+            lines.append(f"{name}{_labels(dict(labels))} {value}")
+
+    def write_prometheus(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Write `prometheus_text()` to `path` (default: prometheus_path).
+
+        The file is replaced atomically, so a node_exporter textfile
+        collector never reads a half-written file.
+        """
+        path = path or self.prometheus_path
+        if not path:
+            return None
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+        return path
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per node / llm / tool: runs, errors, total and mean seconds, tokens."""
+        with self._lock:
+            rows = []
+            for (kind, labels), histogram in sorted(self.durations.items(), key=lambda item: -item[1].sum):
+                row = {"kind": kind, **dict(labels), "runs": histogram.count,
+                       "errors": self.errors.get((kind, labels), 0),
+                       "total_s": histogram.sum, "mean_s": histogram.sum / histogram.count}
+                if kind == "llm":
+                    row["input_tokens"] = self.tokens.get(labels + (("type", "input"),), 0)
+                    row["output_tokens"] = self.tokens.get(labels + (("type", "output"),), 0)
+                rows.append(row)
+            return rows
+
+    def print_summary(self):
+        print(f"{'kind':<5} {'name':<28} {'runs':>5} {'total ms':>10} {'mean ms':>9} {'tokens':>8}")
+        for row in self.summary():
+            name = row.get("tool") or (row["model"] + "@" + row["node"] if row["kind"] == "llm" else row["node"])
+            tokens = row.get("input_tokens", 0) + row.get("output_tokens", 0)
+            print(
+                f"{row['kind']:<5} {name:<28} {row['runs']:>5} "
+                f"{row['total_s'] * 1000:>10.1f} {row['mean_s'] * 1000:>9.1f} {tokens or '':>8}"
+            )
+
+    def close(self):
+        """Write the Prometheus file (if configured) and close the JSONL file."""
+        self.write_prometheus()
+        with self._lock:
+            if self._jsonl is not None:
+                self._jsonl.close()
+                self._jsonl = None
+
+
+def configure_instrumentation() -> Optional[RunInstrumentation]:
+    """
+    Build a RunInstrumentation when METRICS_JSONL or METRICS_PROM is set.
+
+    METRICS_JSONL is the file spans are appended to as JSON lines;
+    METRICS_PROM is the Prometheus text file, rewritten at most every
+    METRICS_PROM_INTERVAL seconds (default 15) while spans finish and by
+    `close()`.
+    """
+    jsonl_path = os.environ.get("METRICS_JSONL")
+    prometheus_path = os.environ.get("METRICS_PROM")
+    if not jsonl_path and not prometheus_path:
+        return None
+    interval = os.environ.get("METRICS_PROM_INTERVAL")
+    return RunInstrumentation(
+        jsonl_path=jsonl_path or None,
+        prometheus_path=prometheus_path or None,
+        prometheus_interval=float(interval) if interval else 15.0,
+    )
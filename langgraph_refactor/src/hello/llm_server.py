@@ -0,0 +1,448 @@
+"""
+OpenAI-compatible stand-in server that records and replays LLM exchanges.
+
+Run with:
+
+    python -m src.hello.llm_server --mode record --cassette llm.jsonl
+    python -m src.hello.llm_server --mode replay --cassette llm.jsonl --latency lognormal:-1.2,0.4
+
+and point any agent at it with BASE_URL=http://127.0.0.1:8765/v1 (and
+BASE_EMBEDDING_URL for embeddings); every agent in both projects reads it.
+OPENAI_API_KEY can be any value while replaying.
+
+- record: requests are forwarded to --upstream (the real API) and every
+  exchange is appended to the cassette, a JSON lines file
+- replay: answers come from the cassette only, so runs need no network
+  and are deterministic; the latency of each answer is drawn from
+  --latency, and streamed answers emit chunks --token-interval apart
+
+Chat completions are matched on the whole request (minus streaming
+options) and then, for prompts that embed volatile values such as the
+current time, on its shape: model, tools, message roles and tool calls,
+and the first user message. Streaming and tool calls are synthesized
+from the recorded completion, so one recording serves stream and invoke.
+Unrecorded embeddings are replayed as deterministic pseudo-random
+vectors; an unrecorded chat request is a 404 error.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+# Request fields that only change how the answer is delivered, not what it is
+DELIVERY_FIELDS = ("stream", "stream_options", "user", "metadata", "store")
+
+
+def request_key(body: Dict[str, Any]) -> str:
+    """Exact match key: the request without delivery options."""
+    payload = {k: v for k, v in body.items() if k not in DELIVERY_FIELDS}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def request_shape(body: Dict[str, Any]) -> str:
+    """Fallback key that ignores message contents other than the first user message."""
+    messages = body.get("messages") or []
+    first_user = next((m.get("content") for m in messages if m.get("role") == "user"), None)
+    shape = {
+        "model": body.get("model"),
+        "tools": sorted((t.get("function") or {}).get("name", "") for t in body.get("tools") or []),
+        "response_format": body.get("response_format"),
+        "messages": [
+            (m.get("role"), [(c.get("function") or {}).get("name") for c in m.get("tool_calls") or []])
+            for m in messages
+        ],
+        "first_user": first_user,
+    }
+    return hashlib.sha256(json.dumps(shape, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class LatencyModel:
+    """
+    Response latency distribution, parsed from a spec string:
+
+    - "0" or "fixed:0.2": always that many seconds
+    - "uniform:0.1,0.5"
+    - "normal:0.3,0.05" (clipped at 0)
+    - "lognormal:-1.2,0.4" (mu and sigma of the underlying normal)
+    - "recorded": the upstream latency stored in the cassette
+    """
+
+    def __init__(self, spec: str = "0", seed: Optional[int] = None):
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        if not params and kind not in ("recorded",):
+            kind, params = "fixed", kind
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",")] if params else []
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "recorded": 0}
+        if kind not in expected or len(self.params) != expected[kind]:
+            raise ValueError(f"invalid latency spec {spec!r}")
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self, recorded: Optional[float] = None) -> float:
+        with self._lock:
+            if self.kind == "fixed":
+                return self.params[0]
+            if self.kind == "uniform":
+                return self._rng.uniform(*self.params)
+            if self.kind == "normal":
+                return max(0.0, self._rng.gauss(*self.params))
+            if self.kind == "lognormal":
+                return self._rng.lognormvariate(*self.params)
+            return recorded or 0.0
+
+
+class Cassette:
+    """
+    Recorded exchanges, one JSON object per line:
+    {"endpoint", "key", "shape", "request", "response", "latency"}.
+
+    Several recordings of the same request are replayed in turn.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._exact: Dict[str, List[Dict[str, Any]]] = {}
+        self._shapes: Dict[str, List[Dict[str, Any]]] = {}
+        self._turns: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._exact.values())
+
+    def _index(self, entry: Dict[str, Any]):
+        self._exact.setdefault(entry["key"], []).append(entry)
+        if entry.get("shape"):
+            self._shapes.setdefault(entry["shape"], []).append(entry)
+
+    def _next(self, index: Dict[str, List[Dict[str, Any]]], key: str) -> Dict[str, Any]:
+        entries = index[key]
+        turn = self._turns.get(key, 0)
+        self._turns[key] = turn + 1
+        return entries[turn % len(entries)]
+
+    def lookup(self, key: str, shape: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], str]:
+        """(entry, "exact" | "shape" | "miss")."""
+        with self._lock:
+            if key in self._exact:
+                return self._next(self._exact, key), "exact"
+            if shape and shape in self._shapes:
+                return self._next(self._shapes, shape), "shape"
+            return None, "miss"
+
+    def record(self, endpoint: str, request: Dict[str, Any], response: Dict[str, Any], latency: float):
+        entry = {
+            "endpoint": endpoint,
+            "key": request_key(request),
+            "shape": request_shape(request) if endpoint == "chat" else None,
+            "request": request,
+            "response": response,
+            "latency": latency,
+        }
+        with self._lock:
+            self._index(entry)
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def split_text(text: str, size: int = 4) -> List[str]:
+    """Token-sized pieces of a completion, to stream."""
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+def completion_chunks(completion: Dict[str, Any], include_usage: bool = False) -> Iterator[Dict[str, Any]]:
+    """The chat.completion.chunk stream OpenAI would send for `completion`."""
+    base = {
+        "id": completion.get("id", "chatcmpl-replay"),
+        "object": "chat.completion.chunk",
+        "created": completion.get("created", int(time.time())),
+        "model": completion.get("model"),
+    }
+
+    def chunk(choices, **extra):
+        return {**base, "choices": choices, **extra}
+
+    for choice in completion.get("choices", []):
+        index = choice.get("index", 0)
+        message = choice.get("message") or {}
+        yield chunk([{"index": index, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+        if message.get("content"):
+            for piece in split_text(message["content"]):
+                yield chunk([{"index": index, "delta": {"content": piece}, "finish_reason": None}])
+        for position, call in enumerate(message.get("tool_calls") or []):
+            function = call.get("function") or {}
+            head = {
+                "index": position, "id": call.get("id"), "type": "function",
+                "function": {"name": function.get("name"), "arguments": ""},
+            }
+            yield chunk([{"index": index, "delta": {"tool_calls": [head]}, "finish_reason": None}])
+            for piece in split_text(function.get("arguments") or "", size=8):
+                delta = {"tool_calls": [{"index": position, "function": {"arguments": piece}}]}
+                yield chunk([{"index": index, "delta": delta, "finish_reason": None}])
+        yield chunk([{"index": index, "delta": {}, "finish_reason": choice.get("finish_reason", "stop")}])
+
+    if include_usage and completion.get("usage"):
+        yield chunk([], usage=completion["usage"])
+
+
+def fake_embedding(text: str, dimensions: int) -> List[float]:
+    """Deterministic unit vector for texts that were never recorded."""
+    rng = random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+    vector = [rng.gauss(0.0, 1.0) for _ in range(dimensions)]
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Load tests open hundreds of connections at once; the default backlog of 5 drops them
+    request_queue_size = 1024
+
+
+class StandInServer:
+    """
+    The stand-in as an object, for tests and benchmarks:
+
+        with StandInServer("llm.jsonl", latency="fixed:0.2") as server:
+            model = ChatOpenAI(base_url=server.base_url, api_key="replay")
+
+    port=0 picks a free port. `stats` counts exact and shape hits, misses
+    and recorded exchanges.
+    """
+
+    def __init__(
+        self,
+        cassette: Optional[str] = None,
+        mode: str = "replay",
+        latency: str = "0",
+        token_interval: float = 0.0,
+        upstream: str = "https://api.openai.com/v1",
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+        embedding_dimensions: int = 1536,
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"mode must be 'record' or 'replay', not {mode!r}")
+        self.mode = mode
+        self.cassette = Cassette(cassette)
+        self.latency = LatencyModel(latency, seed)
+        self.token_interval = token_interval
+        self.upstream = upstream.rstrip("/")
+        self.embedding_dimensions = embedding_dimensions
+        self.stats = {"exact": 0, "shape": 0, "miss": 0, "recorded": 0}
+        self._stats_lock = threading.Lock()
+        self._client = httpx.Client(timeout=120) if mode == "record" else None
+        self._httpd = _HTTPServer((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.1}, name="llm-stand-in", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._client is not None:
+            self._client.close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, outcome: str):
+        with self._stats_lock:
+            self.stats[outcome] += 1
+
+    def _forward(self, path: str, body: Dict[str, Any], authorization: Optional[str]) -> Tuple[Dict[str, Any], float]:
+        """Call the real API (never streaming); returns (response JSON, seconds)."""
+        api_key = os.environ.get("UPSTREAM_API_KEY")
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        if authorization and not api_key:
+            headers["Authorization"] = authorization
+        start = time.perf_counter()
+        response = self._client.post(self.upstream + path, json=body, headers=headers)
+        response.raise_for_status()
+        return response.json(), time.perf_counter() - start
+
+    def chat(self, body: Dict[str, Any], authorization: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], float]:
+        """(completion or None on a miss, seconds to wait before answering)."""
+        if self.mode == "record":
+            upstream_body = {k: v for k, v in body.items() if k not in ("stream", "stream_options")}
+            completion, latency = self._forward("/chat/completions", upstream_body, authorization)
+            self.cassette.record("chat", body, completion, latency)
+            self._count("recorded")
+            return completion, 0.0
+
+        entry, outcome = self.cassette.lookup(request_key(body), request_shape(body))
+        self._count(outcome)
+        if entry is None:
+            return None, 0.0
+        return entry["response"], self.latency.sample(entry.get("latency"))
+
+    def embeddings(self, body: Dict[str, Any], authorization: Optional[str] = None) -> Tuple[Dict[str, Any], float]:
+        if self.mode == "record":
+            response, latency = self._forward("/embeddings", body, authorization)
+            self.cassette.record("embeddings", body, response, latency)
+            self._count("recorded")
+            return response, 0.0
+
+        entry, outcome = self.cassette.lookup(request_key(body))
+        self._count(outcome)
+        if entry is not None:
+            return entry["response"], self.latency.sample(entry.get("latency"))
+
+        texts = body.get("input")
+        texts = [texts] if isinstance(texts, (str, int)) or (texts and isinstance(texts[0], int)) else texts
+        dimensions = body.get("dimensions") or self.embedding_dimensions
+        data = [
+            {"object": "embedding", "index": i, "embedding": fake_embedding(json.dumps(text), dimensions)}
+            for i, text in enumerate(texts or [])
+        ]
+        return {
+            "object": "list", "model": body.get("model"), "data": data,
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }, self.latency.sample()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, payload: Dict[str, Any]):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, completion: Dict[str, Any], include_usage: bool):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                def write(data: bytes):
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                    self.wfile.flush()
+
+                for i, chunk in enumerate(completion_chunks(completion, include_usage)):
+                    if i and server.token_interval:
+                        time.sleep(server.token_interval)
+                    write(b"data: " + json.dumps(chunk).encode("utf-8") + b"\n\n")
+                write(b"data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def do_GET(self):
+                path = self.path.split("?")[0].rstrip("/")
+                if path.endswith("/stats"):
+                    self._send_json(200, dict(server.stats, recordings=len(server.cassette)))
+                elif path.endswith("/models"):
+                    self._send_json(200, {"object": "list", "data": []})
+                else:
+                    self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._send_json(400, {"error": {"message": "request body is not JSON"}})
+                    return
+                authorization = self.headers.get("Authorization")
+                path = self.path.split("?")[0].rstrip("/")
+
+                try:
+                    if path.endswith("/chat/completions"):
+                        completion, delay = server.chat(body, authorization)
+                        if completion is None:
+                            self._send_json(404, {"error": {
+                                "message": "no recorded response for this request", "type": "cassette_miss",
+                            }})
+                            return
+                        time.sleep(delay)
+                        if body.get("stream"):
+                            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+                            self._send_stream(completion, include_usage)
+                        else:
+                            self._send_json(200, completion)
+                    elif path.endswith("/embeddings"):
+                        response, delay = server.embeddings(body, authorization)
+                        time.sleep(delay)
+                        self._send_json(200, response)
+                    else:
+                        self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+                except httpx.HTTPStatusError as e:
+                    self._send_json(e.response.status_code, {"error": {"message": e.response.text}})
+                except httpx.HTTPError as e:
+                    self._send_json(502, {"error": {"message": f"upstream failed: {e}"}})
+
+        return Handler
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="OpenAI-compatible record/replay stand-in server.")
+    parser.add_argument("--mode", choices=("record", "replay"), default="replay")
+    parser.add_argument("--cassette", default=os.environ.get("LLM_CASSETTE", "llm_cassette.jsonl"))
+    parser.add_argument("--latency", default="0", help="fixed:S, uniform:A,B, normal:MU,SD, lognormal:MU,SIGMA or recorded")
+    parser.add_argument("--token-interval", type=float, default=0.0, help="seconds between streamed chunks")
+    parser.add_argument("--upstream", default=os.environ.get("UPSTREAM_BASE_URL", "https://api.openai.com/v1"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = StandInServer(
+        cassette=args.cassette, mode=args.mode, latency=args.latency, token_interval=args.token_interval,
+        upstream=args.upstream, host=args.host, port=args.port, seed=args.seed,
+    )
+    print(f"{args.mode} {args.cassette} ({len(server.cassette)} recordings) at {server.base_url}")
+    print(f"export BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(server.stats)
+
+
+if __name__ == "__main__":
+    main()
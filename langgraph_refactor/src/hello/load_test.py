@@ -0,0 +1,63 @@
+"""
+Load-test the async hello graph against a fake LLM on one event loop.
+
+Run with:
+
+    python -m src.hello.load_test
+
+ChatOpenAI talks to an in-process async MockTransport that sleeps for the
+configured latency before returning a canned GreetingsResponse, so the
+numbers show how many concurrent sessions one process can keep in flight.
+"""
+
+import asyncio
+import os
+import time
+
+import httpx
+import numpy as np
+from langchain_openai import ChatOpenAI
+
+from . import main_graph
+from .benchmark import CANNED_RESPONSE
+
+
+def fake_async_http_client(latency: float) -> httpx.AsyncClient:
+    async def handler(request):
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json=CANNED_RESPONSE)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def run_load(app, sessions: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def session(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await app.ainvoke({"messages": [{"role": "user", "content": "Oi" if i % 2 else "Hello"}]})
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session(i) for i in range(sessions)))
+    return time.perf_counter() - start, latencies
+
+
+def main(sessions: int = 1000, latency: float = 0.2, levels=(1, 10, 100, 500, 1000)):
+    os.environ.setdefault("OPENAI_API_KEY", "sk-load-test")
+    model = ChatOpenAI(model="gpt-4o-mini", http_async_client=fake_async_http_client(latency))
+    app = main_graph.build_graph(model, asynchronous=True)
+
+    print(f"sessions={sessions} fake LLM latency={latency * 1000:.0f}ms")
+    print(f"{'concurrency':>12} {'sessions/s':>11} {'p50 ms':>9} {'p99 ms':>9}")
+    for concurrency in levels:
+        runs = min(sessions, max(concurrency * 5, 20))
+        elapsed, latencies = asyncio.run(run_load(app, runs, concurrency))
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        print(f"{concurrency:>12} {runs / elapsed:>11.1f} {p50:>9.1f} {p99:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,19 @@ from langchain.agents import create_agent
 from langchain.chat_models import init_chat_model
 from dotenv import load_dotenv
 from langchain.agents.structured_output import ToolStrategy
+from .cache import configure_response_cache
+from .instrumentation import configure_instrumentation
 from .schemas import GreetingsResponse
+from .streaming import (
+    FieldPrinter, ModelCallTimer, StreamMetrics, iter_partial_fields, iter_tool_call_args, parse_args,
+)
 from .tools import get_local_news, get_user_location
 
 load_dotenv()
 
-def main():
+def create_greeting_agent():
+    configure_response_cache()
+
     model = init_chat_model(
         "gpt-4o-mini",
         temperature=0.5,
@@ -16,7 +23,7 @@ def main():
         base_url=os.environ.get("BASE_URL"),
         default_headers={"FlowAgent": "Flow Api"})
 
-    agent = create_agent(
+    return create_agent(
         model=model,
         system_prompt="""
             You are a friendly and funny person who always start chatting with most recent news.
@@ -37,10 +44,64 @@ def main():
         response_format=ToolStrategy(GreetingsResponse)
     )
 
-    response = agent.invoke({ "messages": [ {"role": "user", "content": "Oi"} ] })
+
+def stream_agent(agent, input_):
+    """
+    Print GreetingsResponse fields while the agent streams its structured
+    tool call; TTFT counts from the start of that final model call.
+    """
+    printer = FieldPrinter()
+    metrics = StreamMetrics()
+    final_state = {}
+
+    def message_chunks():
+        nonlocal final_state
+        config = {"callbacks": [ModelCallTimer(metrics)]}
+        for mode, chunk in agent.stream(input_, config, stream_mode=["messages", "values"]):
+            if mode == "values":
+                final_state = chunk
+            else:
+                yield chunk[0]
+
+    args = iter_tool_call_args(message_chunks(), GreetingsResponse.__name__)
+    for fields in iter_partial_fields(args, metrics):
+        printer.update(fields)
+    printer.finish(metrics.time_to_first_token)
+
+    return final_state
+
+
+def main(stream: bool = False):
+    agent = create_greeting_agent()
+    instrumentation = configure_instrumentation()
+    if instrumentation:
+        agent = agent.with_config(callbacks=[instrumentation])
+
+    input_ = { "messages": [ {"role": "user", "content": "Oi"} ] }
+    response = stream_agent(agent, input_) if stream else agent.invoke(input_)
     
     print(response['structured_response'])
     print("END")
 
+    if instrumentation:
+        instrumentation.close()
+        instrumentation.print_summary()
+
+
+async def amain():
+    agent = create_greeting_agent()
+    instrumentation = configure_instrumentation()
+    if instrumentation:
+        agent = agent.with_config(callbacks=[instrumentation])
+
+    response = await agent.ainvoke({ "messages": [ {"role": "user", "content": "Oi"} ] })
+
+    print(response['structured_response'])
+    print("END")
+
+    if instrumentation:
+        instrumentation.close()
+        instrumentation.print_summary()
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main(stream=parse_args().stream)
\ No newline at end of file
@@ -1,20 +1,34 @@
 # src/hello/main_graph.py
 
+import asyncio
 import os
-from typing import List, Dict, Any, Optional
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, List, Dict, Any, Optional, Tuple, TypeVar, Union
 
 from dotenv import load_dotenv
 from typing_extensions import TypedDict
 
 from langchain.chat_models import init_chat_model
-from langgraph.graph import StateGraph, END
+from langgraph.config import get_stream_writer
+from langgraph.graph import StateGraph, START, END
 
+from .cache import configure_response_cache
+from .instrumentation import configure_instrumentation
 from .schemas import GreetingsResponse
+from .streaming import FieldPrinter, StreamMetrics, parse_args, stream_structured
 from .tools import get_local_news, get_user_location
 
 
 load_dotenv()
 
+# Region whose news is fetched speculatively while the location resolves
+DEFAULT_REGION = os.environ.get("DEFAULT_NEWS_REGION", "Brazil")
+
 
 class GraphState(TypedDict, total=False):
     messages: List[Dict[str, Any]]
@@ -23,6 +37,58 @@ class GraphState(TypedDict, total=False):
     structured_response: GreetingsResponse
 
 
+class SpeculativeState(GraphState, total=False):
+    """Private channels of the speculative graph; callers only see GraphState."""
+    prefetched_region: Optional[str]
+    prefetch_id: Optional[str]
+
+
+class NewsPrefetcher:
+    """
+    Speculative news fetches in flight, kept beside the graph state.
+
+    The prefetch_news branch starts a fetch and writes only its id to the
+    state; the get_news join takes the fetch back by id. Sync fetches run on
+    this object's thread pool, shut down by close() or once no compiled
+    graph (or with_config copy) references the prefetcher any more; async
+    fetches are Tasks on the running event loop. Fetches whose join never
+    ran, because get_location failed, are dropped after `max_age` seconds.
+    """
+
+    def __init__(self, max_workers: int = 8, max_age: float = 60.0):
+        self.max_age = max_age
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._pending: Dict[str, Tuple[float, Union[Future, asyncio.Future]]] = {}
+        self._lock = threading.Lock()
+        self._finalizer = weakref.finalize(self, self.executor.shutdown, wait=False, cancel_futures=True)
+
+    def _track(self, future: Union[Future, asyncio.Future]) -> str:
+        key = uuid.uuid4().hex
+        now = time.monotonic()
+        with self._lock:
+            for old_key, (started, old) in list(self._pending.items()):
+                if now - started > self.max_age:
+                    del self._pending[old_key]
+                    if isinstance(old, Future):
+                        old.cancel()
+            self._pending[key] = (now, future)
+        return key
+
+    def submit(self, region: str) -> str:
+        return self._track(self.executor.submit(get_local_news.run, region))
+
+    def create_task(self, region: str) -> str:
+        return self._track(asyncio.ensure_future(get_local_news.ainvoke(region)))
+
+    def take(self, key: Optional[str]) -> Optional[Union[Future, asyncio.Future]]:
+        with self._lock:
+            entry = self._pending.pop(key, None) if key else None
+        return entry[1] if entry else None
+
+    def close(self):
+        self._finalizer()
+
+
 def create_model():
     return init_chat_model(
         "gpt-4o-mini",
@@ -52,28 +118,95 @@ Always return the greeting, news and the chat initiation message.
 """
 
 
-def node_get_location(state: GraphState) -> GraphState:
+def last_user_message(state: GraphState) -> str:
     messages = state.get("messages") or []
     if not messages:
         raise ValueError("No messages found in state")
 
-    user_msg = messages[-1]["content"]
+    return messages[-1]["content"]
+
+
+def node_get_location(state: GraphState) -> GraphState:
+    user_msg = last_user_message(state)
     location = get_user_location.run(user_msg)
 
     return {"location": location}
 
 
-def node_get_news(state: GraphState) -> GraphState:
+async def anode_get_location(state: GraphState) -> GraphState:
+    user_msg = last_user_message(state)
+    location = await get_user_location.ainvoke(user_msg)
+
+    return {"location": location}
+
+
+def node_prefetch_news(state: SpeculativeState, prefetcher: NewsPrefetcher) -> SpeculativeState:
+    """Dispara, em segundo plano, a busca especulativa de notícias da região padrão."""
+    region = DEFAULT_REGION
+    return {"prefetched_region": region, "prefetch_id": prefetcher.submit(region)}
+
+
+def node_get_news(state: SpeculativeState, prefetcher: Optional[NewsPrefetcher] = None) -> GraphState:
     """Usa a localização para buscar as notícias locais."""
     location = state.get("location") or "Unknown"
+    prefetch = prefetcher.take(state.get("prefetch_id")) if prefetcher is not None else None
+
+    if prefetch is not None:
+        # Speculation hit: the prefetched region is where the user actually is
+        if state.get("prefetched_region") == location:
+            return {"news": prefetch.result()}
+        # Speculation miss: cancel it if it has not started, otherwise its
+        # result is simply dropped; either way we do not wait for it
+        prefetch.cancel()
+
     news = get_local_news.run(location)
     return {"news": news}
 
 
-def node_llm_response(state: GraphState) -> GraphState:
-    model = create_model()
-    structured_llm = model.with_structured_output(GreetingsResponse)
+async def anode_prefetch_news(state: SpeculativeState, prefetcher: NewsPrefetcher) -> SpeculativeState:
+    """Versão assíncrona: a busca especulativa vira uma asyncio.Task."""
+    region = DEFAULT_REGION
+    return {"prefetched_region": region, "prefetch_id": prefetcher.create_task(region)}
+
+
+async def anode_get_news(state: SpeculativeState, prefetcher: Optional[NewsPrefetcher] = None) -> GraphState:
+    """Versão assíncrona de node_get_news; um miss cancela a Task especulativa."""
+    location = state.get("location") or "Unknown"
+    prefetch = prefetcher.take(state.get("prefetch_id")) if prefetcher is not None else None
+
+    if prefetch is not None:
+        if state.get("prefetched_region") == location:
+            return {"news": await prefetch}
+        prefetch.cancel()
+
+    news = await get_local_news.ainvoke(location)
+    return {"news": news}
+
+
+def create_structured_model(model=None):
+    """Bind the GreetingsResponse schema once to a (shared) chat model."""
+    return (model or create_model()).with_structured_output(GreetingsResponse)
+
+
+T = TypeVar("T")
+
+
+def lazy(factory: Callable[[], T]) -> Callable[[], T]:
+    """Return a getter that builds `factory()` on first call and then reuses it."""
+    lock = threading.Lock()
+    built: List[T] = []
+
+    def get() -> T:
+        if not built:
+            with lock:
+                if not built:
+                    built.append(factory())
+        return built[0]
+
+    return get
+
 
+def build_chat_messages(state: GraphState) -> List[Dict[str, Any]]:
     location = state.get("location") or "Unknown"
     news = state.get("news") or "No news available."
     messages = state.get("messages") or []
@@ -97,39 +230,171 @@ def node_llm_response(state: GraphState) -> GraphState:
         },
     ]
 
-    structured_response: GreetingsResponse = structured_llm.invoke(chat_messages)
+    return chat_messages
+
+
+def node_llm_response(state: GraphState, structured_llm=None) -> GraphState:
+    if structured_llm is None:
+        structured_llm = create_structured_model()
+
+    structured_response: GreetingsResponse = structured_llm.invoke(build_chat_messages(state))
 
     return {"structured_response": structured_response}
 
 
-def build_graph():
-    graph = StateGraph(GraphState)
+def node_llm_response_streaming(state: GraphState, model=None) -> GraphState:
+    """
+    Stream the structured response field by field.
+
+    Partial fields and the final timing metrics are emitted through the
+    LangGraph stream writer (stream_mode="custom"); with plain invoke the
+    writer is a no-op and only the final response is returned.
+    """
+    if model is None:
+        model = create_model()
+
+    writer = get_stream_writer()
+    metrics = StreamMetrics()
+    fields: Dict[str, Any] = {}
+
+    for fields in stream_structured(model, build_chat_messages(state), GreetingsResponse, metrics):
+        writer({"partial": fields})
+
+    writer({"metrics": metrics.as_dict()})
+    return {"structured_response": GreetingsResponse(**fields)}
+
 
-    graph.add_node("get_location", node_get_location)
-    graph.add_node("get_news", node_get_news)
-    graph.add_node("llm_response", node_llm_response)
+async def anode_llm_response(state: GraphState, structured_llm=None) -> GraphState:
+    if structured_llm is None:
+        structured_llm = create_structured_model()
 
-    graph.set_entry_point("get_location")
-    graph.add_edge("get_location", "get_news")
+    structured_response: GreetingsResponse = await structured_llm.ainvoke(build_chat_messages(state))
+
+    return {"structured_response": structured_response}
+
+
+def build_graph(
+    model=None,
+    speculative: bool = False,
+    prefetch_workers: int = 8,
+    asynchronous: bool = False,
+    streaming: bool = False,
+    prefetcher: Optional[NewsPrefetcher] = None,
+):
+    """
+    Compile the greeting graph.
+
+    With asynchronous=True every node is a coroutine and the graph must be
+    driven with ainvoke/astream, so one event loop can serve many sessions.
+
+    With streaming=True (sync only) the LLM node streams partial fields,
+    which app.stream(..., stream_mode="custom") exposes as they arrive.
+
+    With speculative=True, news for DEFAULT_REGION is fetched in the
+    background while get_location runs, and get_news joins both branches:
+    it reuses the prefetched news when the region matches, and otherwise
+    cancels the speculative fetch and looks up the real location. The
+    in-flight fetch lives in a NewsPrefetcher (pass one to own and close
+    it; by default each graph gets one with `prefetch_workers` threads);
+    the state only carries its id, in channels callers never see.
+    """
+    # One chat model (and its keep-alive HTTP client) per compiled graph,
+    # shared by every invocation and thread instead of rebuilt per request.
+    # It is built on the first LLM call, so compiling needs no credentials.
+    get_model = lazy(lambda: model or create_model())
+    get_structured_llm = lazy(lambda: create_structured_model(get_model()))
+
+    async def allm_response(state: GraphState) -> GraphState:
+        return await anode_llm_response(state, structured_llm=get_structured_llm())
+
+    def llm_response(state: GraphState) -> GraphState:
+        if streaming:
+            return node_llm_response_streaming(state, model=get_model())
+        return node_llm_response(state, structured_llm=get_structured_llm())
+
+    graph = StateGraph(SpeculativeState, input_schema=GraphState, output_schema=GraphState)
+
+    if asynchronous:
+        graph.add_node("get_location", anode_get_location)
+        graph.add_node("llm_response", allm_response)
+    else:
+        graph.add_node("get_location", node_get_location)
+        graph.add_node("llm_response", llm_response)
+
+    if speculative:
+        prefetcher = prefetcher or NewsPrefetcher(max_workers=prefetch_workers)
+        if asynchronous:
+            graph.add_node("prefetch_news", partial(anode_prefetch_news, prefetcher=prefetcher))
+            graph.add_node("get_news", partial(anode_get_news, prefetcher=prefetcher))
+        else:
+            graph.add_node("prefetch_news", partial(node_prefetch_news, prefetcher=prefetcher))
+            graph.add_node("get_news", partial(node_get_news, prefetcher=prefetcher))
+        graph.add_edge(START, "get_location")
+        graph.add_edge(START, "prefetch_news")
+        graph.add_edge(["get_location", "prefetch_news"], "get_news")
+    else:
+        graph.add_node("get_news", anode_get_news if asynchronous else node_get_news)
+        graph.set_entry_point("get_location")
+        graph.add_edge("get_location", "get_news")
     graph.add_edge("get_news", "llm_response")
     graph.add_edge("llm_response", END)
 
     return graph.compile()
 
 
-def main():
-    app = build_graph()
+def main(stream: bool = False):
+    configure_response_cache()
+    app = build_graph(streaming=stream)
+    instrumentation = configure_instrumentation()
+    if instrumentation:
+        app = app.with_config(callbacks=[instrumentation])
 
     initial_state: GraphState = {
         "messages": [{"role": "user", "content": "Oi"}],
     }
 
-    final_state = app.invoke(initial_state)
+    if stream:
+        printer = FieldPrinter()
+        final_state: GraphState = {}
+        for mode, chunk in app.stream(initial_state, stream_mode=["custom", "values"]):
+            if mode == "values":
+                final_state = chunk
+            elif "partial" in chunk:
+                printer.update(chunk["partial"])
+            elif "metrics" in chunk:
+                printer.finish(chunk["metrics"]["ttft"])
+    else:
+        final_state = app.invoke(initial_state)
 
     response = {"structured_response": final_state["structured_response"]}
     print(response["structured_response"])
     print("END")
 
+    if instrumentation:
+        instrumentation.close()
+        instrumentation.print_summary()
+
+
+async def amain():
+    configure_response_cache()
+    app = build_graph(asynchronous=True)
+    instrumentation = configure_instrumentation()
+    if instrumentation:
+        app = app.with_config(callbacks=[instrumentation])
+
+    initial_state: GraphState = {
+        "messages": [{"role": "user", "content": "Oi"}],
+    }
+
+    final_state = await app.ainvoke(initial_state)
+
+    print(final_state["structured_response"])
+    print("END")
+
+    if instrumentation:
+        instrumentation.close()
+        instrumentation.print_summary()
+
 
 if __name__ == "__main__":
-    main()
+    main(stream=parse_args().stream)
@@ -0,0 +1,63 @@
+"""
+Critical-path latency of the sequential vs speculative hello graph.
+
+Run with:
+
+    python -m src.hello.speculation_benchmark
+
+Both tool lookups are replaced by fakes that sleep like real I/O calls and
+the LLM node by an instant canned response, so the numbers isolate how the
+graph overlaps get_location and get_news.
+"""
+
+import time
+
+from . import main_graph
+from .schemas import GreetingsResponse
+
+
+class SlowTool:
+    def __init__(self, tool, latency: float):
+        self.tool = tool
+        self.latency = latency
+
+    def run(self, value):
+        time.sleep(self.latency)
+        return self.tool.run(value)
+
+
+class CannedModel:
+    def with_structured_output(self, schema):
+        return self
+
+    def invoke(self, messages):
+        return GreetingsResponse(greeting="Oi!", news="The fly won", chat="Uma mosca?")
+
+
+def time_invoke(app, greeting: str, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        app.invoke({"messages": [{"role": "user", "content": greeting}]})
+    return (time.perf_counter() - start) / runs
+
+
+def main(location_latency: float = 0.08, news_latency: float = 0.12, runs: int = 10):
+    main_graph.get_user_location = SlowTool(main_graph.get_user_location, location_latency)
+    main_graph.get_local_news = SlowTool(main_graph.get_local_news, news_latency)
+    main_graph.DEFAULT_REGION = "Brazil"
+
+    sequential = main_graph.build_graph(CannedModel())
+    speculative = main_graph.build_graph(CannedModel(), speculative=True)
+
+    baseline = time_invoke(sequential, "Oi", runs)
+    hit = time_invoke(speculative, "Oi", runs)
+    miss = time_invoke(speculative, "Hello", runs)
+
+    print(f"get_location={location_latency * 1000:.0f}ms get_news={news_latency * 1000:.0f}ms")
+    print(f"sequential:              {baseline * 1000:8.1f} ms")
+    print(f"speculative (hit):       {hit * 1000:8.1f} ms ({(1 - hit / baseline) * 100:+.0f}% saved)")
+    print(f"speculative (miss):      {miss * 1000:8.1f} ms ({(1 - miss / baseline) * 100:+.0f}% saved)")
+
+
+if __name__ == "__main__":
+    main()
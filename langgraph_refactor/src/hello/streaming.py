@@ -0,0 +1,154 @@
+import argparse
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, Optional, Type
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.utils.json import parse_partial_json
+from pydantic import BaseModel
+
+
+@dataclass
+class StreamMetrics:
+    """Timing of one streamed structured response; `chunks` counts text fragments, not tokens."""
+    started_at: float = field(default_factory=time.perf_counter)
+    first_token_at: Optional[float] = None
+    first_field_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    chunks: int = 0
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        return None if self.first_token_at is None else self.first_token_at - self.started_at
+
+    @property
+    def time_to_first_field(self) -> Optional[float]:
+        return None if self.first_field_at is None else self.first_field_at - self.started_at
+
+    @property
+    def total_time(self) -> Optional[float]:
+        return None if self.finished_at is None else self.finished_at - self.started_at
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ttft": self.time_to_first_token,
+            "time_to_first_field": self.time_to_first_field,
+            "total": self.total_time,
+            "chunks": self.chunks,
+        }
+
+
+class ModelCallTimer(BaseCallbackHandler):
+    """
+    Restart `metrics` whenever a chat model call starts, until the first
+    token arrives, so an agent's TTFT is measured from the model call that
+    streams the answer instead of including earlier calls and tool time.
+    """
+
+    def __init__(self, metrics: StreamMetrics):
+        self.metrics = metrics
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        if self.metrics.first_token_at is None:
+            self.metrics.started_at = time.perf_counter()
+
+
+def iter_partial_fields(
+    chunks: Iterable[str], metrics: Optional[StreamMetrics] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally parse streamed JSON text into partial field dicts.
+
+    A new dict is yielded every time a field appears or grows, so callers
+    can show `greeting` while `news` and `chat` are still being generated.
+    """
+    metrics = metrics or StreamMetrics()
+    buffer = ""
+    last: Dict[str, Any] = {}
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if metrics.first_token_at is None:
+            metrics.first_token_at = time.perf_counter()
+        metrics.chunks += 1
+        buffer += chunk
+
+        parsed = parse_partial_json(buffer)
+        if isinstance(parsed, dict) and parsed and parsed != last:
+            if metrics.first_field_at is None:
+                metrics.first_field_at = time.perf_counter()
+            last = parsed
+            yield dict(parsed)
+
+    metrics.finished_at = time.perf_counter()
+
+
+def message_text(chunk: Any) -> str:
+    """Text carried by a streamed AIMessageChunk (str or content blocks)."""
+    content = getattr(chunk, "content", chunk)
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") for block in content if isinstance(block, dict))
+
+
+def iter_tool_call_args(chunks: Iterable[Any], tool_name: str) -> Iterator[str]:
+    """
+    Argument fragments streamed for `tool_name` (used by ToolStrategy agents).
+
+    Only the first chunk of a tool call carries its name, so names are
+    tracked per tool-call index.
+    """
+    names: Dict[int, Optional[str]] = {}
+    for chunk in chunks:
+        for part in getattr(chunk, "tool_call_chunks", None) or []:
+            index = part.get("index") or 0
+            if part.get("name"):
+                names[index] = part["name"]
+            if names.get(index) == tool_name and part.get("args"):
+                yield part["args"]
+
+
+def stream_structured(
+    model,
+    messages,
+    schema: Type[BaseModel],
+    metrics: Optional[StreamMetrics] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream `schema` fields from a chat model that supports `response_format`.
+
+    Yields partial dicts as tokens arrive; the final dict validates against
+    `schema`.
+    """
+    bound = model.bind(response_format=schema)
+    yield from iter_partial_fields((message_text(chunk) for chunk in bound.stream(messages)), metrics)
+
+
+class FieldPrinter:
+    """Print partial fields to stdout as they grow, one line per field."""
+
+    def __init__(self):
+        self.printed: Dict[str, str] = {}
+
+    def update(self, fields: Dict[str, Any]):
+        for name, value in fields.items():
+            value = "" if value is None else str(value)
+            previous = self.printed.get(name)
+            if previous is None:
+                print(f"\n{name}: ", end="")
+                previous = ""
+            if value.startswith(previous) and len(value) > len(previous):
+                print(value[len(previous):], end="", flush=True)
+            self.printed[name] = value
+
+    def finish(self, ttft: Optional[float]):
+        print()
+        if ttft is not None:
+            print(f"TTFT: {ttft * 1000:.0f} ms", flush=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the hello greeting flow.")
+    parser.add_argument("--stream", action="store_true", help="print fields as tokens arrive")
+    return parser.parse_args(argv)
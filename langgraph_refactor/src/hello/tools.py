@@ -1,12 +1,19 @@
 from langchain.tools import tool
 
+from .tool_cache import cached_tool
+
+
+# News changes slowly and many users share a city: serve it from memory and
+# refresh in the background once it is 5 minutes old
+@cached_tool(ttl_seconds=300, stale_seconds=3600, max_entries=4096)
 @tool
 def get_local_news(city: str) -> str:
     """Get most recent local news"""
     return "The fly won the olimpic medal"
 
 
+@cached_tool(ttl_seconds=3600, max_entries=4096)
 @tool
 def get_user_location(user_greeting: str) -> str:
     """Retrieve user information based on user ID."""
-    return "Brazil" if user_greeting == "Oi" else "USA"
\ No newline at end of file
+    return "Brazil" if user_greeting == "Oi" else "USA"
@@ -0,0 +1,78 @@
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+
+from hello.cache import SQLiteResponseCache, cache_key, configure_response_cache
+
+
+def make_model(cache, responses=("first", "second")):
+    return FakeListChatModel(responses=list(responses), cache=cache)
+
+
+def test_repeat_call_is_served_from_cache(tmp_path):
+    cache = SQLiteResponseCache(path=str(tmp_path / "cache.db"))
+    model = make_model(cache)
+
+    assert model.invoke("Oi").content == "first"
+    assert model.invoke("Oi").content == "first"
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    make_model(SQLiteResponseCache(path=path)).invoke("Oi")
+
+    reopened = SQLiteResponseCache(path=path)
+    assert make_model(reopened).invoke("Oi").content == "first"
+    assert reopened.hits == 1
+
+
+def test_message_ids_do_not_change_the_key(tmp_path):
+    cache = SQLiteResponseCache(path=str(tmp_path / "cache.db"))
+    model = make_model(cache)
+
+    model.invoke([HumanMessage("Oi", id="run-1")])
+    assert model.invoke([HumanMessage("Oi", id="run-2")]).content == "first"
+
+
+def test_llm_string_is_part_of_the_key():
+    assert cache_key("[]", "model-a") != cache_key("[]", "model-b")
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = SQLiteResponseCache(path=str(tmp_path / "cache.db"), ttl_seconds=-1)
+    model = make_model(cache)
+
+    assert model.invoke("Oi").content == "first"
+    assert model.invoke("Oi").content == "second"
+    assert cache.hits == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = SQLiteResponseCache(path=str(tmp_path / "cache.db"), max_entries=2)
+    model = make_model(cache, responses=("a", "b", "c", "d"))
+
+    model.invoke("one")
+    model.invoke("two")
+    model.invoke("one")  # refresh "one" so "two" becomes the oldest
+    model.invoke("three")
+
+    assert cache.stats()["entries"] == 2
+    assert model.invoke("one").content == "a"
+    assert model.invoke("two").content == "d"
+
+
+def test_configure_response_cache_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.delenv("LLM_CACHE_PATH", raising=False)
+    assert configure_response_cache() is None
+
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "cache.db"))
+    monkeypatch.setenv("LLM_CACHE_TTL", "60")
+    cache = configure_response_cache()
+    try:
+        assert cache is not None
+        assert cache.ttl_seconds == 60
+    finally:
+        from langchain_core.globals import set_llm_cache
+        set_llm_cache(None)
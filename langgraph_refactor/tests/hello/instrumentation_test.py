@@ -0,0 +1,143 @@
+import json
+
+import pytest
+from langchain.agents import create_agent
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_openai import ChatOpenAI
+from langgraph.graph import END, START, StateGraph
+from typing_extensions import TypedDict
+
+import hello.main_graph as graph_module
+from hello.benchmark import fake_http_client
+from hello.instrumentation import RunInstrumentation
+from hello.tools import get_user_location
+
+
+def spans(handler, kind):
+    return [r for r in handler.records if r["kind"] == kind]
+
+
+def test_graph_nodes_and_llm_tokens_are_recorded(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    handler = RunInstrumentation(jsonl_path=str(tmp_path / "spans.jsonl"))
+    app = graph_module.build_graph(ChatOpenAI(model="gpt-4o-mini", http_client=fake_http_client()))
+
+    app.invoke({"messages": [{"role": "user", "content": "Oi"}]}, config={"callbacks": [handler]})
+    handler.close()
+
+    assert [s["name"] for s in spans(handler, "node")] == ["get_location", "get_news", "llm_response"]
+    (llm,) = spans(handler, "llm")
+    assert llm["name"] == "gpt-4o-mini"
+    assert llm["node"] == "llm_response"
+    assert (llm["input_tokens"], llm["output_tokens"], llm["total_tokens"]) == (120, 30, 150)
+
+    lines = (tmp_path / "spans.jsonl").read_text().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == [r["name"] for r in handler.records]
+
+
+def test_prometheus_text(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    handler = RunInstrumentation(prometheus_path=str(tmp_path / "metrics.prom"))
+    app = graph_module.build_graph(ChatOpenAI(model="gpt-4o-mini", http_client=fake_http_client()))
+
+    for _ in range(2):
+        app.invoke({"messages": [{"role": "user", "content": "Oi"}]}, config={"callbacks": [handler]})
+    handler.close()
+
+    text = (tmp_path / "metrics.prom").read_text()
+    assert "# TYPE langgraph_node_duration_seconds histogram" in text
+    assert 'langgraph_node_duration_seconds_count{node="get_news"} 2' in text
+    assert 'langgraph_node_duration_seconds_bucket{le="+Inf",node="llm_response"} 2' in text
+    assert 'langgraph_llm_tokens_total{model="gpt-4o-mini",node="llm_response",type="input"} 240' in text
+    assert 'langgraph_llm_tokens_total{model="gpt-4o-mini",node="llm_response",type="output"} 60' in text
+
+
+def test_prometheus_file_is_written_while_spans_finish(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    every_span = RunInstrumentation(prometheus_path=str(tmp_path / "every.prom"), prometheus_interval=0)
+    on_close = RunInstrumentation(prometheus_path=str(tmp_path / "close.prom"), prometheus_interval=None)
+    app = graph_module.build_graph(ChatOpenAI(model="gpt-4o-mini", http_client=fake_http_client()))
+
+    app.invoke({"messages": [{"role": "user", "content": "Oi"}]}, config={"callbacks": [every_span, on_close]})
+
+    # No close() yet
+    assert 'langgraph_node_duration_seconds_count{node="llm_response"} 1' in (tmp_path / "every.prom").read_text()
+    assert not (tmp_path / "close.prom").exists()
+    on_close.close()
+    assert (tmp_path / "close.prom").read_text() == on_close.prometheus_text()
+
+
+def test_streaming_llm_records_time_to_first_token():
+    handler = RunInstrumentation()
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="Oi tudo bem com voce")]))
+
+    chunks = list(model.stream("Oi", config={"callbacks": [handler]}))
+
+    assert len(chunks) > 1
+    (llm,) = spans(handler, "llm")
+    assert 0 <= llm["ttft_s"] <= llm["duration_s"]
+    assert handler.ttft
+
+
+class ToolCallingFakeModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def test_create_agent_tools_are_attributed_to_the_tools_node():
+    handler = RunInstrumentation()
+    model = ToolCallingFakeModel(messages=iter([
+        AIMessage(content="", tool_calls=[{"name": "get_user_location", "args": {"user_greeting": "Oi"}, "id": "call-1"}]),
+        AIMessage(content="Oi! Tudo bem?"),
+    ]))
+    agent = create_agent(model=model, tools=[get_user_location])
+
+    agent.invoke({"messages": [{"role": "user", "content": "Oi"}]}, config={"callbacks": [handler]})
+
+    (tool,) = spans(handler, "tool")
+    assert tool["name"] == "get_user_location"
+    assert tool["node"] == "tools"
+    assert [s["name"] for s in spans(handler, "node")] == ["model", "tools", "model"]
+    assert len(spans(handler, "llm")) == 2
+
+
+class FlakyState(TypedDict, total=False):
+    value: int
+
+
+def test_retries_and_errors_are_counted():
+    attempts = []
+
+    def flaky(value):
+        attempts.append(value)
+        if len(attempts) < 3:
+            raise ConnectionError("try again")
+        return value
+
+    retrying = RunnableLambda(flaky).with_retry(
+        retry_if_exception_type=(ConnectionError,), stop_after_attempt=3, wait_exponential_jitter=False
+    )
+
+    def call_backend(state: FlakyState) -> FlakyState:
+        return {"value": retrying.invoke(state["value"])}
+
+    def explode(state: FlakyState) -> FlakyState:
+        raise ValueError("boom")
+
+    graph = StateGraph(FlakyState)
+    graph.add_node("call_backend", call_backend)
+    graph.add_node("explode", explode)
+    graph.add_edge(START, "call_backend")
+    graph.add_edge("call_backend", "explode")
+    graph.add_edge("explode", END)
+    handler = RunInstrumentation()
+
+    with pytest.raises(ValueError):
+        graph.compile().invoke({"value": 1}, config={"callbacks": [handler]})
+
+    assert handler.retries == {(("node", "call_backend"),): 2}
+    assert handler.errors == {("node", (("node", "explode"),)): 1}
+    assert spans(handler, "node")[-1]["error"] == "ValueError: boom"
+    assert 'langgraph_retries_total{node="call_backend"} 2' in handler.prometheus_text()
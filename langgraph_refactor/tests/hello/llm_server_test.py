@@ -0,0 +1,152 @@
+import json
+
+import openai
+import pytest
+from langchain.agents import create_agent
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+import hello.main_graph as graph_module
+from hello.llm_server import Cassette, LatencyModel, StandInServer, request_key, request_shape
+from hello.tools import get_user_location
+
+
+def completion(message, usage=(50, 10)):
+    return {
+        "id": "chatcmpl-recorded",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o-mini-2024-07-18",
+        "choices": [{"index": 0, "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
+                     "message": {"role": "assistant", "content": None, **message}}],
+        "usage": {"prompt_tokens": usage[0], "completion_tokens": usage[1], "total_tokens": sum(usage)},
+    }
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Plays the real API for record-mode tests: answers with `upstream.answers` in order."""
+    with StandInServer() as server:
+        server.answers = []
+        monkeypatch.setattr(server, "chat", lambda body, authorization=None: (server.answers.pop(0), 0.0))
+        yield server
+
+
+def record(server, request, message):
+    server.cassette.record("chat", request, completion(message), latency=0.2)
+
+
+def test_replays_and_streams_a_recorded_completion(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "replay")
+    with StandInServer(str(tmp_path / "cassette.jsonl")) as server:
+        model = ChatOpenAI(model="gpt-4o-mini", base_url=server.base_url, temperature=0)
+        request = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "Oi"}], "temperature": 0.0}
+        record(server, request, {"content": "Olá! Tudo bem?"})
+
+        assert model.invoke("Oi").content == "Olá! Tudo bem?"
+        chunks = list(model.stream("Oi"))
+
+    assert len(chunks) > 2
+    assert "".join(chunk.content for chunk in chunks) == "Olá! Tudo bem?"
+    assert server.stats["exact"] == 2
+
+
+def test_unrecorded_chat_request_is_an_error(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "replay")
+    with StandInServer(str(tmp_path / "cassette.jsonl")) as server:
+        model = ChatOpenAI(model="gpt-4o-mini", base_url=server.base_url, max_retries=0)
+        with pytest.raises(openai.NotFoundError):
+            model.invoke("never recorded")
+    assert server.stats["miss"] == 1
+
+
+def test_record_then_replay_an_agent_tool_loop_offline(tmp_path, monkeypatch, upstream):
+    monkeypatch.setenv("OPENAI_API_KEY", "replay")
+    cassette = str(tmp_path / "cassette.jsonl")
+    tool_call = {"tool_calls": [{"id": "call_1", "type": "function", "function": {
+        "name": "get_user_location", "arguments": json.dumps({"user_greeting": "Oi"})}}]}
+
+    def run_agent(base_url, stream):
+        model = ChatOpenAI(model="gpt-4o-mini", base_url=base_url, max_retries=0, streaming=stream)
+        agent = create_agent(model=model, tools=[get_user_location])
+        return agent.invoke({"messages": [{"role": "user", "content": "Oi"}]})
+
+    upstream.answers = [completion(tool_call), completion({"content": "Você está no Brasil!"})]
+    with StandInServer(cassette, mode="record", upstream=upstream.base_url) as recorder:
+        recorded = run_agent(recorder.base_url, stream=False)
+    assert recorder.stats["recorded"] == 2
+    assert recorded["messages"][-1].content == "Você está no Brasil!"
+
+    with StandInServer(cassette) as replayer:
+        replayed = run_agent(replayer.base_url, stream=True)
+
+    assert replayed["messages"][1].tool_calls[0]["name"] == "get_user_location"
+    assert replayed["messages"][2].content == "Brazil"
+    assert replayed["messages"][-1].content == "Você está no Brasil!"
+    assert replayer.stats == {"exact": 2, "shape": 0, "miss": 0, "recorded": 0}
+
+
+def test_shape_match_ignores_volatile_tool_output():
+    def request(tool_output):
+        return {"model": "gpt-4o-mini", "messages": [
+            {"role": "user", "content": "What time is it?"},
+            {"role": "assistant", "content": None, "tool_calls": [
+                {"id": "c1", "type": "function", "function": {"name": "current_time", "arguments": "{}"}}]},
+            {"role": "tool", "tool_call_id": "c1", "content": tool_output},
+        ]}
+
+    cassette = Cassette(None)
+    cassette.record("chat", request("12:00:01"), completion({"content": "It is noon."}), latency=0.1)
+
+    assert request_key(request("12:00:01")) != request_key(request("12:00:02"))
+    assert request_shape(request("12:00:01")) == request_shape(request("12:00:02"))
+    entry, outcome = cassette.lookup(request_key(request("12:00:02")), request_shape(request("12:00:02")))
+    assert outcome == "shape"
+    assert entry["response"]["choices"][0]["message"]["content"] == "It is noon."
+
+
+def test_hello_graph_records_and_replays(tmp_path, monkeypatch, upstream):
+    monkeypatch.setenv("OPENAI_API_KEY", "replay")
+    cassette = str(tmp_path / "cassette.jsonl")
+    greeting = json.dumps({"greeting": "Oi!", "news": "The fly won the olimpic medal", "chat": "Uma mosca?"})
+    upstream.answers = [completion({"content": greeting})]
+
+    with StandInServer(cassette, mode="record", upstream=upstream.base_url) as recorder:
+        monkeypatch.setenv("BASE_URL", recorder.base_url)
+        graph_module.build_graph().invoke({"messages": [{"role": "user", "content": "Oi"}]})
+
+    with StandInServer(cassette, latency="fixed:0.01") as replayer:
+        monkeypatch.setenv("BASE_URL", replayer.base_url)
+        final_state = graph_module.build_graph().invoke({"messages": [{"role": "user", "content": "Oi"}]})
+
+    assert final_state["structured_response"].chat == "Uma mosca?"
+    assert replayer.stats["exact"] == 1
+
+
+def test_unrecorded_embeddings_are_deterministic(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "replay")
+    with StandInServer(str(tmp_path / "cassette.jsonl"), embedding_dimensions=8) as server:
+        embeddings = OpenAIEmbeddings(model="text-embedding-3-small", base_url=server.base_url,
+                                      check_embedding_ctx_length=False)
+        first = embeddings.embed_documents(["a", "b"])
+        again = embeddings.embed_query("a")
+
+    assert len(first[0]) == 8
+    assert first[0] == again
+    assert first[0] != first[1]
+
+
+@pytest.mark.parametrize("spec, low, high", [
+    ("0", 0, 0), ("fixed:0.2", 0.2, 0.2), ("uniform:0.1,0.3", 0.1, 0.3), ("normal:0.3,0.05", 0, 1),
+    ("lognormal:-1.2,0.4", 0, 5),
+])
+def test_latency_model_samples(spec, low, high):
+    model = LatencyModel(spec, seed=1)
+    assert all(low <= model.sample() <= high for _ in range(100))
+
+
+def test_recorded_latency_and_invalid_specs():
+    assert LatencyModel("recorded").sample(recorded=0.7) == 0.7
+    with pytest.raises(ValueError):
+        LatencyModel("gamma:1,2")
+    with pytest.raises(ValueError):
+        LatencyModel("uniform:1")
@@ -0,0 +1,208 @@
+import asyncio
+import gc
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+
+from hello.schemas import GreetingsResponse
+import hello.main_graph as graph_module
+
+
+class DummyStructuredModel:
+    def __init__(self):
+        self.calls = []
+
+    def invoke(self, messages):
+        self.calls.append(messages)
+        return GreetingsResponse(greeting="Oi!", news="The fly won", chat="Uma mosca?")
+
+
+class DummyModel:
+    def __init__(self):
+        self.bind_count = 0
+        self.structured = DummyStructuredModel()
+
+    def with_structured_output(self, schema):
+        assert schema is GreetingsResponse
+        self.bind_count += 1
+        return self.structured
+
+
+def test_build_graph_reuses_one_model_across_invocations(monkeypatch):
+    def fail_create_model():
+        raise AssertionError("create_model should not be called per invocation")
+
+    monkeypatch.setattr(graph_module, "create_model", fail_create_model)
+
+    model = DummyModel()
+    app = graph_module.build_graph(model)
+
+    for _ in range(3):
+        final_state = app.invoke({"messages": [{"role": "user", "content": "Oi"}]})
+        assert final_state["structured_response"].greeting == "Oi!"
+
+    assert model.bind_count == 1
+    assert len(model.structured.calls) == 3
+
+
+def test_build_graph_creates_the_default_model_lazily_once(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    created = []
+
+    def create_model():
+        created.append(DummyModel())
+        return created[-1]
+
+    monkeypatch.setattr(graph_module, "create_model", create_model)
+
+    app = graph_module.build_graph()
+    assert created == []
+
+    for _ in range(2):
+        app.invoke({"messages": [{"role": "user", "content": "Oi"}]})
+
+    assert len(created) == 1
+    assert created[0].bind_count == 1
+
+
+def test_build_graph_compiles_without_credentials(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    assert graph_module.build_graph() is not None
+
+
+def test_llm_prompt_includes_resolved_location_and_news():
+    model = DummyModel()
+    app = graph_module.build_graph(model)
+
+    app.invoke({"messages": [{"role": "user", "content": "Oi"}]})
+
+    system_prompt = model.structured.calls[0][0]["content"]
+    assert "User location: Brazil" in system_prompt
+    assert "The fly won the olimpic medal" in system_prompt
+
+
+class CountingTool:
+    def __init__(self, tool):
+        self.tool = tool
+        self.inputs = []
+
+    def run(self, value):
+        self.inputs.append(value)
+        return self.tool.run(value)
+
+
+def test_speculative_graph_reuses_prefetched_news_on_hit(monkeypatch):
+    news_tool = CountingTool(graph_module.get_local_news)
+    monkeypatch.setattr(graph_module, "get_local_news", news_tool)
+    monkeypatch.setattr(graph_module, "DEFAULT_REGION", "Brazil")
+
+    app = graph_module.build_graph(DummyModel(), speculative=True)
+    final_state = app.invoke({"messages": [{"role": "user", "content": "Oi"}]})
+
+    assert final_state["location"] == "Brazil"
+    assert final_state["news"] == "The fly won the olimpic medal"
+    assert news_tool.inputs == ["Brazil"]
+    assert "prefetch" not in final_state
+
+
+def test_speculative_graph_refetches_on_miss(monkeypatch):
+    news_tool = CountingTool(graph_module.get_local_news)
+    monkeypatch.setattr(graph_module, "get_local_news", news_tool)
+    monkeypatch.setattr(graph_module, "DEFAULT_REGION", "Brazil")
+
+    app = graph_module.build_graph(DummyModel(), speculative=True)
+    final_state = app.invoke({"messages": [{"role": "user", "content": "Hello"}]})
+
+    assert final_state["location"] == "USA"
+    assert final_state["news"] == "The fly won the olimpic medal"
+    assert "USA" in news_tool.inputs
+    assert "prefetch" not in final_state
+
+
+def test_speculative_state_can_be_checkpointed(monkeypatch):
+    monkeypatch.setattr(graph_module, "DEFAULT_REGION", "Brazil")
+    app = graph_module.build_graph(DummyModel(), speculative=True)
+    app.checkpointer = InMemorySaver()
+
+    config = {"configurable": {"thread_id": "1"}}
+    final_state = app.invoke({"messages": [{"role": "user", "content": "Oi"}]}, config)
+
+    assert set(final_state) == {"messages", "location", "news", "structured_response"}
+    assert app.get_state(config).values["news"] == "The fly won the olimpic medal"
+
+
+def test_speculative_graph_keeps_working_through_with_config(monkeypatch):
+    monkeypatch.setattr(graph_module, "DEFAULT_REGION", "Brazil")
+    app = graph_module.build_graph(DummyModel(), speculative=True).with_config(tags=["x"])
+    gc.collect()
+
+    for greeting, location in [("Oi", "Brazil"), ("Hello", "USA")]:
+        final_state = app.invoke({"messages": [{"role": "user", "content": greeting}]})
+        assert final_state["location"] == location
+
+
+def test_speculative_prefetcher_is_shut_down_with_the_last_graph():
+    prefetcher = graph_module.NewsPrefetcher(max_workers=1)
+    executor = prefetcher.executor
+    app = graph_module.build_graph(DummyModel(), speculative=True, prefetcher=prefetcher).with_config(tags=["x"])
+    del prefetcher
+    gc.collect()
+
+    app.invoke({"messages": [{"role": "user", "content": "Oi"}]})
+    assert not executor._shutdown
+
+    del app
+    gc.collect()
+    assert executor._shutdown
+
+
+def test_speculative_graph_fans_out_and_joins(monkeypatch):
+    monkeypatch.setattr(graph_module, "DEFAULT_REGION", "Brazil")
+    app = graph_module.build_graph(DummyModel(), speculative=True)
+
+    steps = [set(update) for update in app.stream({"messages": [{"role": "user", "content": "Oi"}]})]
+
+    assert steps[:3] == [{"get_location"}, {"prefetch_news"}, {"get_news"}] or \
+        steps[:3] == [{"prefetch_news"}, {"get_location"}, {"get_news"}]
+
+
+class AsyncDummyStructuredModel(DummyStructuredModel):
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+
+class AsyncDummyModel(DummyModel):
+    def __init__(self):
+        super().__init__()
+        self.structured = AsyncDummyStructuredModel()
+
+
+def test_async_graph_serves_concurrent_sessions():
+    model = AsyncDummyModel()
+    app = graph_module.build_graph(model, asynchronous=True)
+
+    async def run_sessions():
+        return await asyncio.gather(*(
+            app.ainvoke({"messages": [{"role": "user", "content": greeting}]})
+            for greeting in ["Oi", "Hello"] * 5
+        ))
+
+    final_states = asyncio.run(run_sessions())
+
+    assert [state["location"] for state in final_states[:2]] == ["Brazil", "USA"]
+    assert all(state["structured_response"].greeting == "Oi!" for state in final_states)
+    assert len(model.structured.calls) == 10
+    assert model.bind_count == 1
+
+
+@pytest.mark.parametrize("greeting, location", [("Oi", "Brazil"), ("Hello", "USA")])
+def test_async_speculative_graph(monkeypatch, greeting, location):
+    monkeypatch.setattr(graph_module, "DEFAULT_REGION", "Brazil")
+    app = graph_module.build_graph(AsyncDummyModel(), speculative=True, asynchronous=True)
+
+    final_state = asyncio.run(app.ainvoke({"messages": [{"role": "user", "content": greeting}]}))
+
+    assert final_state["location"] == location
+    assert final_state["news"] == "The fly won the olimpic medal"
+    assert "prefetch" not in final_state
@@ -1,4 +1,8 @@
+import re
+import time
+
 from langchain.agents.structured_output import ToolStrategy
+from langchain_core.messages import AIMessageChunk
 from hello.schemas import GreetingsResponse
 import hello.main as main_module
 
@@ -81,3 +85,25 @@ def test_main_creates_agent_and_invokes(monkeypatch, capsys):
     assert any("greeting" in line for line in out[0:1])
     # Last line should be the literal "END"
     assert out[-1] == "END"
+
+
+def test_stream_agent_ttft_starts_at_the_final_model_call(capsys):
+    class StreamingAgent:
+        def stream(self, input_, config, stream_mode):
+            (timer,) = config["callbacks"]
+            timer.on_chat_model_start({}, [])
+            yield "messages", (AIMessageChunk(content="", tool_call_chunks=[
+                {"name": "get_user_location", "args": '{"user_greeting": "Oi"}', "index": 0, "id": "a"},
+            ]), {})
+            time.sleep(0.3)  # the tool runs
+            timer.on_chat_model_start({}, [])
+            yield "messages", (AIMessageChunk(content="", tool_call_chunks=[
+                {"name": "GreetingsResponse", "args": '{"greeting": "Olá!"}', "index": 0, "id": "b"},
+            ]), {})
+            yield "values", {"structured_response": "done"}
+
+    assert main_module.stream_agent(StreamingAgent(), {}) == {"structured_response": "done"}
+
+    out = capsys.readouterr().out
+    assert "greeting: Olá!" in out
+    assert int(re.search(r"TTFT: (\d+) ms", out).group(1)) < 300
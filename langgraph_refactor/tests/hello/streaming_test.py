@@ -0,0 +1,85 @@
+import json
+
+from langchain_core.messages import AIMessageChunk
+
+from hello.schemas import GreetingsResponse
+from hello.streaming import StreamMetrics, iter_partial_fields, iter_tool_call_args
+import hello.main_graph as graph_module
+
+
+GREETING_JSON = json.dumps(
+    {"greeting": "Olá!", "news": "The fly won", "chat": "Uma mosca?"}, ensure_ascii=False
+)
+
+
+def split_tokens(text, size=4):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class StreamingDummyModel:
+    def __init__(self):
+        self.bound_kwargs = None
+
+    def with_structured_output(self, schema):
+        return self
+
+    def bind(self, **kwargs):
+        self.bound_kwargs = kwargs
+        return self
+
+    def stream(self, messages):
+        for token in split_tokens(GREETING_JSON):
+            yield AIMessageChunk(content=token)
+
+
+def test_partial_fields_arrive_in_order():
+    metrics = StreamMetrics()
+    partials = list(iter_partial_fields(split_tokens(GREETING_JSON), metrics))
+
+    first_with = {name: next(i for i, p in enumerate(partials) if name in p) for name in ("greeting", "news", "chat")}
+    assert first_with["greeting"] < first_with["news"] < first_with["chat"]
+    assert GreetingsResponse(**partials[-1]).chat == "Uma mosca?"
+
+    assert metrics.time_to_first_token is not None
+    assert metrics.time_to_first_token <= metrics.time_to_first_field <= metrics.total_time
+    assert metrics.chunks == len(split_tokens(GREETING_JSON))
+
+
+def test_tool_call_args_are_followed_by_index():
+    chunks = [
+        AIMessageChunk(content="", tool_call_chunks=[{"name": "get_user_location", "args": '{"user_greeting"', "index": 0, "id": "a"}]),
+        AIMessageChunk(content="", tool_call_chunks=[{"name": None, "args": ': "Oi"}', "index": 0, "id": None}]),
+        AIMessageChunk(content="", tool_call_chunks=[{"name": "GreetingsResponse", "args": '{"greeting": "O', "index": 0, "id": "b"}]),
+        AIMessageChunk(content="", tool_call_chunks=[{"name": None, "args": 'i"}', "index": 0, "id": None}]),
+    ]
+
+    assert "".join(iter_tool_call_args(chunks, "GreetingsResponse")) == '{"greeting": "Oi"}'
+
+
+def test_streaming_graph_emits_partials_and_metrics():
+    model = StreamingDummyModel()
+    app = graph_module.build_graph(model, streaming=True)
+
+    partials, metrics, final_state = [], [], None
+    for mode, chunk in app.stream(
+        {"messages": [{"role": "user", "content": "Oi"}]}, stream_mode=["custom", "values"]
+    ):
+        if mode == "values":
+            final_state = chunk
+        elif "partial" in chunk:
+            partials.append(chunk["partial"])
+        else:
+            metrics.append(chunk["metrics"])
+
+    assert model.bound_kwargs == {"response_format": GreetingsResponse}
+    assert list(partials[0]) == ["greeting"]
+    assert final_state["structured_response"] == GreetingsResponse(**json.loads(GREETING_JSON))
+    assert metrics[0]["ttft"] is not None
+
+
+def test_streaming_graph_still_works_with_invoke():
+    app = graph_module.build_graph(StreamingDummyModel(), streaming=True)
+
+    final_state = app.invoke({"messages": [{"role": "user", "content": "Oi"}]})
+
+    assert final_state["structured_response"].greeting == "Olá!"
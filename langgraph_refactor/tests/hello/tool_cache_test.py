@@ -0,0 +1,221 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from langchain.tools import tool
+
+from hello.tool_cache import ToolResultCache, cached_tool, tool_cache_stats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_counting_tool(**cache_kwargs):
+    calls = []
+
+    @cached_tool(**cache_kwargs)
+    @tool
+    def lookup_city(city: str) -> str:
+        """Look up a city."""
+        calls.append(city)
+        return f"news for {city} #{len(calls)}"
+
+    return lookup_city, calls
+
+
+def test_repeat_run_is_served_from_cache():
+    lookup_city, calls = make_counting_tool()
+
+    assert lookup_city.run("Recife") == "news for Recife #1"
+    assert lookup_city.run("Recife") == "news for Recife #1"
+    assert lookup_city.invoke({"city": "Recife"}) == "news for Recife #1"
+
+    assert calls == ["Recife"]
+    stats = tool_cache_stats()["lookup_city"]
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_different_arguments_are_different_entries():
+    lookup_city, calls = make_counting_tool()
+
+    lookup_city.run("Recife")
+    lookup_city.run("Tokyo")
+
+    assert calls == ["Recife", "Tokyo"]
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ToolResultCache("t", max_entries=2)
+
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("c", lambda: 3)
+
+    assert cache.get_or_compute("a", lambda: "recomputed") == 1
+    assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+    assert cache.stats()["evictions"] == 2
+
+
+def test_expired_entry_is_recomputed():
+    clock = FakeClock()
+    cache = ToolResultCache("t", ttl_seconds=10, clock=clock)
+
+    cache.get_or_compute("k", lambda: "old")
+    clock.now = 11
+
+    assert cache.get_or_compute("k", lambda: "new") == "new"
+    assert cache.stats()["misses"] == 2
+
+
+def test_stale_entry_is_served_while_refreshing():
+    clock = FakeClock()
+    cache = ToolResultCache("t", ttl_seconds=10, stale_seconds=60, clock=clock)
+    refreshed = threading.Event()
+
+    def refresh():
+        refreshed.set()
+        return "new"
+
+    cache.get_or_compute("k", lambda: "old")
+    clock.now = 20
+
+    assert cache.get_or_compute("k", refresh) == "old"
+    assert refreshed.wait(timeout=5)
+    for _ in range(100):
+        if cache.stats()["refreshes"]:
+            break
+        time.sleep(0.01)
+    assert cache.get_or_compute("k", lambda: "unused") == "new"
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_exceptions_are_not_cached():
+    cache = ToolResultCache("t")
+
+    def fail():
+        raise RuntimeError("backend down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("k", fail)
+    assert cache.get_or_compute("k", lambda: "ok") == "ok"
+
+
+def test_concurrent_misses_share_one_call():
+    cache = ToolResultCache("t")
+    calls = []
+    release = threading.Event()
+
+    def slow():
+        calls.append(1)
+        release.wait(timeout=5)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("k", slow)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+
+
+def test_async_invoke_uses_the_cache():
+    lookup_city, calls = make_counting_tool()
+
+    async def run():
+        first = await lookup_city.ainvoke({"city": "Osaka"})
+        second = await lookup_city.ainvoke({"city": "Osaka"})
+        return first, second
+
+    assert asyncio.run(run()) == ("news for Osaka #1", "news for Osaka #1")
+    assert calls == ["Osaka"]
+
+
+def test_concurrent_async_misses_share_one_call():
+    cache = ToolResultCache("t")
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(*(cache.aget_or_compute("k", slow) for _ in range(8)))
+
+    assert asyncio.run(run()) == ["value"] * 8
+    assert len(calls) == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_concurrent_async_misses_share_the_failure():
+    cache = ToolResultCache("t")
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise RuntimeError("backend down")
+
+    async def run():
+        return await asyncio.gather(*(cache.aget_or_compute("k", fail) for _ in range(4)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert asyncio.run(cache.aget_or_compute("k", lambda: asyncio.sleep(0, "ok"))) == "ok"
+
+
+def test_async_refresh_dropped_with_its_loop_is_retried():
+    clock = FakeClock()
+    cache = ToolResultCache("t", ttl_seconds=10, stale_seconds=60, clock=clock)
+    cache.get_or_compute("k", lambda: "old")
+    clock.now = 20
+
+    async def never():
+        await asyncio.Event().wait()
+
+    # The refresh task is still pending when its loop is closed
+    loop = asyncio.new_event_loop()
+    loop.set_exception_handler(lambda loop, context: None)  # "Task was destroyed but it is pending!"
+    assert loop.run_until_complete(cache.aget_or_compute("k", never)) == "old"
+    loop.close()
+
+    async def refresh_again():
+        stale = await cache.aget_or_compute("k", lambda: asyncio.sleep(0, "new"))
+        await asyncio.sleep(0.01)
+        return stale
+
+    assert asyncio.run(refresh_again()) == "old"
+    assert cache.stats()["refreshes"] == 1
+    assert cache.get_or_compute("k", lambda: "unused") == "new"
+
+
+def test_cancelled_async_refresh_is_cleared():
+    clock = FakeClock()
+    cache = ToolResultCache("t", ttl_seconds=10, stale_seconds=60, clock=clock)
+    cache.get_or_compute("k", lambda: "old")
+    clock.now = 20
+
+    async def never():
+        await asyncio.Event().wait()
+
+    # asyncio.run cancels the pending refresh on exit
+    assert asyncio.run(cache.aget_or_compute("k", never)) == "old"
+
+    assert cache._refreshing == {}
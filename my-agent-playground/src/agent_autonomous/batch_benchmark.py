@@ -0,0 +1,69 @@
+"""
+Batch scheduling of a school district: one joint solve vs solve_batch.
+
+Run with:
+
+    python -m src.agent_autonomous.batch_benchmark
+
+The district is several synthetic schools (see solver_benchmark) merged
+into one SchoolFacts, with every requirement naming its teacher from the
+same school. solve_batch splits it back into independent schools and
+solves them in a process pool (the speedup is bounded by the CPU count);
+the whole timetable is then persisted in one transaction.
+"""
+
+import os
+import tempfile
+import time
+
+from .models import SchoolFacts
+from .solver import partition, solve, solve_batch
+from .solver_benchmark import DAYS, HOURS, make_school
+from .storage import SchoolStore
+from .validator import ScheduleValidator
+
+SCHOOLS = 8
+CLASSROOMS_PER_SCHOOL = 100
+TEACHERS_PER_SCHOOL = 160
+
+
+def make_district(schools: int) -> SchoolFacts:
+    professors, requirements = [], []
+    for s in range(schools):
+        school = make_school(CLASSROOMS_PER_SCHOOL, TEACHERS_PER_SCHOOL, seed=s)
+        professors += [p.model_copy(update={"name": f"S{s} {p.name}"}) for p in school.professors]
+        requirements += [
+            r.model_copy(update={"classroom": f"S{s}-{r.classroom}", "teacher": f"S{s} {r.teacher}"})
+            for part in partition(school)
+            for r in part.requirements
+        ]
+    return SchoolFacts(days=DAYS, hours=HOURS, professors=professors, requirements=requirements)
+
+
+def main():
+    facts = make_district(SCHOOLS)
+    lessons = sum(r.lessons for r in facts.requirements)
+    print(f"{SCHOOLS} schools, {len(facts.professors)} teachers, {lessons} lessons")
+    print(f"  {len(partition(facts))} independent groups, {os.cpu_count()} CPUs")
+
+    start = time.perf_counter()
+    joint = solve(facts)
+    print(f"  joint solve:       {time.perf_counter() - start:6.2f} s")
+
+    start = time.perf_counter()
+    batched = solve_batch(facts)
+    print(f"  solve_batch:       {time.perf_counter() - start:6.2f} s")
+
+    validator = ScheduleValidator(facts.professors, facts.requirements, facts.days, facts.hours)
+    for label, timetable in (("joint", joint), ("batch", batched)):
+        print(f"  {label} violations:  {len(validator.validate(timetable))}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        with SchoolStore(os.path.join(directory, "school.db")) as store:
+            start = time.perf_counter()
+            written = store.persist_classrooms(batched)
+            print(f"  persisted {written} slots in one transaction: {time.perf_counter() - start:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,111 +1,43 @@
+import argparse
 import os
-import sqlite3
-from typing import List
-from pydantic import BaseModel, Field
+from pathlib import Path
+from typing import List, Optional, Sequence
 from dotenv import load_dotenv
 
 from langchain.chat_models import init_chat_model
 from langchain.agents import create_agent
 from langchain.agents.structured_output import ToolStrategy
 
-# =======================
-#   Pydantic Models
-# =======================
-
-class Professor(BaseModel):
-    name: str = Field(description="Full name of the teacher")
-    available_days: List[str] = Field(description="Available days: mon, tue, wed, thu, fri")
-    available_hours: List[int] = Field(description="Available hours represented as integers")
-    subjects: List[str] = Field(description="List of subjects taught by the teacher")
-
-
-class Subject(BaseModel):
-    name: str = Field(description="Name of the subject")
-
-
-class Slot(BaseModel):
-    day: str = Field(description="Day of the week: mon, tue, wed, thu, fri")
-    hour: int = Field(description="Class hour as an integer")
-    subject: str = Field(description="Name of the subject")
-    teacher: str = Field(description="Name of the teacher")
-    classroom: str = Field(description="Class group name")
-
-
-class Classroom(BaseModel):
-    name: str = Field(description="Identifier name for the classroom group")
-    subjects: List[Subject] = Field(description="List of subjects assigned to the class")
-    slots: List[Slot] = Field(description="List of scheduled class slots")
-
-
-class ScheduleResponse(BaseModel):
-    classroom: Classroom = Field(description="Final structured schedule result")
+from ..agent_examples.cache import configure_response_cache
+from .models import Classroom, ScheduleResponse, SchoolFacts, Slot
+from .queries import other_bookings
+from .solver import UnsatisfiableError, solve, solve_batch
+from .validator import ScheduleValidator, format_violations
+from .storage import get_store
 
 # ==================================
 #   SQLite Database Setup
 # ==================================
 
 def init_db():
-    conn = sqlite3.connect("school.db")
-    c = conn.cursor()
-
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS professor (
-            name TEXT PRIMARY KEY
-        )
-    """)
-
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS subject (
-            name TEXT PRIMARY KEY
-        )
-    """)
-
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS classroom (
-            name TEXT PRIMARY KEY
-        )
-    """)
-
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS slot (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            day TEXT,
-            hour INTEGER,
-            subject TEXT,
-            teacher TEXT,
-            classroom TEXT
-        )
-    """)
-
-    conn.commit()
-    conn.close()
+    get_store()
 
 
 def persist_classroom(classroom: Classroom):
-    conn = sqlite3.connect("school.db")
-    c = conn.cursor()
-
-    c.execute("INSERT OR IGNORE INTO classroom (name) VALUES (?)", (classroom.name,))
+    get_store().persist_classroom(classroom)
 
-    for s in classroom.subjects:
-        c.execute("INSERT OR IGNORE INTO subject (name) VALUES (?)", (s.name,))
 
-    for slot in classroom.slots:
-        c.execute("INSERT OR IGNORE INTO professor (name) VALUES (?)", (slot.teacher,))
-        c.execute("""
-            INSERT INTO slot (day, hour, subject, teacher, classroom)
-            VALUES (?, ?, ?, ?, ?)
-        """, (slot.day, slot.hour, slot.subject, slot.teacher, classroom.name))
-
-    conn.commit()
-    conn.close()
+def persist_classrooms(classrooms: List[Classroom]):
+    """Persist many classrooms in a single transaction."""
+    get_store().persist_classrooms(classrooms)
 
 # ====================================
 #      LLM Agent Setup
 # ====================================
 
-def create_schedule_agent():
+def create_schedule_agent(response_format=SchoolFacts):
     load_env()
+    configure_response_cache()
 
     model = init_chat_model(
         "gpt-4o-mini",
@@ -117,7 +49,7 @@ def create_schedule_agent():
 
     return create_agent(
         model=model,
-        response_format=ToolStrategy(ScheduleResponse)
+        response_format=ToolStrategy(response_format)
     )
 
 
@@ -126,45 +58,135 @@ def load_env():
     if not os.getenv("BASE_URL"):
         print("BASE_URL is missing in .env environment file.")
 
+def llm_schedule(facts: SchoolFacts, max_attempts: int = 3, booked: Sequence[Slot] = ()) -> List[Classroom]:
+    """
+    Let the model write each classroom's timetable, validating every answer
+    (against `booked` lessons of other classrooms too) and sending the
+    violations back for a targeted repair. Classrooms still invalid after
+    `max_attempts` are built by the solver around the accepted ones; only
+    if that is impossible is the whole school solved again.
+    """
+    agent = create_schedule_agent(ScheduleResponse)
+    validator = ScheduleValidator(facts.professors, facts.requirements, facts.days, facts.hours)
+    accepted: List[Classroom] = []
+    rejected: List[str] = []
+    names = list(dict.fromkeys(r.classroom for r in facts.requirements))
+
+    for name in names:
+        messages = [
+            {
+                "role": "system",
+                "content": "You are a specialist in generating valid school timetables."
+            },
+            {
+                "role": "user",
+                "content": f"Generate the schedule of class group {name} from these facts: "
+                           f"{facts.model_dump_json()}. "
+                           f"These lessons are already booked: "
+                           f"{[slot.model_dump() for slot in booked] + [slot.model_dump() for c in accepted for slot in c.slots]}. "
+                           f"Respect teacher availability constraints. "
+                           f"Return the response in the structure of the Classroom model."
+            }
+        ]
+        for attempt in range(max_attempts):
+            response = agent.invoke({"messages": messages})
+            classroom: Classroom = response["structured_response"].classroom
+            violations = validator.validate([*accepted, classroom], booked)
+            if not violations:
+                accepted.append(classroom)
+                break
+            print(f"{name}: {len(violations)} violations (attempt {attempt + 1}), asking for a repair")
+            messages = response["messages"] + [{
+                "role": "user",
+                "content": f"The schedule breaks these rules:\n{format_violations(violations)}\n"
+                           f"Move only the slots involved and return the full corrected schedule."
+            }]
+        else:
+            print(f"{name}: still invalid, the solver will build it")
+            rejected.append(name)
+
+    if not rejected:
+        return accepted
+    remaining = facts.model_copy(update={
+        "requirements": [r for r in facts.requirements if r.classroom in rejected],
+    })
+    try:
+        solved = solve(remaining, booked=[*booked, *(slot for c in accepted for slot in c.slots)])
+    except UnsatisfiableError as e:
+        print(f"Cannot fit {', '.join(rejected)} around the accepted timetables ({e}), solving all classrooms")
+        return solve(facts, booked=booked)
+    by_name = {classroom.name: classroom for classroom in [*accepted, *solved]}
+    return [by_name[name] for name in names]
+
+
 # ===============================
 #      Main Logic
 # ===============================
 
-def main():
-    init_db()
-    agent = create_schedule_agent()
+USER_INPUT = """
+Teacher Leandro teaches Geography (one lesson per week), available on Monday before lunch.
+Teacher Tiago teaches Mathematics (3 lessons per week), available every day after 9 AM.
+Teacher Marcio teaches Chemistry (2 lessons per week), available at any time.
+The classroom group is 3A and needs: 1 Geography, 3 Mathematics and 2 Chemistry lessons.
+Available: Monday and Tuesday at 9, 10 and 11.
+"""
 
-    user_input = """
-    Teacher Leandro teaches Geography (one lesson per week), available on Monday before lunch.
-    Teacher Tiago teaches Mathematics (3 lessons per week), available every day after 9 AM.
-    Teacher Marcio teaches Chemistry (2 lessons per week), available at any time.
-    The classroom group is 3A and needs: 1 Geography, 3 Mathematics and 2 Chemistry lessons.
-    Available: Monday and Tuesday at 9, 10 and 11.
-    """
 
+def extract_facts(user_input: str) -> SchoolFacts:
+    """Use the model only to turn the description into SchoolFacts."""
+    agent = create_schedule_agent()
     response = agent.invoke({
         "messages": [
             {
                 "role": "system",
-                "content": "You are a specialist in generating valid school timetables."
+                "content": "You extract school timetable requirements into structured data."
             },
             {
                 "role": "user",
-                "content": f"Generate a valid schedule based on this input: {user_input}. "
-                           f"Respect teacher availability constraints. "
-                           f"Return the response in the structure of the Classroom model."
+                "content": f"Extract the teachers (availability and subjects), the days and hours "
+                           f"lessons can take place, and the lessons each class group needs per week "
+                           f"from this input: {user_input}. "
+                           f"Return the response in the structure of the SchoolFacts model."
             }
         ]
     })
+    return response["structured_response"]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule one or many classroom groups.")
+    parser.add_argument("--input", help="text file describing teachers and classroom needs")
+    parser.add_argument("--facts", help="SchoolFacts JSON file (skips the model entirely)")
+    parser.add_argument("--workers", type=int, help="processes for independent groups (default: CPU count)")
+    return parser.parse_args(argv)
+
+
+def main(input_path: Optional[str] = None, facts_path: Optional[str] = None, workers: Optional[int] = None):
+    init_db()
+
+    if facts_path:
+        facts = SchoolFacts.model_validate_json(Path(facts_path).read_text(encoding="utf-8"))
+    else:
+        user_input = Path(input_path).read_text(encoding="utf-8") if input_path else USER_INPUT
+        facts = extract_facts(user_input)
 
-    structured: Classroom = response["structured_response"].classroom
+    # Lessons other classrooms already have stay put; their teachers are busy then
+    booked = other_bookings(get_store(), (r.classroom for r in facts.requirements))
+    if os.environ.get("SCHEDULE_ENGINE") == "llm":
+        classrooms = llm_schedule(facts, booked=booked)
+    else:
+        # All classrooms are scheduled together, so shared teachers are never double-booked
+        classrooms = solve_batch(facts, max_workers=workers, booked=booked)
 
-    persist_classroom(structured)
+    persist_classrooms(classrooms)
 
-    print("Structured schedule saved successfully into school.db")
-    print("Result:")
-    print(structured)
+    print(f"Structured schedule for {len(classrooms)} classrooms saved successfully into {get_store().path}")
+    if len(classrooms) <= 5:
+        print("Result:")
+        for structured in classrooms:
+            print(structured)
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(input_path=args.input, facts_path=args.facts, workers=args.workers)
@@ -0,0 +1,48 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+# =======================
+#   Pydantic Models
+# =======================
+
+class Professor(BaseModel):
+    name: str = Field(description="Full name of the teacher")
+    available_days: List[str] = Field(description="Available days: mon, tue, wed, thu, fri")
+    available_hours: List[int] = Field(description="Available hours represented as integers")
+    subjects: List[str] = Field(description="List of subjects taught by the teacher")
+
+
+class Subject(BaseModel):
+    name: str = Field(description="Name of the subject")
+
+
+class Slot(BaseModel):
+    day: str = Field(description="Day of the week: mon, tue, wed, thu, fri")
+    hour: int = Field(description="Class hour as an integer")
+    subject: str = Field(description="Name of the subject")
+    teacher: str = Field(description="Name of the teacher")
+    classroom: str = Field(description="Class group name")
+
+
+class Classroom(BaseModel):
+    name: str = Field(description="Identifier name for the classroom group")
+    subjects: List[Subject] = Field(description="List of subjects assigned to the class")
+    slots: List[Slot] = Field(description="List of scheduled class slots")
+
+
+class ScheduleResponse(BaseModel):
+    classroom: Classroom = Field(description="Final structured schedule result")
+
+
+class Requirement(BaseModel):
+    classroom: str = Field(description="Class group name")
+    subject: str = Field(description="Name of the subject")
+    lessons: int = Field(description="Number of lessons per week")
+    teacher: Optional[str] = Field(default=None, description="Teacher, if the input names one for this class")
+
+
+class SchoolFacts(BaseModel):
+    days: List[str] = Field(description="Days lessons can be scheduled on: mon, tue, wed, thu, fri")
+    hours: List[int] = Field(description="Hours lessons can start at, as integers")
+    professors: List[Professor] = Field(description="Teachers with their availability and subjects")
+    requirements: List[Requirement] = Field(description="Weekly lessons each class group needs")
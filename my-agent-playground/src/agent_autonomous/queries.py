@@ -0,0 +1,86 @@
+from typing import Dict, Iterable, List, Optional
+
+from .models import Slot
+from .storage import SchoolStore
+
+SLOT_COLUMNS = "day, hour, subject, teacher, classroom"
+
+
+def _slots(rows) -> List[Slot]:
+    return [
+        Slot(day=day, hour=hour, subject=subject, teacher=teacher, classroom=classroom)
+        for day, hour, subject, teacher, classroom in rows
+    ]
+
+
+def teacher_schedule(store: SchoolStore, teacher: str, day: Optional[str] = None) -> List[Slot]:
+    """Slots taught by `teacher` (optionally on one day), served by slot_teacher_time."""
+    if day is None:
+        rows = store.fetchall(
+            f"SELECT {SLOT_COLUMNS} FROM slot WHERE teacher = ? ORDER BY day, hour", (teacher,)
+        )
+    else:
+        rows = store.fetchall(
+            f"SELECT {SLOT_COLUMNS} FROM slot WHERE teacher = ? AND day = ? ORDER BY hour", (teacher, day)
+        )
+    return _slots(rows)
+
+
+def classroom_schedule(store: SchoolStore, classroom: str, day: Optional[str] = None) -> List[Slot]:
+    """Slots of `classroom` (optionally on one day), served by slot_classroom_time."""
+    if day is None:
+        rows = store.fetchall(
+            f"SELECT {SLOT_COLUMNS} FROM slot WHERE classroom = ? ORDER BY day, hour", (classroom,)
+        )
+    else:
+        rows = store.fetchall(
+            f"SELECT {SLOT_COLUMNS} FROM slot WHERE classroom = ? AND day = ? ORDER BY hour", (classroom, day)
+        )
+    return _slots(rows)
+
+
+def is_teacher_free(store: SchoolStore, teacher: str, day: str, hour: int) -> bool:
+    row = store.fetchall("SELECT 1 FROM slot WHERE teacher = ? AND day = ? AND hour = ?", (teacher, day, hour))
+    return not row
+
+
+def find_clashes(store: SchoolStore, slots: Iterable[Slot]) -> List[Slot]:
+    """
+    Stored slots that `slots` would collide with (same teacher or same
+    classroom at the same time). Slots of the same classroom are ignored,
+    since persisting a classroom replaces its own schedule.
+    """
+    clashes: List[Slot] = []
+    for slot in slots:
+        rows = store.fetchall(
+            f"SELECT {SLOT_COLUMNS} FROM slot WHERE teacher = ? AND day = ? AND hour = ? AND classroom != ?",
+            (slot.teacher, slot.day, slot.hour, slot.classroom),
+        )
+        clashes.extend(_slots(rows))
+    return clashes
+
+
+def other_bookings(store: SchoolStore, classrooms: Iterable[str]) -> List[Slot]:
+    """
+    Stored slots of every classroom not in `classrooms`: the lessons a
+    rerun for `classrooms` must work around, since persisting them only
+    replaces their own slots.
+    """
+    names = list(dict.fromkeys(classrooms))
+    placeholders = ", ".join("?" * len(names))
+    return _slots(store.fetchall(
+        f"SELECT {SLOT_COLUMNS} FROM slot WHERE classroom NOT IN ({placeholders}) ORDER BY teacher, day, hour",
+        names,
+    ))
+
+
+def teacher_load(store: SchoolStore) -> Dict[str, int]:
+    """Number of lessons per teacher."""
+    return dict(store.fetchall("SELECT teacher, COUNT(*) FROM slot GROUP BY teacher"))
+
+
+def subject_hours(store: SchoolStore, classroom: str) -> Dict[str, int]:
+    """Weekly lessons per subject for one classroom."""
+    return dict(store.fetchall(
+        "SELECT subject, COUNT(*) FROM slot WHERE classroom = ? GROUP BY subject", (classroom,)
+    ))
@@ -0,0 +1,85 @@
+"""
+Timetable query latency before and after the indexed schema migration.
+
+Run with:
+
+    python -m src.agent_autonomous.query_benchmark
+
+A database in the original (unindexed) schema is filled with generated,
+conflict-free classrooms; the query module is timed against it, the file
+is migrated in place with SchoolStore, and the same queries are timed
+again.
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from . import queries
+from .storage import MIGRATIONS, SchoolStore, schema_version
+from .storage_benchmark import make_classrooms
+
+SIZES = [100_000, 1_000_000]
+REPEATS = 50
+
+
+def write_legacy_db(path: str, classrooms):
+    conn = sqlite3.connect(path)
+    conn.executescript(MIGRATIONS[0])
+    conn.execute("PRAGMA user_version = 1")
+    conn.executemany("INSERT INTO classroom (name) VALUES (?)", ((c.name,) for c in classrooms))
+    conn.executemany(
+        "INSERT INTO slot (day, hour, subject, teacher, classroom) VALUES (?, ?, ?, ?, ?)",
+        ((s.day, s.hour, s.subject, s.teacher, c.name) for c in classrooms for s in c.slots),
+    )
+    conn.commit()
+    conn.close()
+
+
+def time_queries(store: SchoolStore, classrooms):
+    rng = random.Random(0)
+    samples = [rng.choice(classrooms) for _ in range(REPEATS)]
+    cases = {
+        "teacher on monday": lambda c: queries.teacher_schedule(store, c.slots[0].teacher, "mon"),
+        "classroom week": lambda c: queries.classroom_schedule(store, c.name),
+        "teacher free?": lambda c: queries.is_teacher_free(store, c.slots[0].teacher, "tue", 9),
+        "clash check (40)": lambda c: queries.find_clashes(store, c.slots),
+    }
+    results = {}
+    for label, query in cases.items():
+        start = time.perf_counter()
+        for classroom in samples:
+            query(classroom)
+        results[label] = (time.perf_counter() - start) / REPEATS
+    return results
+
+
+def main():
+    for size in SIZES:
+        classrooms = make_classrooms(size)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "school.db")
+            write_legacy_db(path, classrooms)
+
+            with SchoolStore(path, upgrade=False) as legacy:
+                before = time_queries(legacy, classrooms)
+
+            start = time.perf_counter()
+            store = SchoolStore(path)
+            migrated_in = time.perf_counter() - start
+            after = time_queries(store, classrooms)
+            version = schema_version(store.conn)
+            store.close()
+
+        print(f"{size:,} slots (migrated to v{version} in {migrated_in:.2f} s)")
+        for label in before:
+            print(
+                f"  {label:<18} {before[label] * 1e3:9.3f} ms -> {after[label] * 1e3:7.3f} ms "
+                f"({before[label] / after[label]:,.0f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
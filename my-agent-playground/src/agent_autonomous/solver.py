@@ -0,0 +1,407 @@
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..agent_examples.processes import worker_context
+
+from .models import Classroom, Requirement, SchoolFacts, Slot, Subject
+
+
+class UnsatisfiableError(ValueError):
+    """No timetable satisfies the requirements (or none was found within budget)."""
+
+
+def normalize_day(day: str) -> str:
+    """'Monday', 'MON' and 'mon' all become 'mon'."""
+    return day.strip().lower()[:3]
+
+
+def normalize_days(days: Sequence[str]) -> Tuple[str, ...]:
+    """Normalized days in their first-seen order, without duplicates."""
+    return tuple(dict.fromkeys(normalize_day(day) for day in days))
+
+
+@dataclass(frozen=True)
+class TimeGrid:
+    """
+    Day x hour grid; time t = day_index * len(hours) + hour_index is bit t
+    of an int, so availability and bookings are plain integer bitsets.
+    """
+    days: Tuple[str, ...]
+    hours: Tuple[int, ...]
+
+    @property
+    def size(self) -> int:
+        return len(self.days) * len(self.hours)
+
+    @property
+    def full(self) -> int:
+        return (1 << self.size) - 1
+
+    @cached_property
+    def _bits(self) -> Dict[Tuple[str, int], int]:
+        return {
+            (day, hour): 1 << (d * len(self.hours) + h)
+            for d, day in enumerate(self.days)
+            for h, hour in enumerate(self.hours)
+        }
+
+    def bit(self, day: str, hour: int) -> int:
+        """Bit of (day, hour), or 0 when it is outside the grid."""
+        return self._bits.get((day, hour), 0)
+
+    def mask(self, days: Sequence[str], hours: Sequence[int]) -> int:
+        """Bitset of every (day, hour) in the grid with day in `days` and hour in `hours`."""
+        wanted_days, wanted_hours = set(days), set(hours)
+        mask = 0
+        for d, day in enumerate(self.days):
+            if day not in wanted_days:
+                continue
+            for h, hour in enumerate(self.hours):
+                if hour in wanted_hours:
+                    mask |= 1 << (d * len(self.hours) + h)
+        return mask
+
+    def day_index(self, bit: int) -> int:
+        return (bit.bit_length() - 1) // len(self.hours)
+
+    def time_of(self, bit: int) -> Tuple[str, int]:
+        t = bit.bit_length() - 1
+        return self.days[t // len(self.hours)], self.hours[t % len(self.hours)]
+
+
+@dataclass
+class _Unit:
+    """All weekly lessons of one subject for one classroom, taught by one teacher."""
+    classroom: int
+    subject: str
+    teacher: int
+    lessons: int
+
+
+def assign_teachers(
+    facts: SchoolFacts, availability: List[int], classrooms: Dict[str, int]
+) -> List[_Unit]:
+    """
+    Pick one teacher per requirement, keeping named teachers and otherwise
+    giving the work to the qualified teacher with the most free capacity.
+    Requirements with the fewest qualified teachers choose first.
+    """
+    index = {p.name: i for i, p in enumerate(facts.professors)}
+    qualified: Dict[str, List[int]] = {}
+    for i, professor in enumerate(facts.professors):
+        for subject in professor.subjects:
+            qualified.setdefault(subject, []).append(i)
+
+    capacity = [a.bit_count() for a in availability]
+    # Per subject, a max-heap of (capacity, teacher); stale entries are skipped
+    free_teachers = {subject: [(-capacity[t], t) for t in ts] for subject, ts in qualified.items()}
+    for entries in free_teachers.values():
+        heapq.heapify(entries)
+    units: List[_Unit] = []
+    order = sorted(
+        facts.requirements,
+        key=lambda r: (r.teacher is None, len(qualified.get(r.subject, ())), r.classroom, r.subject),
+    )
+    for requirement in order:
+        if requirement.lessons <= 0:
+            continue
+        if requirement.teacher is not None:
+            if requirement.teacher not in index:
+                raise UnsatisfiableError(f"Unknown teacher {requirement.teacher!r} for {requirement.subject}")
+            teacher = index[requirement.teacher]
+        else:
+            entries = free_teachers.get(requirement.subject)
+            if not entries:
+                raise UnsatisfiableError(f"Nobody teaches {requirement.subject!r} ({requirement.classroom})")
+            while -entries[0][0] != capacity[entries[0][1]]:
+                heapq.heappop(entries)
+            teacher = entries[0][1]
+        capacity[teacher] -= requirement.lessons
+        for subject in facts.professors[teacher].subjects:
+            heapq.heappush(free_teachers[subject], (-capacity[teacher], teacher))
+        units.append(_Unit(classrooms[requirement.classroom], requirement.subject, teacher, requirement.lessons))
+    return units
+
+
+def _prepare(
+    facts: SchoolFacts, booked: Sequence[Slot] = ()
+) -> Tuple[TimeGrid, List[int], List[str], List[_Unit]]:
+    # Days are normalized like the validator does, so "Monday" and "mon" agree
+    grid = TimeGrid(normalize_days(facts.days), tuple(facts.hours))
+    availability = [grid.mask(normalize_days(p.available_days), p.available_hours) for p in facts.professors]
+    # Times a teacher already spends in classrooms outside this problem are not free
+    index = {p.name: i for i, p in enumerate(facts.professors)}
+    for slot in booked:
+        if slot.teacher in index:
+            availability[index[slot.teacher]] &= ~grid.bit(normalize_day(slot.day), slot.hour)
+    classroom_names = list(dict.fromkeys(r.classroom for r in facts.requirements))
+    classrooms = {name: i for i, name in enumerate(classroom_names)}
+    return grid, availability, classroom_names, assign_teachers(facts, availability, classrooms)
+
+
+def solve(facts: SchoolFacts, max_nodes: int = 1_000_000, booked: Sequence[Slot] = ()) -> List[Classroom]:
+    """
+    Build a timetable that respects teacher availability and never books a
+    teacher or a classroom twice at the same time.
+
+    Depth-first search that places one lesson at a time, always for the
+    (classroom, subject) unit with the least slack (free times minus lessons
+    left). Forward checking keeps every unit sharing the teacher or the
+    classroom at non-negative slack, and neither may have more lessons left
+    than free times. Times are tried on days the subject does not have yet,
+    then on the classroom's least busy day, so lessons spread across the
+    week. The result is deterministic for a given input.
+
+    `booked` are lessons already stored for other classrooms; their
+    teachers are treated as unavailable at those times.
+
+    Raises UnsatisfiableError when the search space (or `max_nodes`
+    backtracks) is exhausted.
+    """
+    grid, availability, classroom_names, units = _prepare(facts, booked)
+    classrooms = {name: i for i, name in enumerate(classroom_names)}
+
+    by_teacher: List[List[int]] = [[] for _ in facts.professors]
+    by_class: List[List[int]] = [[] for _ in classroom_names]
+    for u, unit in enumerate(units):
+        by_teacher[unit.teacher].append(u)
+        by_class[unit.classroom].append(u)
+    neighbours = [sorted(set(by_teacher[unit.teacher] + by_class[unit.classroom])) for unit in units]
+
+    remaining = [unit.lessons for unit in units]
+    teacher_left = [sum(remaining[u] for u in us) for us in by_teacher]
+    class_left = [sum(remaining[u] for u in us) for us in by_class]
+    for t, left in enumerate(teacher_left):
+        if left > availability[t].bit_count():
+            name = facts.professors[t].name
+            raise UnsatisfiableError(f"{name} has {left} lessons but only {availability[t].bit_count()} free hours")
+    for c, left in enumerate(class_left):
+        if left > grid.size:
+            raise UnsatisfiableError(f"{classroom_names[c]} needs {left} lessons but the week has {grid.size}")
+
+    teacher_busy = [0] * len(facts.professors)
+    class_busy = [0] * len(classroom_names)
+    # Times a unit may not use in the current subtree: its lessons are
+    # interchangeable, so a time that failed for one fails for all of them
+    forbidden = [0] * len(units)
+    placed = [0] * len(units)
+    unit_days = [[0] * len(grid.days) for _ in units]
+    class_days = [[0] * len(grid.days) for _ in classroom_names]
+
+    def domain(u: int) -> int:
+        unit = units[u]
+        return availability[unit.teacher] & ~teacher_busy[unit.teacher] & ~class_busy[unit.classroom] & ~forbidden[u]
+
+    # Most constrained unit first, through a heap with lazily invalidated entries
+    slack = [domain(u).bit_count() - remaining[u] for u in range(len(units))]
+    version = [0] * len(units)
+    heap = [(slack[u], u, 0) for u in range(len(units))]
+    heapq.heapify(heap)
+
+    def touch(u: int, force: bool = False):
+        value = domain(u).bit_count() - remaining[u]
+        if value == slack[u] and not force:
+            return
+        slack[u] = value
+        version[u] += 1
+        if remaining[u]:
+            heapq.heappush(heap, (slack[u], u, version[u]))
+
+    def next_unit() -> Optional[int]:
+        while heap:
+            _, u, v = heap[0]
+            if v == version[u] and remaining[u]:
+                return u
+            heapq.heappop(heap)
+        return None
+
+    day_masks = [grid.mask([day], grid.hours) for day in grid.days]
+
+    def candidates(u: int) -> Iterator[int]:
+        """Free times for `u`, on days the unit and then the classroom use least."""
+        c = units[u].classroom
+        free = domain(u)
+        for d in sorted(range(len(grid.days)), key=lambda d: (unit_days[u][d] > 0, class_days[c][d], d)):
+            times = free & day_masks[d]
+            while times:
+                bit = times & -times
+                times ^= bit
+                yield bit
+
+    def place(u: int, bit: int, sign: int):
+        unit = units[u]
+        day = grid.day_index(bit)
+        teacher_busy[unit.teacher] ^= bit
+        class_busy[unit.classroom] ^= bit
+        placed[u] ^= bit
+        remaining[u] -= sign
+        teacher_left[unit.teacher] -= sign
+        class_left[unit.classroom] -= sign
+        unit_days[u][day] += sign
+        class_days[unit.classroom][day] += sign
+        for v in neighbours[u]:
+            touch(v, force=v == u)
+
+    def consistent(u: int) -> bool:
+        t, c = units[u].teacher, units[u].classroom
+        if teacher_left[t] > (availability[t] & ~teacher_busy[t]).bit_count():
+            return False
+        if class_left[c] > (grid.full & ~class_busy[c]).bit_count():
+            return False
+        return all(not remaining[v] or slack[v] >= 0 for v in neighbours[u])
+
+    # Each frame: [unit, candidate times, chosen time, times forbidden here]
+    stack: List[list] = []
+    backtracks = 0
+    u = next_unit()
+    if u is not None:
+        stack.append([u, candidates(u), 0, 0])
+    while stack:
+        frame = stack[-1]
+        u = frame[0]
+        if frame[2]:
+            # Back from a failed subtree: this time is out for the whole unit
+            place(u, frame[2], -1)
+            forbidden[u] |= frame[2]
+            frame[3] |= frame[2]
+            frame[2] = 0
+            touch(u)
+
+        for bit in frame[1]:
+            if bit & forbidden[u]:
+                continue
+            place(u, bit, 1)
+            if consistent(u):
+                frame[2] = bit
+                break
+            place(u, bit, -1)
+            forbidden[u] |= bit
+            frame[3] |= bit
+            touch(u)
+
+        if frame[2]:
+            v = next_unit()
+            if v is None:
+                break
+            stack.append([v, candidates(v), 0, 0])
+        else:
+            forbidden[u] &= ~frame[3]
+            touch(u)
+            stack.pop()
+            backtracks += 1
+            if backtracks > max_nodes:
+                raise UnsatisfiableError(f"No timetable found within {max_nodes} backtracks")
+
+    if any(remaining):
+        raise UnsatisfiableError("Requirements cannot be satisfied with the given availability")
+
+    slots: List[List[Tuple[int, Slot]]] = [[] for _ in classroom_names]
+    for u, unit in enumerate(units):
+        times = placed[u]
+        while times:
+            bit = times & -times
+            times ^= bit
+            day, hour = grid.time_of(bit)
+            slots[unit.classroom].append((bit, Slot(
+                day=day,
+                hour=hour,
+                subject=unit.subject,
+                teacher=facts.professors[unit.teacher].name,
+                classroom=classroom_names[unit.classroom],
+            )))
+
+    subjects: List[Dict[str, None]] = [{} for _ in classroom_names]
+    for requirement in facts.requirements:
+        subjects[classrooms[requirement.classroom]][requirement.subject] = None
+
+    return [
+        Classroom(
+            name=name,
+            subjects=[Subject(name=subject) for subject in subjects[c]],
+            slots=[slot for _, slot in sorted(slots[c], key=lambda entry: entry[0])],
+        )
+        for c, name in enumerate(classroom_names)
+    ]
+
+
+def partition(facts: SchoolFacts, booked: Sequence[Slot] = ()) -> List[SchoolFacts]:
+    """
+    Split a school into sub-problems that share no teacher.
+
+    Teachers are assigned once for the whole school, so capacity is shared
+    fairly; classrooms are then grouped by the teachers they have in common
+    and each group gets its requirements with the teacher pinned.
+    """
+    _, _, classroom_names, units = _prepare(facts, booked)
+
+    parent = list(range(len(classroom_names)))
+
+    def find(c: int) -> int:
+        while parent[c] != c:
+            parent[c] = parent[parent[c]]
+            c = parent[c]
+        return c
+
+    first_classroom: Dict[int, int] = {}
+    for unit in units:
+        other = first_classroom.setdefault(unit.teacher, unit.classroom)
+        parent[find(unit.classroom)] = find(other)
+
+    groups: Dict[int, List[_Unit]] = {}
+    for unit in sorted(units, key=lambda u: u.classroom):
+        groups.setdefault(find(unit.classroom), []).append(unit)
+
+    parts = []
+    for group in groups.values():
+        teachers = sorted({unit.teacher for unit in group})
+        parts.append(SchoolFacts(
+            days=facts.days,
+            hours=facts.hours,
+            professors=[facts.professors[t] for t in teachers],
+            requirements=[
+                Requirement(
+                    classroom=classroom_names[unit.classroom],
+                    subject=unit.subject,
+                    lessons=unit.lessons,
+                    teacher=facts.professors[unit.teacher].name,
+                )
+                for unit in group
+            ],
+        ))
+    return parts
+
+
+def solve_batch(
+    facts: SchoolFacts,
+    max_workers: Optional[int] = None,
+    max_nodes: int = 1_000_000,
+    booked: Sequence[Slot] = (),
+) -> List[Classroom]:
+    """
+    Schedule many classrooms jointly, solving independent groups in parallel.
+
+    Groups come from `partition`, so no teacher is shared between processes
+    and the merged timetable needs no reconciliation. A school whose
+    teachers connect every classroom is a single group and is solved in
+    this process. `booked` is passed on to `solve`, each group getting only
+    the bookings of its own teachers.
+    """
+    parts = partition(facts, booked)
+    part_booked = []
+    for part in parts:
+        teachers = {p.name for p in part.professors}
+        part_booked.append([slot for slot in booked if slot.teacher in teachers])
+    workers = min(max_workers or os.cpu_count() or 1, len(parts))
+    if workers <= 1:
+        results = [solve(part, max_nodes, slots) for part, slots in zip(parts, part_booked)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=worker_context()) as executor:
+            results = list(executor.map(solve, parts, [max_nodes] * len(parts), part_booked))
+
+    by_name = {classroom.name: classroom for result in results for classroom in result}
+    order = dict.fromkeys(r.classroom for r in facts.requirements)
+    return [by_name[name] for name in order if name in by_name]
@@ -0,0 +1,198 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    from .models import Classroom
+
+DEFAULT_DB_PATH = "school.db"
+
+# Applied in order; PRAGMA user_version records how many have run.
+MIGRATIONS = [
+    # 1: the original schema (also what existing school.db files already have)
+    """
+    CREATE TABLE IF NOT EXISTS professor (
+        name TEXT PRIMARY KEY
+    );
+    CREATE TABLE IF NOT EXISTS subject (
+        name TEXT PRIMARY KEY
+    );
+    CREATE TABLE IF NOT EXISTS classroom (
+        name TEXT PRIMARY KEY
+    );
+    CREATE TABLE IF NOT EXISTS slot (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        day TEXT,
+        hour INTEGER,
+        subject TEXT,
+        teacher TEXT,
+        classroom TEXT
+    );
+    """,
+    # 2: foreign keys, no double-booking, indexes for per-teacher/per-classroom lookups.
+    # Rows that would break the new constraints are moved to slot_conflict.
+    """
+    INSERT OR IGNORE INTO professor (name) SELECT DISTINCT teacher FROM slot WHERE teacher IS NOT NULL;
+    INSERT OR IGNORE INTO subject (name) SELECT DISTINCT subject FROM slot WHERE subject IS NOT NULL;
+    INSERT OR IGNORE INTO classroom (name) SELECT DISTINCT classroom FROM slot WHERE classroom IS NOT NULL;
+
+    CREATE TABLE slot_v2 (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        day TEXT NOT NULL,
+        hour INTEGER NOT NULL,
+        subject TEXT NOT NULL REFERENCES subject (name),
+        teacher TEXT NOT NULL REFERENCES professor (name),
+        classroom TEXT NOT NULL REFERENCES classroom (name) ON DELETE CASCADE
+    );
+    CREATE UNIQUE INDEX slot_teacher_time ON slot_v2 (teacher, day, hour);
+    CREATE UNIQUE INDEX slot_classroom_time ON slot_v2 (classroom, day, hour);
+    CREATE INDEX slot_subject ON slot_v2 (subject);
+
+    INSERT OR IGNORE INTO slot_v2 (id, day, hour, subject, teacher, classroom)
+        SELECT id, day, hour, subject, teacher, classroom FROM slot ORDER BY id;
+    CREATE TABLE slot_conflict AS
+        SELECT * FROM slot WHERE id NOT IN (SELECT id FROM slot_v2);
+
+    DROP TABLE slot;
+    ALTER TABLE slot_v2 RENAME TO slot;
+    """,
+]
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # readers don't block the writer; one fsync per checkpoint
+    "PRAGMA synchronous=NORMAL",  # durable at checkpoints, safe against corruption in WAL mode
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MiB page cache
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON",
+)
+
+INSERT_SLOT = "INSERT INTO slot (day, hour, subject, teacher, classroom) VALUES (?, ?, ?, ?, ?)"
+
+
+class ScheduleConflictError(ValueError):
+    """A slot would double-book a teacher or a classroom."""
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Bring `conn` up to the latest schema; returns the number of migrations applied."""
+    version = schema_version(conn)
+    for number, script in enumerate(MIGRATIONS[version:], start=version + 1):
+        try:
+            conn.executescript(f"BEGIN;\n{script}\nPRAGMA user_version = {number};\nCOMMIT;")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+    return len(MIGRATIONS) - version
+
+
+class SchoolStore:
+    """
+    SQLite persistence for generated schedules over one long-lived connection.
+
+    The connection is opened once in WAL mode with relaxed fsyncs and reused
+    by every call (guarded by a lock, so threads can share a store). Each
+    classroom batch is written in a single transaction with `executemany`,
+    and professors/subjects are de-duplicated before they reach SQLite.
+
+    Persisting a classroom replaces its previous slots. A slot that clashes
+    with another classroom's teacher booking raises ScheduleConflictError
+    and nothing from the batch is written.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, upgrade: bool = True):
+        self.path = path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if upgrade:
+            migrate(self.conn)
+        for pragma in PRAGMAS:
+            self.conn.execute(pragma)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """One BEGIN IMMEDIATE ... COMMIT, rolled back on error."""
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+
+    def persist_classroom(self, classroom: "Classroom") -> int:
+        return self.persist_classrooms([classroom])
+
+    def persist_classrooms(self, classrooms: Iterable["Classroom"]) -> int:
+        """Persist many classrooms in one transaction; returns the number of slots written."""
+        classrooms = list(classrooms)
+        subjects = {s.name for classroom in classrooms for s in classroom.subjects}
+        teachers = {slot.teacher for classroom in classrooms for slot in classroom.slots}
+        slots = [
+            (slot.day, slot.hour, slot.subject, slot.teacher, classroom.name)
+            for classroom in classrooms
+            for slot in classroom.slots
+        ]
+
+        subjects |= {slot.subject for classroom in classrooms for slot in classroom.slots}
+
+        with self.transaction() as c:
+            c.executemany("INSERT OR IGNORE INTO classroom (name) VALUES (?)", ((cl.name,) for cl in classrooms))
+            c.executemany("INSERT OR IGNORE INTO subject (name) VALUES (?)", ((name,) for name in subjects))
+            c.executemany("INSERT OR IGNORE INTO professor (name) VALUES (?)", ((name,) for name in teachers))
+            c.executemany("DELETE FROM slot WHERE classroom = ?", ((cl.name,) for cl in classrooms))
+            try:
+                c.executemany(INSERT_SLOT, slots)
+            except sqlite3.IntegrityError as e:
+                raise ScheduleConflictError(f"Schedule rejected: {e}") from e
+        return len(slots)
+
+    def fetchall(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def checkpoint(self):
+        """Fold the WAL back into the main database file."""
+        with self._lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self) -> "SchoolStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_stores: Dict[str, SchoolStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path: Optional[str] = None) -> SchoolStore:
+    """Shared SchoolStore per database path (SCHOOL_DB, default school.db)."""
+    path = path or os.environ.get("SCHOOL_DB", DEFAULT_DB_PATH)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = SchoolStore(path)
+        return store
+
+
+def close_stores():
+    with _stores_lock:
+        for store in _stores.values():
+            store.close()
+        _stores.clear()
@@ -0,0 +1,110 @@
+"""
+Rows/s of schedule persistence: per-call connections vs SchoolStore.
+
+Run with:
+
+    python -m src.agent_autonomous.storage_benchmark
+
+Synthetic classrooms (40 slots each) are written to a temporary database.
+"legacy" is the original persist_classroom: a new connection, one execute
+per row and a default-journal commit for every classroom. It is only run
+at 10k slots; at 1M it would take minutes.
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from typing import List
+
+from .models import Classroom, Slot, Subject
+from .storage import MIGRATIONS, SchoolStore
+
+DAYS = ["mon", "tue", "wed", "thu", "fri"]
+HOURS = [7, 8, 9, 10, 11, 13, 14, 15]
+SUBJECTS = ["Mathematics", "Chemistry", "Geography", "History", "Physics", "Biology", "English", "Art"]
+SIZES = [10_000, 1_000_000]
+LEGACY_MAX_SLOTS = 10_000
+
+
+def make_classrooms(total_slots: int) -> List[Classroom]:
+    """
+    Full-week classrooms with no double-booking.
+
+    Classroom n is taught by teacher (n + t) mod N in time slot t, so every
+    teacher is busy all week but never in two rooms at once.
+    """
+    times = [(d, h) for d in DAYS for h in HOURS]
+    count = total_slots // len(times)
+    classrooms = []
+    for n in range(count):
+        slots = [
+            Slot(
+                day=day,
+                hour=hour,
+                subject=SUBJECTS[(t + n) % len(SUBJECTS)],
+                teacher=f"Teacher {(n + t) % count}",
+                classroom=f"C{n}",
+            )
+            for t, (day, hour) in enumerate(times)
+        ]
+        classrooms.append(Classroom(name=f"C{n}", subjects=[Subject(name=s) for s in SUBJECTS], slots=slots))
+    return classrooms
+
+
+def legacy_persist_classroom(path: str, classroom: Classroom):
+    conn = sqlite3.connect(path)
+    c = conn.cursor()
+    c.execute("INSERT OR IGNORE INTO classroom (name) VALUES (?)", (classroom.name,))
+    for s in classroom.subjects:
+        c.execute("INSERT OR IGNORE INTO subject (name) VALUES (?)", (s.name,))
+    for slot in classroom.slots:
+        c.execute("INSERT OR IGNORE INTO professor (name) VALUES (?)", (slot.teacher,))
+        c.execute(
+            "INSERT INTO slot (day, hour, subject, teacher, classroom) VALUES (?, ?, ?, ?, ?)",
+            (slot.day, slot.hour, slot.subject, slot.teacher, classroom.name),
+        )
+    conn.commit()
+    conn.close()
+
+
+def run_legacy(directory: str, classrooms: List[Classroom]) -> float:
+    path = os.path.join(directory, "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(MIGRATIONS[0])
+    conn.close()
+    start = time.perf_counter()
+    for classroom in classrooms:
+        legacy_persist_classroom(path, classroom)
+    return time.perf_counter() - start
+
+
+def run_store(directory: str, name: str, classrooms: List[Classroom], bulk: bool) -> float:
+    with SchoolStore(os.path.join(directory, f"{name}.db")) as store:
+        start = time.perf_counter()
+        if bulk:
+            store.persist_classrooms(classrooms)
+        else:
+            for classroom in classrooms:
+                store.persist_classroom(classroom)
+        return time.perf_counter() - start
+
+
+def report(label: str, slots: int, seconds: float):
+    print(f"  {label:<22} {seconds:8.2f} s  {slots / seconds:>12,.0f} rows/s")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SIZES:
+            classrooms = make_classrooms(size)
+            slots = sum(len(c.slots) for c in classrooms)
+            print(f"{slots:,} slots in {len(classrooms):,} classrooms")
+            if slots <= LEGACY_MAX_SLOTS:
+                report("legacy", slots, run_legacy(directory, classrooms))
+            report("store, per classroom", slots, run_store(directory, f"each{size}", classrooms, bulk=False))
+            report("store, bulk", slots, run_store(directory, f"bulk{size}", classrooms, bulk=True))
+
+
+if __name__ == "__main__":
+    main()
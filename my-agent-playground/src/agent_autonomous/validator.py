@@ -0,0 +1,172 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, Field
+
+from .models import Classroom, Professor, Requirement, Slot
+from .solver import TimeGrid, normalize_day, normalize_days
+
+WEEK = TimeGrid(("mon", "tue", "wed", "thu", "fri", "sat", "sun"), tuple(range(24)))
+
+
+class Violation(BaseModel):
+    kind: str = Field(description=(
+        "unknown_teacher, unqualified_teacher, teacher_unavailable, invalid_time, "
+        "teacher_double_booked, classroom_double_booked or lesson_count"
+    ))
+    message: str = Field(description="Human readable explanation")
+    classroom: Optional[str] = None
+    subject: Optional[str] = None
+    teacher: Optional[str] = None
+    day: Optional[str] = None
+    hour: Optional[int] = None
+
+
+class ScheduleValidator:
+    """
+    Check generated timetables against teacher availability, qualifications,
+    double-booking and weekly lesson counts.
+
+    Teacher availability is precomputed as one day x hour bitmap per
+    teacher; while validating, every teacher and classroom gets a bitmap of
+    booked times, so each slot costs a handful of integer operations and a
+    whole schedule is checked in O(slots).
+    """
+
+    def __init__(
+        self,
+        professors: Sequence[Professor],
+        requirements: Optional[Sequence[Requirement]] = None,
+        days: Optional[Sequence[str]] = None,
+        hours: Optional[Sequence[int]] = None,
+    ):
+        self.grid = TimeGrid(
+            normalize_days(days) if days else WEEK.days,
+            tuple(hours) if hours else WEEK.hours,
+        )
+        self.availability: Dict[str, int] = {
+            p.name: self.grid.mask(normalize_days(p.available_days), p.available_hours)
+            for p in professors
+        }
+        self.subjects = {p.name: set(p.subjects) for p in professors}
+        self.requirements: Dict[Tuple[str, str], int] = Counter()
+        for r in requirements or ():
+            self.requirements[(r.classroom, r.subject)] += r.lessons
+
+    def validate(self, classrooms: Iterable[Classroom], booked: Sequence[Slot] = ()) -> List[Violation]:
+        """
+        All violations in `classrooms`; teachers are shared across them and
+        with `booked`, the lessons already stored for other classrooms.
+        """
+        classrooms = list(classrooms)
+        violations: List[Violation] = []
+        teacher_busy: Dict[str, int] = {}
+        counts: Dict[Tuple[str, str], int] = {}
+        clashes: List[Tuple[str, str, int, str, str]] = []
+        days: Dict[str, str] = {}
+        bit_of = self.grid.bit
+        availability = self.availability
+
+        for slot in booked:
+            teacher_busy[slot.teacher] = teacher_busy.get(slot.teacher, 0) | bit_of(normalize_day(slot.day), slot.hour)
+
+        for classroom in classrooms:
+            classroom_busy = 0
+            for slot in classroom.slots:
+                day = days.get(slot.day)
+                if day is None:
+                    day = days[slot.day] = normalize_day(slot.day)
+                key = (classroom.name, slot.subject)
+                counts[key] = counts.get(key, 0) + 1
+                bit = bit_of(day, slot.hour)
+                if not bit:
+                    violations.append(Violation(
+                        kind="invalid_time",
+                        message=f"{day} {slot.hour}h is outside the school week",
+                        classroom=classroom.name, subject=slot.subject, teacher=slot.teacher,
+                        day=day, hour=slot.hour,
+                    ))
+                    continue
+
+                if classroom_busy & bit:
+                    violations.append(Violation(
+                        kind="classroom_double_booked",
+                        message=f"{classroom.name} has two lessons on {day} at {slot.hour}h",
+                        classroom=classroom.name, subject=slot.subject, teacher=slot.teacher,
+                        day=day, hour=slot.hour,
+                    ))
+                classroom_busy |= bit
+
+                available = availability.get(slot.teacher)
+                if available is None:
+                    violations.append(Violation(
+                        kind="unknown_teacher",
+                        message=f"{slot.teacher} is not one of the teachers",
+                        classroom=classroom.name, subject=slot.subject, teacher=slot.teacher,
+                        day=day, hour=slot.hour,
+                    ))
+                    continue
+                if slot.subject not in self.subjects[slot.teacher]:
+                    violations.append(Violation(
+                        kind="unqualified_teacher",
+                        message=f"{slot.teacher} does not teach {slot.subject}",
+                        classroom=classroom.name, subject=slot.subject, teacher=slot.teacher,
+                        day=day, hour=slot.hour,
+                    ))
+                if not available & bit:
+                    violations.append(Violation(
+                        kind="teacher_unavailable",
+                        message=f"{slot.teacher} is not available on {day} at {slot.hour}h",
+                        classroom=classroom.name, subject=slot.subject, teacher=slot.teacher,
+                        day=day, hour=slot.hour,
+                    ))
+
+                busy = teacher_busy.get(slot.teacher, 0)
+                if busy & bit:
+                    clashes.append((slot.teacher, day, slot.hour, classroom.name, slot.subject))
+                teacher_busy[slot.teacher] = busy | bit
+
+        if clashes:
+            violations.extend(self._describe_clashes(classrooms, booked, clashes))
+
+        names = {classroom.name for classroom in classrooms}
+        for (classroom, subject), expected in self.requirements.items():
+            if classroom in names and counts.get((classroom, subject), 0) != expected:
+                violations.append(Violation(
+                    kind="lesson_count",
+                    message=f"{classroom} needs {expected} {subject} lessons, got {counts.get((classroom, subject), 0)}",
+                    classroom=classroom, subject=subject,
+                ))
+        return violations
+
+    def _describe_clashes(
+        self,
+        classrooms: List[Classroom],
+        booked: Sequence[Slot],
+        clashes: List[Tuple[str, str, int, str, str]],
+    ) -> List[Violation]:
+        """Name the classroom each double-booked teacher is already in (one extra pass)."""
+        wanted = {(teacher, day, hour) for teacher, day, hour, _, _ in clashes}
+        first: Dict[Tuple[str, str, int], str] = {}
+        placed = [(slot.classroom, slot) for slot in booked]
+        placed += [(classroom.name, slot) for classroom in classrooms for slot in classroom.slots]
+        for name, slot in placed:
+            key = (slot.teacher, normalize_day(slot.day), slot.hour)
+            if key in wanted and key not in first:
+                first[key] = name
+        return [
+            Violation(
+                kind="teacher_double_booked",
+                message=f"{teacher} already teaches {first[(teacher, day, hour)]} on {day} at {hour}h",
+                classroom=classroom, subject=subject, teacher=teacher, day=day, hour=hour,
+            )
+            for teacher, day, hour, classroom, subject in clashes
+        ]
+
+
+def format_violations(violations: Sequence[Violation], limit: int = 50) -> str:
+    """Bullet list of violations for a repair prompt."""
+    lines = [f"- [{v.kind}] {v.message}" for v in violations[:limit]]
+    if len(violations) > limit:
+        lines.append(f"- ... and {len(violations) - limit} more")
+    return "\n".join(lines)
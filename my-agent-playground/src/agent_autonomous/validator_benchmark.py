@@ -0,0 +1,99 @@
+"""
+Validation speed of ScheduleValidator on very large schedules.
+
+Run with:
+
+    python -m src.agent_autonomous.validator_benchmark
+
+Conflict-free full-week classrooms (see storage_benchmark.make_classrooms)
+get a known number of injected mistakes: a slot's teacher is replaced by
+the teacher another classroom has at the same time, which double-books
+that teacher. Every mistake must be reported (two mistakes can land on the
+same slot, so the count may come out slightly lower).
+For scale, a pairwise check that compares every slot with every other one
+is timed on the smallest schedule.
+"""
+
+import random
+import time
+from itertools import combinations
+
+from .models import Professor, Requirement
+from .storage_benchmark import DAYS, HOURS, SUBJECTS, make_classrooms
+from .validator import ScheduleValidator
+
+SIZES = [10_000, 100_000, 1_000_000]
+MISTAKE_RATE = 0.001
+PAIRWISE_MAX_SLOTS = 10_000
+
+
+def make_validator(classrooms) -> ScheduleValidator:
+    teachers = sorted({slot.teacher for c in classrooms for slot in c.slots})
+    professors = [
+        Professor(
+            name=name,
+            available_days=DAYS,
+            available_hours=HOURS,
+            subjects=SUBJECTS,
+        )
+        for name in teachers
+    ]
+    requirements = [
+        Requirement(classroom=c.name, subject=subject, lessons=count)
+        for c in classrooms
+        for subject, count in _counts(c).items()
+    ]
+    return ScheduleValidator(professors, requirements, DAYS, HOURS)
+
+
+def _counts(classroom):
+    counts = {}
+    for slot in classroom.slots:
+        counts[slot.subject] = counts.get(slot.subject, 0) + 1
+    return counts
+
+
+def inject_mistakes(classrooms, rate: float, seed: int = 0) -> int:
+    """Swap teachers between classrooms at the same time; returns how many slots now clash."""
+    rng = random.Random(seed)
+    mistakes = max(1, int(sum(len(c.slots) for c in classrooms) * rate))
+    for _ in range(mistakes):
+        a, b = rng.sample(classrooms, 2)
+        t = rng.randrange(len(a.slots))
+        b.slots[t] = b.slots[t].model_copy(update={"teacher": a.slots[t].teacher})
+    return mistakes
+
+
+def pairwise_check(classrooms) -> int:
+    slots = [(c.name, s) for c in classrooms for s in c.slots]
+    clashes = 0
+    for (ca, a), (cb, b) in combinations(slots, 2):
+        if a.day == b.day and a.hour == b.hour and (a.teacher == b.teacher or ca == cb):
+            clashes += 1
+    return clashes
+
+
+def main():
+    for size in SIZES:
+        classrooms = make_classrooms(size)
+        validator = make_validator(classrooms)
+        injected = inject_mistakes(classrooms, MISTAKE_RATE)
+        slots = sum(len(c.slots) for c in classrooms)
+
+        start = time.perf_counter()
+        violations = validator.validate(classrooms)
+        elapsed = time.perf_counter() - start
+        double_booked = sum(v.kind == "teacher_double_booked" for v in violations)
+        print(
+            f"{slots:>9,} slots: {elapsed * 1000:8.1f} ms ({slots / elapsed:,.0f} slots/s), "
+            f"{len(violations)} violations ({double_booked} double bookings, {injected} injected)"
+        )
+
+        if slots <= PAIRWISE_MAX_SLOTS:
+            start = time.perf_counter()
+            pairwise_check(classrooms)
+            print(f"{'':>9}  pairwise check: {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark suite for the playground pipelines, with stored results.
+
+Run with:
+
+    python -m src.agent_examples.benchmark_suite [--latency 0.05] [--fail-on-regression]
+
+Every model and embedding call is faked with the same fixed latency (the
+fake-model profile), so what is measured is each pipeline's own overhead
+and concurrency:
+
+- feedback_csv_throughput: generate_feedback_csv rows/s
+- rag_ingest_throughput: ingest_documents chunks/s
+- rag_query: exact top-k search over 100k stored chunks
+- sqlite_persist_throughput: SchoolStore.persist_classrooms slots/s
+- schedule_solve: solver time for a 100-classroom school
+
+Results are appended to benchmark_results.jsonl (or --results /
+BENCHMARK_RESULTS) with the git commit, and each run is compared with the
+latest run of another commit using the same profile.
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from langchain_core.documents import Document
+
+import benchmark_results
+from benchmark_results import Result, median_ms, time_calls
+
+from ..agent_autonomous.solver import solve
+from ..agent_autonomous.solver_benchmark import make_school
+from ..agent_autonomous.storage import SchoolStore
+from ..agent_autonomous.storage_benchmark import make_classrooms
+from ..agent_rag.benchmark import RandomEmbeddings, fill_numpy_store
+from ..agent_rag.ingestion import ingest_documents
+from ..agent_rag.startup_benchmark import SlowEmbeddings
+from ..agent_rag.vector_store import NumpyVectorStore
+from ..feedback_creator.benchmark import FakeFeedbackAgent, write_roster
+from ..feedback_creator.utils import generate_feedback_csv
+
+SUITE = "playground"
+
+
+def feedback_throughput(latency: float, rows: int = 64, concurrency: int = 8) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        input_csv, output_csv = Path(tmp) / "input.csv", Path(tmp) / "output.csv"
+        write_roster(input_csv, rows)
+        start = time.perf_counter()
+        generate_feedback_csv(
+            input_csv, output_csv, FakeFeedbackAgent(latency), max_concurrency=concurrency, resume=False
+        )
+        return rows / (time.perf_counter() - start)
+
+
+def ingest_throughput(latency: float, chunks: int = 2000, batch: int = 100, concurrency: int = 4) -> float:
+    documents = [Document(page_content=f"Notícia {i} de 2025. " * 40) for i in range(chunks)]
+    store = NumpyVectorStore(SlowEmbeddings(latency_per_call=latency))
+    stats = ingest_documents(
+        store, documents, max_concurrency=concurrency, max_items_per_batch=batch, on_progress=None
+    )
+    return stats.chunks_per_second
+
+
+def query_timings(repeat: int, size: int = 100_000, dim: int = 256, k: int = 2) -> List[float]:
+    rng = np.random.default_rng(0)
+    store = NumpyVectorStore(RandomEmbeddings(dim))
+    fill_numpy_store(store, rng.standard_normal((size, dim), dtype=np.float32))
+    queries = iter(rng.standard_normal((repeat * 10 + 1, dim), dtype=np.float32).tolist())
+    return time_calls(lambda: store.similarity_search_by_vector(next(queries), k=k), repeat * 10)
+
+
+def persist_throughput(slots: int = 100_000) -> float:
+    classrooms = make_classrooms(slots)
+    with tempfile.TemporaryDirectory() as tmp:
+        with SchoolStore(os.path.join(tmp, "school.db")) as store:
+            start = time.perf_counter()
+            written = store.persist_classrooms(classrooms)
+            return written / (time.perf_counter() - start)
+
+
+def run_suite(latency: float, repeat: int) -> List[Result]:
+    school = make_school(100, 160)
+    return [
+        Result("feedback_csv_throughput", feedback_throughput(latency), "rows/s", True, {"concurrency": 8}),
+        Result("rag_ingest_throughput", ingest_throughput(latency), "chunks/s", True, {"concurrency": 4}),
+        Result("rag_query", median_ms(query_timings(repeat)), "ms", params={"vectors": 100_000}),
+        Result("sqlite_persist_throughput", persist_throughput(), "slots/s", True),
+        Result("schedule_solve", median_ms(time_calls(lambda: solve(school), repeat)), "ms",
+               params={"classrooms": 100}),
+    ]
+
+
+def main(argv=None) -> int:
+    return benchmark_results.main(SUITE, run_suite, "Benchmark the playground pipelines.", repeat=5, argv=argv)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.load import dumps, loads
+
+# Message fields that change on every run (ids, provider metadata) but do not
+# change what the model is being asked, so they are left out of the cache key.
+VOLATILE_MESSAGE_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Strip per-run message fields from a serialized prompt."""
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt
+
+    def strip(node: Any) -> Any:
+        if isinstance(node, list):
+            return [strip(item) for item in node]
+        if isinstance(node, dict):
+            kwargs = node.get("kwargs")
+            if node.get("type") == "constructor" and isinstance(kwargs, dict):
+                node = dict(node)
+                node["kwargs"] = {
+                    k: strip(v) for k, v in kwargs.items() if k not in VOLATILE_MESSAGE_FIELDS
+                }
+                return node
+            return {k: strip(v) for k, v in node.items()}
+        return node
+
+    return json.dumps(strip(messages), sort_keys=True, ensure_ascii=False)
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """
+    Content address for one model call.
+
+    `llm_string` already carries the model name, temperature and any bound
+    tools, which is where the structured-output (Pydantic) schema lives.
+    """
+    payload = normalize_prompt(prompt) + "\x00" + llm_string
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SQLiteResponseCache(BaseCache):
+    """
+    Persistent LLM response cache backed by a single SQLite file.
+
+    - ttl_seconds: entries older than this are treated as misses (None = forever)
+    - max_entries: least recently used entries are evicted above this size
+    """
+
+    def __init__(
+        self,
+        path: str = "llm_cache.db",
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = 10_000,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS response_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_response_cache_last_access "
+            "ON response_cache (last_access)"
+        )
+        self._conn.commit()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE response_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return [loads(item) for item in json.loads(value)]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = cache_key(prompt, llm_string)
+        value = json.dumps([dumps(generation) for generation in return_val])
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, created_at, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    """
+                    DELETE FROM response_cache WHERE key IN (
+                        SELECT key FROM response_cache
+                        ORDER BY last_access DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current number of entries."""
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def configure_response_cache() -> Optional[SQLiteResponseCache]:
+    """
+    Install a global SQLiteResponseCache when LLM_CACHE_PATH is set.
+
+    Every chat model created afterwards (init_chat_model, create_agent,
+    with_structured_output) reads and writes through it. Optional settings:
+    LLM_CACHE_TTL (seconds) and LLM_CACHE_MAX_ENTRIES.
+    """
+    path = os.environ.get("LLM_CACHE_PATH")
+    if not path:
+        return None
+
+    ttl = os.environ.get("LLM_CACHE_TTL")
+    max_entries = os.environ.get("LLM_CACHE_MAX_ENTRIES")
+
+    cache = SQLiteResponseCache(
+        path=path,
+        ttl_seconds=float(ttl) if ttl else None,
+        max_entries=int(max_entries) if max_entries else 10_000,
+    )
+    set_llm_cache(cache)
+    return cache
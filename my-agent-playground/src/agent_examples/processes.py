@@ -0,0 +1,13 @@
+import multiprocessing
+
+
+def worker_context():
+    """
+    Start pool workers with forkserver/spawn instead of fork: pools are
+    created while other threads (HTTP clients, executors) may be alive, and
+    forking then can copy a held lock into the child.
+
+    Callers started as scripts need the usual `if __name__ == "__main__"` guard.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
@@ -0,0 +1,276 @@
+import asyncio
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from langchain_core.tools import BaseTool
+
+# Background refreshes for every cached tool share these threads
+_refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tool-cache-refresh")
+
+# tool name -> cache, so stats can be reported for every decorated tool
+TOOL_CACHES: Dict[str, "ToolResultCache"] = {}
+
+
+def default_key(**arguments: Any) -> str:
+    """Cache key for a tool call: its arguments as canonical JSON."""
+    return json.dumps(arguments, sort_keys=True, default=repr, ensure_ascii=False)
+
+
+class ToolResultCache:
+    """
+    In-memory LRU cache for the results of one tool.
+
+    - ttl_seconds: how long a result is fresh
+    - stale_seconds: for how long after that it may still be served while a
+      background refresh fetches a new one (stale-while-revalidate);
+      0 disables it
+    - max_entries: least recently used results are evicted above this size
+
+    Concurrent misses for the same key share one call to the tool (per
+    event loop for async calls).
+    Exceptions are never cached; a failed background refresh keeps the
+    stale value until it falls out of the stale window.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float = 60.0,
+        stale_seconds: float = 0.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._ainflight: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+        self._refreshing: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: str) -> Tuple[str, Any]:
+        """('fresh' | 'stale' | 'miss', value); must hold the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return "miss", None
+        value, stored_at = entry
+        age = self.clock() - stored_at
+        if age <= self.ttl_seconds:
+            state = "fresh"
+        elif age <= self.ttl_seconds + self.stale_seconds:
+            state = "stale"
+        else:
+            del self._entries[key]
+            return "miss", None
+        self._entries.move_to_end(key)
+        return state, value
+
+    def _refresh_pending(self, key: str) -> bool:
+        """Whether a background refresh of `key` is still under way; must hold the lock."""
+        refresh = self._refreshing.get(key)
+        if refresh is None:
+            return False
+        if refresh.done() or (isinstance(refresh, asyncio.Future) and refresh.get_loop().is_closed()):
+            # Finished without clearing yet, or dropped with its event loop
+            del self._refreshing[key]
+            return False
+        return True
+
+    def _store(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (value, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            state, value = self._lookup(key)
+            if state == "fresh":
+                self.hits += 1
+                return value
+            if state == "stale":
+                self.stale_hits += 1
+                if not self._refresh_pending(key):
+                    self._refreshing[key] = _refresh_executor.submit(self._refresh, key, compute)
+                return value
+            self.misses += 1
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            return future.result()
+        try:
+            value = compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        self._store(key, value)
+        future.set_result(value)
+        return value
+
+    async def aget_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        with self._lock:
+            state, value = self._lookup(key)
+            if state == "fresh":
+                self.hits += 1
+                return value
+            if state == "stale":
+                self.stale_hits += 1
+                if not self._refresh_pending(key):
+                    task = self._refreshing[key] = asyncio.ensure_future(self._arefresh(key, compute))
+                    task.add_done_callback(functools.partial(self._refresh_done, key))
+                return value
+            self.misses += 1
+            loop = asyncio.get_running_loop()
+            future = self._ainflight.get((loop, key))
+            owner = future is None
+            if owner:
+                future = self._ainflight[(loop, key)] = loop.create_future()
+
+        if not owner:
+            # shield: a cancelled waiter must not cancel the call the others share
+            return await asyncio.shield(future)
+        try:
+            value = await compute()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # retrieved here, so an unawaited future doesn't log it
+            raise
+        finally:
+            with self._lock:
+                self._ainflight.pop((loop, key), None)
+        self._store(key, value)
+        future.set_result(value)
+        return value
+
+    def _refresh(self, key: str, compute: Callable[[], Any]):
+        try:
+            value = compute()
+        except Exception:
+            with self._lock:
+                self.refresh_errors += 1
+        else:
+            self._store(key, value)
+            with self._lock:
+                self.refreshes += 1
+        finally:
+            with self._lock:
+                self._refreshing.pop(key, None)
+
+    async def _arefresh(self, key: str, compute: Callable[[], Awaitable[Any]]):
+        try:
+            value = await compute()
+        except Exception:
+            with self._lock:
+                self.refresh_errors += 1
+        else:
+            self._store(key, value)
+            with self._lock:
+                self.refreshes += 1
+
+    def _refresh_done(self, key: str, task: asyncio.Future):
+        # Also runs when the refresh is cancelled, e.g. by asyncio.run on exit
+        with self._lock:
+            if self._refreshing.get(key) is task:
+                del self._refreshing[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current number of entries."""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+                "refreshes": self.refreshes,
+                "refresh_errors": self.refresh_errors,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+            }
+
+
+def cached_tool(
+    ttl_seconds: float = 60.0,
+    stale_seconds: float = 0.0,
+    max_entries: int = 1024,
+    key: Optional[Callable[..., str]] = None,
+) -> Callable[[BaseTool], BaseTool]:
+    """
+    Cache the results of a `@tool` (put it above the `@tool` decorator).
+
+    `key` receives the tool's arguments by name and returns the cache key;
+    the default uses all arguments, so pass one for tools that take
+    injected values such as ToolRuntime. `.run`, `.invoke` and their async
+    versions all go through the cache; `tool_cache_stats()` reports hit
+    rates.
+    """
+    make_key = key or default_key
+
+    def decorate(tool: BaseTool) -> BaseTool:
+        cache = ToolResultCache(tool.name, ttl_seconds, stale_seconds, max_entries)
+        TOOL_CACHES[tool.name] = cache
+
+        def key_for(signature: inspect.Signature, args, kwargs) -> str:
+            # .run("x") passes positional args, .invoke({...}) keywords: bind both the same way
+            return make_key(**signature.bind(*args, **kwargs).arguments)
+
+        func = getattr(tool, "func", None)
+        if func is not None:
+            func_signature = inspect.signature(func)
+
+            @functools.wraps(func)
+            def cached_func(*args, **kwargs):
+                return cache.get_or_compute(key_for(func_signature, args, kwargs), lambda: func(*args, **kwargs))
+
+            tool.func = cached_func
+
+        coroutine = getattr(tool, "coroutine", None)
+        if coroutine is not None:
+            coroutine_signature = inspect.signature(coroutine)
+
+            @functools.wraps(coroutine)
+            async def cached_coroutine(*args, **kwargs):
+                return await cache.aget_or_compute(
+                    key_for(coroutine_signature, args, kwargs), lambda: coroutine(*args, **kwargs)
+                )
+
+            tool.coroutine = cached_coroutine
+
+        return tool
+
+    return decorate
+
+
+def tool_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every cached tool, by tool name."""
+    return {name: cache.stats() for name, cache in TOOL_CACHES.items()}
@@ -0,0 +1,309 @@
+import json
+import os
+import threading
+import warnings
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage, BaseMessage
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """USD per million tokens."""
+    input: float
+    cached_input: float
+    output: float
+
+
+# Public list prices; model names are matched by longest prefix, so dated
+# snapshots like "gpt-4o-mini-2024-07-18" use their family's price
+PRICES: Dict[str, ModelPrice] = {
+    "gpt-4o-mini": ModelPrice(input=0.15, cached_input=0.075, output=0.60),
+    "gpt-4o": ModelPrice(input=2.50, cached_input=1.25, output=10.00),
+    "gpt-4.1-nano": ModelPrice(input=0.10, cached_input=0.025, output=0.40),
+    "gpt-4.1-mini": ModelPrice(input=0.40, cached_input=0.10, output=1.60),
+    "gpt-4.1": ModelPrice(input=2.00, cached_input=0.50, output=8.00),
+    "o4-mini": ModelPrice(input=1.10, cached_input=0.275, output=4.40),
+}
+
+
+def price_for(model: str, prices: Optional[Dict[str, ModelPrice]] = None) -> Optional[ModelPrice]:
+    prices = PRICES if prices is None else prices
+    matches = [name for name in prices if model.startswith(name)]
+    return prices[max(matches, key=len)] if matches else None
+
+
+@dataclass
+class Usage:
+    """
+    Token counts of one or more model calls; `input_tokens` includes the
+    cached ones. Responses served from the LLM response cache are counted
+    in `cache_hits` only: they were not sent, so they cost nothing.
+    """
+    calls: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    cache_hits: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def __add__(self, other: "Usage") -> "Usage":
+        return Usage(**{f.name: getattr(self, f.name) + getattr(other, f.name) for f in fields(self)})
+
+    def cost(self, price: Optional[ModelPrice]) -> Optional[float]:
+        """Estimated USD, or None for a model without a known price."""
+        if price is None:
+            return None
+        uncached = self.input_tokens - self.cached_tokens
+        return (
+            uncached * price.input + self.cached_tokens * price.cached_input + self.output_tokens * price.output
+        ) / 1_000_000
+
+
+def message_usage(message: BaseMessage) -> Optional[Tuple[str, Usage]]:
+    """
+    (model, Usage) of one AI message, or None if it carries no usage.
+
+    Reads the standard `usage_metadata` and falls back to the OpenAI
+    `token_usage` payload in `response_metadata`. LangChain replays the
+    original usage on a response cache hit and only adds `total_cost: 0`,
+    so such messages count as a cache hit with no tokens.
+    """
+    if not isinstance(message, AIMessage):
+        return None
+    metadata = message.response_metadata or {}
+    model = metadata.get("model_name") or metadata.get("model") or "unknown"
+
+    usage = message.usage_metadata
+    if usage and usage.get("total_cost") == 0:
+        return model, Usage(cache_hits=1)
+    if usage:
+        cached = (usage.get("input_token_details") or {}).get("cache_read") or 0
+        return model, Usage(1, usage.get("input_tokens", 0), cached, usage.get("output_tokens", 0))
+
+    token_usage = metadata.get("token_usage")
+    if token_usage:
+        cached = (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+        return model, Usage(
+            1, token_usage.get("prompt_tokens", 0), cached, token_usage.get("completion_tokens", 0)
+        )
+    return None
+
+
+class UsageBudgetExceeded(RuntimeError):
+    """Raised by UsageLedger.ensure_budget() once a cost or token budget is spent."""
+
+
+class UsageLedger:
+    """
+    Running token and cost totals, broken down by stage and model.
+
+    Feed it whole agent responses (`add_response`, which sums every AI
+    message, not just the last one), single messages, or attach
+    `callback()` to a run to record each model call as it finishes.
+    Messages are counted once by id, so adding a checkpointed thread's
+    growing history after every turn does not double count.
+
+    - path: every recorded call is also appended to this JSON lines file;
+      several processes can share one file and `UsageLedger.load(path)`
+      sums them
+    - budget_usd / token_budget: limits checked by `ensure_budget()`, so
+      batch jobs can stop before overspending; calls to a model missing
+      from the price table cannot be costed, so with a USD budget they
+      raise a RuntimeWarning (once per model) instead of silently counting
+      as free
+    - prices: overrides PRICES
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        budget_usd: Optional[float] = None,
+        token_budget: Optional[int] = None,
+        prices: Optional[Dict[str, ModelPrice]] = None,
+    ):
+        self.path = path
+        self.budget_usd = budget_usd
+        self.token_budget = token_budget
+        self.prices = PRICES if prices is None else prices
+        self.entries: Dict[Tuple[str, str], Usage] = {}
+        self._seen: set = set()
+        self._unpriced: set = set()
+        self._lock = threading.Lock()
+
+    def _accumulate(self, stage: str, model: str, usage: Usage):
+        with self._lock:
+            key = (stage, model)
+            self.entries[key] = self.entries.get(key, Usage()) + usage
+
+    def add(self, model: str, usage: Usage, stage: str = "default"):
+        """Record the usage of `model` calls under `stage`."""
+        self._accumulate(stage, model, usage)
+        if self.budget_usd is not None and usage.calls and price_for(model, self.prices) is None:
+            with self._lock:
+                first = model not in self._unpriced
+                self._unpriced.add(model)
+            if first:
+                warnings.warn(
+                    f"no price for model {model!r}: its calls are not counted against budget_usd",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+        if self.path:
+            line = json.dumps({"stage": stage, "model": model, **asdict(usage)}) + "\n"
+            # One O_APPEND write per call keeps lines from different processes whole
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode("utf-8"))
+            finally:
+                os.close(fd)
+
+    def add_message(self, message: BaseMessage, stage: str = "default") -> bool:
+        """Record one AI message; False if it has no usage or was already counted."""
+        found = message_usage(message)
+        if found is None:
+            return False
+        if message.id:
+            # A cache hit replays the original message id, so count it apart from the paid call
+            key = (message.id, found[1].cache_hits > 0)
+            with self._lock:
+                if key in self._seen:
+                    return False
+                self._seen.add(key)
+        self.add(*found, stage=stage)
+        return True
+
+    def add_messages(self, messages: Iterable[BaseMessage], stage: str = "default") -> int:
+        return sum(self.add_message(message, stage) for message in messages)
+
+    def add_response(self, response: Dict[str, Any], stage: str = "default") -> int:
+        """Record every model call in an agent response; returns how many were new."""
+        return self.add_messages(response.get("messages", []), stage)
+
+    def callback(self, stage: Optional[str] = None) -> "UsageCallback":
+        return UsageCallback(self, stage)
+
+    def merge(self, other: "UsageLedger"):
+        for (stage, model), usage in other.entries.items():
+            self._accumulate(stage, model, usage)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "UsageLedger":
+        """Sum every call recorded in a JSON lines file (by any number of processes)."""
+        ledger = cls(**kwargs)
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                usage = Usage(**{f.name: entry.get(f.name, 0) for f in fields(Usage)})
+                ledger._accumulate(entry["stage"], entry["model"], usage)
+        return ledger
+
+    def _group(self, index: int) -> Dict[str, Usage]:
+        with self._lock:
+            groups: Dict[str, Usage] = {}
+            for key, usage in self.entries.items():
+                groups[key[index]] = groups.get(key[index], Usage()) + usage
+            return groups
+
+    def by_stage(self) -> Dict[str, Usage]:
+        return self._group(0)
+
+    def by_model(self) -> Dict[str, Usage]:
+        return self._group(1)
+
+    def total(self) -> Usage:
+        with self._lock:
+            return sum(self.entries.values(), Usage())
+
+    def cost(self) -> float:
+        """Estimated USD over all models with a known price."""
+        with self._lock:
+            costs = (usage.cost(price_for(model, self.prices)) for (_, model), usage in self.entries.items())
+            return sum(c for c in costs if c is not None)
+
+    def cost_by_stage(self) -> Dict[str, float]:
+        with self._lock:
+            costs: Dict[str, float] = {}
+            for (stage, model), usage in self.entries.items():
+                costs[stage] = costs.get(stage, 0.0) + (usage.cost(price_for(model, self.prices)) or 0.0)
+            return costs
+
+    @property
+    def exceeded(self) -> bool:
+        if self.budget_usd is not None and self.cost() >= self.budget_usd:
+            return True
+        return self.token_budget is not None and self.total().total_tokens >= self.token_budget
+
+    def ensure_budget(self):
+        if self.exceeded:
+            raise UsageBudgetExceeded(
+                f"usage budget spent: ${self.cost():.4f} (budget {self.budget_usd}), "
+                f"{self.total().total_tokens} tokens (budget {self.token_budget})"
+            )
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals, per-model and per-stage usage with estimated cost, as plain data."""
+
+        def row(usage: Usage, cost: Optional[float]) -> Dict[str, Any]:
+            return {**asdict(usage), "total_tokens": usage.total_tokens, "cost_usd": cost}
+
+        stage_costs = self.cost_by_stage()
+        return {
+            "total": row(self.total(), self.cost()),
+            "by_model": {
+                model: row(usage, usage.cost(price_for(model, self.prices)))
+                for model, usage in self.by_model().items()
+            },
+            "by_stage": {stage: row(usage, stage_costs[stage]) for stage, usage in self.by_stage().items()},
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        print(f"{'':<32} {'calls':>6} {'hits':>6} {'input':>9} {'cached':>9} {'output':>9} {'USD':>10}")
+        sections = [("total", {"": summary["total"]}), ("model", summary["by_model"]), ("stage", summary["by_stage"])]
+        for label, rows in sections:
+            for name, r in rows.items():
+                cost = "?" if r["cost_usd"] is None else f"{r['cost_usd']:.5f}"
+                title = f"{label} {name}".strip()
+                print(
+                    f"{title:<32} {r['calls']:>6} {r['cache_hits']:>6} {r['input_tokens']:>9} "
+                    f"{r['cached_tokens']:>9} {r['output_tokens']:>9} {cost:>10}"
+                )
+
+
+class UsageCallback(BaseCallbackHandler):
+    """
+    Record every chat model call of a run into a UsageLedger.
+
+    The stage defaults to the LangGraph node the call ran in (e.g. "model"
+    for create_agent agents), so tool loops and hand-built graphs get a
+    per-node breakdown without passing responses around.
+    """
+
+    run_inline = True
+
+    def __init__(self, ledger: UsageLedger, stage: Optional[str] = None):
+        self.ledger = ledger
+        self.stage = stage
+        self._stages: Dict[Any, str] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._stages[run_id] = self.stage or (metadata or {}).get("langgraph_node") or "default"
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        stage = self._stages.pop(run_id, self.stage or "default")
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                if message is not None:
+                    self.ledger.add_message(message, stage)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._stages.pop(run_id, None)
@@ -1,5 +1,7 @@
 from typing import Any, Dict
 
+from .usage import UsageLedger
+
 def pretty_print_agent_response(response: Dict[str, Any]):
     """
     Pretty print structured LangChain agent output in a human-friendly format.
@@ -35,18 +37,17 @@ def pretty_print_agent_response(response: Dict[str, Any]):
             args = call.get("args", {})
             print(f"   - {name}({args})")
 
-    # 3. Token usage
-    ai_msg_meta = None
-    for msg in reversed(messages):
-        if hasattr(msg, "response_metadata") and msg.response_metadata:
-            ai_msg_meta = msg.response_metadata
-            break
+    # 3. Token usage, summed over every model call of the run
+    usage = UsageLedger()
+    usage.add_response(response)
+    total = usage.total()
 
-    if ai_msg_meta and "token_usage" in ai_msg_meta:
-        usage = ai_msg_meta["token_usage"]
+    if total.calls or total.cache_hits:
         print("\n📊 Token Usage:")
-        print(f"   - prompt:     {usage.get('prompt_tokens', '?')}")
-        print(f"   - completion: {usage.get('completion_tokens', '?')}")
-        print(f"   - total:      {usage.get('total_tokens', '?')}")
+        print(f"   - model calls: {total.calls} (+{total.cache_hits} from cache)")
+        print(f"   - prompt:      {total.input_tokens} ({total.cached_tokens} cached)")
+        print(f"   - completion:  {total.output_tokens}")
+        print(f"   - total:       {total.total_tokens}")
+        print(f"   - est. cost:   ${usage.cost():.6f}")
 
     print("\n===============================================\n")
@@ -0,0 +1,72 @@
+"""
+Recall@k versus latency of IVFIndex against exact NumpyVectorStore search.
+
+Run with:
+
+    python -m src.agent_rag.ann_benchmark
+
+Vectors are drawn from a mixture of Gaussians so the data has the kind of
+topical cluster structure real chunk embeddings have.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from langchain_core.documents import Document
+
+from .benchmark import RandomEmbeddings
+from .ivf_index import IVFIndex
+from .vector_store import NumpyVectorStore, normalize_rows, top_k
+
+
+def clustered_vectors(rng, size: int, dim: int, clusters: int = 1000) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    labels = rng.integers(0, clusters, size)
+    return centers[labels] + 0.5 * rng.standard_normal((size, dim), dtype=np.float32)
+
+
+def main(size: int = 1_000_000, dim: int = 128, k: int = 10, queries: int = 200,
+         n_lists: int = 1024, probes=(1, 2, 4, 8, 16, 32, 64)):
+    rng = np.random.default_rng(7)
+    vectors = clustered_vectors(rng, size, dim)
+    query_vectors = normalize_rows(clustered_vectors(rng, queries, dim))
+
+    store = NumpyVectorStore(RandomEmbeddings(dim))
+    store.add_vectors([Document(page_content="") for _ in range(size)], vectors)
+
+    start = time.perf_counter()
+    exact = [top_k((query[None, :] @ store.matrix.T), k)[0] for query in query_vectors]
+    exact_ms = (time.perf_counter() - start) / queries * 1000
+
+    index = IVFIndex(n_lists=n_lists)
+    start = time.perf_counter()
+    index.train(store.matrix)
+    index.add(store.matrix, 0)
+    build_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ivf.npz"
+        index.save(path)
+        start = time.perf_counter()
+        index = IVFIndex.load(path)
+        load_ms = (time.perf_counter() - start) * 1000
+
+    print(f"vectors={size} dim={dim} k={k} lists={n_lists}")
+    print(f"build {build_s:.2f}s, load {load_ms:.1f}ms, exact search {exact_ms:.2f}ms/query")
+    print(f"{'n_probe':>8} {f'recall@{k}':>10} {'ms/query':>9} {'speedup':>8}")
+
+    for n_probe in probes:
+        start = time.perf_counter()
+        results = index.search(store.matrix, query_vectors, k, n_probe=n_probe)
+        approx_ms = (time.perf_counter() - start) / queries * 1000
+        recall = np.mean([
+            len(set(rows.tolist()) & set(truth.tolist())) / k
+            for (rows, _), truth in zip(results, exact)
+        ])
+        print(f"{n_probe:>8} {recall:>10.3f} {approx_ms:>9.2f} {exact_ms / approx_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compare NumpyVectorStore with langchain's InMemoryVectorStore.
+
+Run with:
+
+    python -m src.agent_rag.benchmark
+
+Both stores are filled with the same random vectors and asked the same
+queries. InMemoryVectorStore is skipped above `baseline_max` vectors, where
+a single query already takes seconds.
+"""
+
+import time
+from typing import List
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from .vector_store import NumpyVectorStore
+
+
+class RandomEmbeddings(Embeddings):
+    """Deterministic random vectors; no network, no model."""
+
+    def __init__(self, dim: int = 256, seed: int = 0):
+        self.dim = dim
+        self.rng = np.random.default_rng(seed)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.rng.standard_normal((len(texts), self.dim), dtype=np.float32).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.rng.standard_normal(self.dim, dtype=np.float32).tolist()
+
+
+def fill_numpy_store(store: NumpyVectorStore, vectors: np.ndarray):
+    documents = [Document(page_content=f"chunk {i}") for i in range(len(vectors))]
+    store.add_vectors(documents, vectors)
+
+
+def fill_in_memory_store(store: InMemoryVectorStore, vectors: np.ndarray):
+    for i, vector in enumerate(vectors):
+        store.store[str(i)] = {
+            "id": str(i),
+            "vector": vector.tolist(),
+            "text": f"chunk {i}",
+            "metadata": {},
+        }
+
+
+def measure(search, queries: np.ndarray) -> List[float]:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name: str, size: int, latencies: List[float]):
+    total = sum(latencies)
+    p50 = np.percentile(latencies, 50) * 1000
+    p99 = np.percentile(latencies, 99) * 1000
+    print(f"{name:>22} {size:>9} {len(latencies) / total:>10.1f} {p50:>9.2f} {p99:>9.2f}")
+
+
+def main(sizes=(10_000, 100_000, 1_000_000), dim: int = 256, k: int = 2,
+         queries: int = 50, batch: int = 64, baseline_max: int = 100_000):
+    rng = np.random.default_rng(42)
+    embeddings = RandomEmbeddings(dim)
+    query_vectors = rng.standard_normal((queries, dim), dtype=np.float32)
+
+    print(f"dim={dim} k={k}")
+    print(f"{'store':>22} {'vectors':>9} {'QPS':>10} {'p50 ms':>9} {'p99 ms':>9}")
+
+    for size in sizes:
+        vectors = rng.standard_normal((size, dim), dtype=np.float32)
+
+        numpy_store = NumpyVectorStore(embeddings)
+        fill_numpy_store(numpy_store, vectors)
+        report("NumpyVectorStore", size, measure(
+            lambda q: numpy_store.similarity_search_by_vector(q.tolist(), k=k), query_vectors))
+
+        start = time.perf_counter()
+        for offset in range(0, len(query_vectors), batch):
+            numpy_store.batch_similarity_search_with_score_by_vector(
+                query_vectors[offset : offset + batch], k=k)
+        elapsed = time.perf_counter() - start
+        print(f"{'Numpy (batched)':>22} {size:>9} {len(query_vectors) / elapsed:>10.1f}")
+
+        if size <= baseline_max:
+            in_memory = InMemoryVectorStore(embeddings)
+            fill_in_memory_store(in_memory, vectors)
+            report("InMemoryVectorStore", size, measure(
+                lambda q: in_memory.similarity_search_by_vector(q.tolist(), k=k), query_vectors[:10]))
+            del in_memory
+
+        del numpy_store, vectors
+
+
+if __name__ == "__main__":
+    main()
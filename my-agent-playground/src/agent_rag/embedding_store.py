@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+def content_hash(text: str) -> str:
+    """Stable key for one chunk of text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    On-disk embedding store for a single embedding model.
+
+    Vectors live in one contiguous float32 file (`vectors.f32`) that is
+    memory-mapped on load, and `keys.json` maps each row to the content hash
+    of the chunk it was computed from. Warm starts only read the key list;
+    vectors are paged in by the OS when they are actually used.
+    """
+
+    def __init__(self, directory: str, model: str):
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model)
+        self.directory = Path(directory) / slug
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.model = model
+        self.vectors_path = self.directory / "vectors.f32"
+        self.keys_path = self.directory / "keys.json"
+
+        self.dim: Optional[int] = None
+        self.keys: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._load()
+
+    def _load(self):
+        if not self.keys_path.exists():
+            return
+        meta = json.loads(self.keys_path.read_text(encoding="utf-8"))
+        self.dim = meta["dim"]
+        self.keys = meta["keys"]
+        self.rows = {key: row for row, key in enumerate(self.keys)}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.rows
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Read-only (n, dim) float32 view over every stored vector."""
+        if self._matrix is None or self._matrix.shape[0] != len(self.keys):
+            if not self.keys:
+                return np.empty((0, self.dim or 0), dtype=np.float32)
+            self._matrix = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r", shape=(len(self.keys), self.dim)
+            )
+        return self._matrix
+
+    def get(self, keys: List[str]) -> np.ndarray:
+        """Return the stored vectors for `keys`, in order."""
+        return np.asarray(self.matrix[[self.rows[key] for key in keys]])
+
+    def add(self, keys: List[str], vectors) -> None:
+        """Append new vectors; keys already in the store are ignored."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(keys):
+            return
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dim vectors for {self.model}, got {vectors.shape[1]}")
+
+        fresh = [i for i, key in enumerate(keys) if key not in self.rows]
+        fresh = list({keys[i]: i for i in fresh}.values())
+        if not fresh:
+            return
+
+        # Drop rows written by an interrupted append that never reached keys.json
+        committed_bytes = len(self.keys) * self.dim * 4
+        self._matrix = None
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(committed_bytes)
+            f.write(np.ascontiguousarray(vectors[fresh]).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+        for i in fresh:
+            self.rows[keys[i]] = len(self.keys)
+            self.keys.append(keys[i])
+
+        tmp_path = self.keys_path.with_name(self.keys_path.name + ".tmp")
+        tmp_path.write_text(json.dumps({"model": self.model, "dim": self.dim, "keys": self.keys}), encoding="utf-8")
+        os.replace(tmp_path, self.keys_path)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves document vectors from an EmbeddingStore.
+
+    Only chunks whose content hash is not in the store are sent to the
+    underlying model. Queries are always embedded live.
+    """
+
+    def __init__(self, underlying: Embeddings, store: EmbeddingStore):
+        self.underlying = underlying
+        self.store = store
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [content_hash(text) for text in texts]
+        missing = list({key: text for key, text in zip(keys, texts) if key not in self.store}.items())
+
+        if missing:
+            vectors = self.underlying.embed_documents([text for _, text in missing])
+            self.store.add([key for key, _ in missing], vectors)
+
+        return self.store.get(keys).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.underlying.embed_query(text)
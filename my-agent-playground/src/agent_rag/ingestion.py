@@ -0,0 +1,193 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from .embedding_store import CachedEmbeddings, content_hash
+from .vector_store import NumpyVectorStore
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for OpenAI encoders)."""
+    return len(text) // 4 + 1
+
+
+def make_batches(texts: List[str], max_tokens: int = 100_000, max_items: int = 512) -> List[List[int]]:
+    """Group text indices into batches that respect a token and size budget."""
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+
+    for i, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or type(error).__name__ == "RateLimitError"
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that backs off on rate limits and recovers on success.
+
+    A 429 halves the number of requests allowed in flight and pauses every
+    worker for the current backoff delay; each run of successes lets one
+    more request back in, up to `max_concurrency`.
+    """
+
+    def __init__(self, max_concurrency: int, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.max_concurrency = max_concurrency
+        self.limit = max_concurrency
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.delay = base_delay
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return
+                self._cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self, rate_limited: bool = False):
+        with self._cond:
+            self.in_flight -= 1
+            if rate_limited:
+                self.limit = max(1, self.limit // 2)
+                self.paused_until = time.monotonic() + self.delay * (1 + random.random())
+                self.delay = min(self.delay * 2, self.max_delay)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= self.limit:
+                    self.limit = min(self.limit + 1, self.max_concurrency)
+                    self.delay = self.base_delay
+                    self._successes = 0
+            self._cond.notify_all()
+
+
+@dataclass
+class IngestStats:
+    """Progress of one ingestion run."""
+    chunks_total: int
+    chunks_done: int = 0
+    chunks_skipped: int = 0
+    tokens_done: int = 0
+    retries: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks_done / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens_done / self.elapsed if self.elapsed else 0.0
+
+
+def print_progress(stats: IngestStats):
+    print(
+        f"[{stats.chunks_done + stats.chunks_skipped}/{stats.chunks_total}] "
+        f"{stats.chunks_per_second:.1f} chunks/s, {stats.tokens_per_second:.0f} tokens/s, "
+        f"{stats.chunks_skipped} reused, {stats.retries} retries"
+    )
+
+
+def ingest_documents(
+    vector_store: NumpyVectorStore,
+    documents: List[Document],
+    max_concurrency: int = 4,
+    max_tokens_per_batch: int = 100_000,
+    max_items_per_batch: int = 512,
+    max_retries: int = 8,
+    on_progress: Optional[Callable[[IngestStats], None]] = print_progress,
+) -> IngestStats:
+    """
+    Embed `documents` in token-budgeted batches and add them to `vector_store`.
+
+    Batches run concurrently under an AdaptiveLimiter. When the store's
+    embeddings are CachedEmbeddings, every finished batch is committed to
+    the EmbeddingStore right away and chunks already stored are skipped, so
+    an interrupted run resumes where it stopped.
+    """
+    embeddings: Embeddings = vector_store.embeddings
+    store = embeddings.store if isinstance(embeddings, CachedEmbeddings) else None
+    model = embeddings.underlying if isinstance(embeddings, CachedEmbeddings) else embeddings
+
+    texts = [doc.page_content for doc in documents]
+    keys = [content_hash(text) for text in texts]
+    stats = IngestStats(chunks_total=len(texts))
+
+    vectors: List[Optional[List[float]]] = [None] * len(texts)
+    pending = [i for i, key in enumerate(keys) if store is None or key not in store]
+    stats.chunks_skipped = len(texts) - len(pending)
+
+    limiter = AdaptiveLimiter(max_concurrency)
+    store_lock = threading.Lock()
+
+    def embed_batch(indices: List[int]) -> List[int]:
+        batch_texts = [texts[i] for i in indices]
+        for attempt in range(max_retries + 1):
+            limiter.acquire()
+            try:
+                result = model.embed_documents(batch_texts)
+            except Exception as e:
+                limiter.release(rate_limited=is_rate_limit_error(e))
+                if not is_rate_limit_error(e) or attempt == max_retries:
+                    raise
+                stats.retries += 1
+                continue
+            limiter.release()
+            break
+
+        if store is not None:
+            with store_lock:
+                store.add([keys[i] for i in indices], result)
+        else:
+            for i, vector in zip(indices, result):
+                vectors[i] = vector
+        return indices
+
+    batches = make_batches([texts[i] for i in pending], max_tokens_per_batch, max_items_per_batch)
+    batches = [[pending[i] for i in batch] for batch in batches]
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = [executor.submit(embed_batch, batch) for batch in batches]
+        for future in as_completed(futures):
+            indices = future.result()
+            stats.chunks_done += len(indices)
+            stats.tokens_done += sum(estimate_tokens(texts[i]) for i in indices)
+            if on_progress is not None:
+                on_progress(stats)
+
+    if store is not None:
+        matrix = store.get(keys) if keys else []
+    else:
+        matrix = vectors
+    vector_store.add_vectors(documents, matrix)
+    return stats
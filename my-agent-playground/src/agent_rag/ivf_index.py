@@ -0,0 +1,142 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .vector_store import normalize_rows, top_k
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate nearest-neighbour index over unit vectors.
+
+    Vectors are clustered with spherical k-means into `n_lists` cells; a
+    query only scores the rows stored in its `n_probe` closest cells. The
+    index holds row numbers, not vectors, so it always searches the matrix
+    owned by the vector store.
+
+    - n_lists: number of cells; more cells means smaller cells to scan
+    - n_probe: cells scanned per query; the recall/latency knob
+    - train_size: rows needed before the index trains itself (default 8 * n_lists)
+    """
+
+    def __init__(
+        self,
+        n_lists: int = 256,
+        n_probe: int = 8,
+        train_size: Optional[int] = None,
+        iterations: int = 10,
+        max_train_points: int = 100_000,
+        seed: int = 0,
+    ):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.train_size = train_size or 8 * n_lists
+        self.iterations = iterations
+        self.max_train_points = max_train_points
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.lists: List[np.ndarray] = []
+        self._pending: Dict[int, List[np.ndarray]] = {}
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def __len__(self) -> int:
+        self._merge_pending()
+        return sum(len(rows) for rows in self.lists)
+
+    def train(self, vectors: np.ndarray):
+        """Fit the cell centroids with spherical k-means."""
+        rng = np.random.default_rng(self.seed)
+        data = normalize_rows(vectors)
+        if len(data) > self.max_train_points:
+            data = data[rng.choice(len(data), self.max_train_points, replace=False)]
+        n_lists = min(self.n_lists, len(data))
+
+        centroids = data[rng.choice(len(data), n_lists, replace=False)].copy()
+        for _ in range(self.iterations):
+            assignment = self._nearest(data, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, data)
+            counts = np.bincount(assignment, minlength=n_lists)
+            # Re-seed empty cells from random points so no centroid is wasted
+            empty = counts == 0
+            sums[empty] = data[rng.choice(len(data), int(empty.sum()))]
+            centroids = normalize_rows(sums)
+
+        self.n_lists = n_lists
+        self.centroids = centroids
+        self.lists = [np.empty(0, dtype=np.int64) for _ in range(n_lists)]
+        self._pending = {}
+
+    def add(self, vectors: np.ndarray, first_row: int):
+        """Assign rows `first_row .. first_row + len(vectors)` to their cells."""
+        if not self.is_trained or not len(vectors):
+            return
+        assignment = self._nearest(normalize_rows(vectors), self.centroids)
+        rows = np.arange(first_row, first_row + len(vectors), dtype=np.int64)
+        order = np.argsort(assignment, kind="stable")
+        cells, starts = np.unique(assignment[order], return_index=True)
+        for cell, members in zip(cells, np.split(rows[order], starts[1:])):
+            self._pending.setdefault(int(cell), []).append(members)
+
+    def reset(self):
+        """Forget every row but keep the trained centroids."""
+        self.lists = [np.empty(0, dtype=np.int64) for _ in range(self.n_lists)]
+        self._pending = {}
+
+    def search(
+        self, matrix: np.ndarray, queries: np.ndarray, k: int, n_probe: Optional[int] = None
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Return (rows, scores) of the approximate top-k for each query."""
+        self._merge_pending()
+        queries = normalize_rows(queries)
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        probes = top_k(queries @ self.centroids.T, n_probe)
+
+        results = []
+        for query, cells in zip(queries, probes):
+            candidates = np.concatenate([self.lists[cell] for cell in cells])
+            if not len(candidates):
+                results.append((candidates, np.empty(0, dtype=np.float32)))
+                continue
+            scores = matrix[candidates] @ query
+            best = top_k(scores[None, :], k)[0]
+            results.append((candidates[best], scores[best]))
+        return results
+
+    def save(self, path: str):
+        """Write centroids and cell membership to a single .npz file."""
+        self._merge_pending()
+        sizes = np.array([len(rows) for rows in self.lists], dtype=np.int64)
+        np.savez(
+            Path(path),
+            centroids=self.centroids,
+            sizes=sizes,
+            rows=np.concatenate(self.lists) if self.lists else np.empty(0, dtype=np.int64),
+            params=np.array([self.n_lists, self.n_probe, self.train_size, self.iterations, self.seed]),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        data = np.load(Path(path))
+        n_lists, n_probe, train_size, iterations, seed = (int(v) for v in data["params"])
+        index = cls(n_lists=n_lists, n_probe=n_probe, train_size=train_size,
+                    iterations=iterations, seed=seed)
+        index.centroids = data["centroids"]
+        index.lists = np.split(data["rows"], np.cumsum(data["sizes"])[:-1])
+        return index
+
+    def _merge_pending(self):
+        for cell, chunks in self._pending.items():
+            self.lists[cell] = np.concatenate([self.lists[cell], *chunks])
+        self._pending = {}
+
+    @staticmethod
+    def _nearest(data: np.ndarray, centroids: np.ndarray, chunk: int = 8192) -> np.ndarray:
+        assignment = np.empty(len(data), dtype=np.int64)
+        for start in range(0, len(data), chunk):
+            assignment[start : start + chunk] = np.argmax(data[start : start + chunk] @ centroids.T, axis=1)
+        return assignment
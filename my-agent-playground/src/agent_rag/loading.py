@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from ..agent_examples.processes import worker_context
+
+CHUNK_SIZE = 1000  # chunk size (characters)
+CHUNK_OVERLAP = 200  # chunk overlap (characters)
+
+HTML_SUFFIXES = (".html", ".htm")
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching one source."""
+    source: str
+    text: Optional[str] = None
+    title: str = ""
+    etag: Optional[str] = None
+    content_hash: Optional[str] = None
+    not_modified: bool = False
+    error: Optional[str] = None
+
+
+def is_url(source: str) -> bool:
+    return source.startswith(("http://", "https://"))
+
+
+def html_to_text(html: str) -> Tuple[str, str]:
+    """Return (title, visible text) of an HTML page."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.title.get_text().strip() if soup.title else ""
+    return title, soup.get_text()
+
+
+def fetch_source(source: str, etag: Optional[str] = None, timeout: float = 30) -> FetchResult:
+    """
+    Fetch a URL (conditionally, with If-None-Match) or read a local file.
+
+    HTML is reduced to its text the same way WebBaseLoader does.
+    """
+    if is_url(source):
+        import requests
+
+        headers = {"If-None-Match": etag} if etag else {}
+        response = requests.get(source, headers=headers, timeout=timeout)
+        if response.status_code == 304:
+            return FetchResult(source=source, etag=etag, not_modified=True)
+        response.raise_for_status()
+        raw = response.text
+        is_html = "html" in response.headers.get("Content-Type", "html")
+        etag = response.headers.get("ETag")
+    else:
+        raw = Path(source).read_text(encoding="utf-8")
+        is_html = source.lower().endswith(HTML_SUFFIXES)
+        etag = None
+
+    digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    title, text = html_to_text(raw) if is_html else ("", raw)
+    return FetchResult(source=source, text=text, title=title, etag=etag, content_hash=digest)
+
+
+def try_fetch_source(source: str, etag: Optional[str] = None) -> FetchResult:
+    """fetch_source that reports a failure (404, timeout, ...) in `error` instead of raising."""
+    try:
+        return fetch_source(source, etag)
+    except Exception as e:
+        return FetchResult(source=source, error=f"{type(e).__name__}: {e}")
+
+
+def split_text(text: str, metadata: dict) -> List[Tuple[str, dict]]:
+    """Split one document; plain tuples keep process-pool pickling cheap."""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
+        add_start_index=True,  # track index in original document
+    )
+    chunks = text_splitter.split_documents([Document(page_content=text, metadata=metadata)])
+    return [(chunk.page_content, chunk.metadata) for chunk in chunks]
+
+
+class SourceManifest:
+    """
+    Record of every ingested source: its ETag, content hash and chunks.
+
+    Chunks are kept in `chunks/<content hash>.json` next to `manifest.json`,
+    so an unchanged source is served from disk without refetching (when the
+    server honours ETags), reparsing or resplitting.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.chunks_dir = self.directory / "chunks"
+        self.chunks_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / "manifest.json"
+        self.entries: Dict[str, dict] = {}
+        if self.path.exists():
+            self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def etag(self, source: str) -> Optional[str]:
+        return self.entries.get(source, {}).get("etag")
+
+    def cached_chunks(self, source: str, content_hash: Optional[str] = None) -> Optional[List[Document]]:
+        """Chunks for `source` if they are on disk and (optionally) match `content_hash`."""
+        entry = self.entries.get(source)
+        if entry is None or (content_hash is not None and entry["hash"] != content_hash):
+            return None
+        chunks_path = self.chunks_dir / f"{entry['hash']}.json"
+        if not chunks_path.exists():
+            return None
+        chunks = json.loads(chunks_path.read_text(encoding="utf-8"))
+        return [Document(page_content=content, metadata=metadata) for content, metadata in chunks]
+
+    def record(self, result: FetchResult, chunks: List[Tuple[str, dict]]):
+        chunks_path = self.chunks_dir / f"{result.content_hash}.json"
+        chunks_path.write_text(json.dumps(chunks, ensure_ascii=False), encoding="utf-8")
+        self.entries[result.source] = {"etag": result.etag, "hash": result.content_hash}
+
+    def save(self):
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.entries, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def load_and_split(
+    sources: Sequence[str],
+    cache_dir: str,
+    fetch_workers: int = 8,
+    split_workers: Optional[int] = None,
+) -> List[Document]:
+    """
+    Fetch many sources concurrently and split new or changed ones in parallel.
+
+    - sources: URLs and/or local HTML/text file paths
+    - cache_dir: where the manifest and cached chunks are kept
+    - fetch_workers: concurrent fetches (threads; fetching is I/O bound)
+    - split_workers: processes used for splitting (None = CPU count)
+
+    A source that fails to fetch is logged and served from its cached
+    chunks when it has any, otherwise skipped; it never aborts the load.
+    """
+    manifest = SourceManifest(cache_dir)
+
+    with ThreadPoolExecutor(max_workers=fetch_workers) as executor:
+        results = list(executor.map(lambda s: try_fetch_source(s, manifest.etag(s)), sources))
+
+    chunks_by_source: Dict[str, List[Document]] = {}
+    to_split: List[FetchResult] = []
+    failed = 0
+    for result in results:
+        if result.not_modified and manifest.cached_chunks(result.source) is None:
+            # The server says unchanged but our chunks are gone: fetch again
+            result = try_fetch_source(result.source)
+
+        if result.error is not None:
+            failed += 1
+            cached = manifest.cached_chunks(result.source)
+            print(f"Failed to fetch {result.source} ({result.error}); "
+                  f"{'using cached chunks' if cached is not None else 'skipping it'}.")
+            if cached is not None:
+                chunks_by_source[result.source] = cached
+            continue
+
+        cached = manifest.cached_chunks(
+            result.source, None if result.not_modified else result.content_hash
+        )
+        if cached is not None:
+            chunks_by_source[result.source] = cached
+        else:
+            to_split.append(result)
+
+    metadatas = [{"source": r.source, "title": r.title} for r in to_split]
+    if len(to_split) > 1:
+        # No fork: load_and_split runs lazily from get_news while other threads are alive
+        with ProcessPoolExecutor(max_workers=split_workers, mp_context=worker_context()) as executor:
+            split_results = list(executor.map(split_text, [r.text for r in to_split], metadatas))
+    else:
+        split_results = [split_text(r.text, m) for r, m in zip(to_split, metadatas)]
+
+    for result, chunks in zip(to_split, split_results):
+        manifest.record(result, chunks)
+        chunks_by_source[result.source] = [
+            Document(page_content=content, metadata=metadata) for content, metadata in chunks
+        ]
+    manifest.save()
+
+    unchanged = len(sources) - len(to_split) - failed
+    print(f"Loaded {len(sources)} sources ({unchanged} unchanged, {len(to_split)} re-split, {failed} failed).")
+    return [chunk for source in sources for chunk in chunks_by_source.get(source, [])]
@@ -1,43 +1,82 @@
 import os
+from functools import lru_cache
+from typing import List
+
 from dotenv import load_dotenv
-from langchain_openai import OpenAIEmbeddings
-from langchain_core.vectorstores import InMemoryVectorStore
-from langchain.chat_models import init_chat_model
-from langchain.agents import create_agent
-from langchain_community.document_loaders import WebBaseLoader
-from langchain.tools import tool
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.tools import tool
+
+from .embedding_store import CachedEmbeddings, EmbeddingStore
+from .ingestion import ingest_documents
+from .ivf_index import IVFIndex
+from .loading import load_and_split
+from .vector_store import NumpyVectorStore
 
 load_dotenv()
 
-loader = WebBaseLoader(
-    web_paths=("https://pt.wikipedia.org/wiki/2025",),
+# Comma-separated URLs and/or local HTML/text files
+SOURCES = tuple(
+    source.strip()
+    for source in os.environ.get("RAG_SOURCES", "https://pt.wikipedia.org/wiki/2025").split(",")
+    if source.strip()
+)
+SOURCE_CACHE_DIR = os.environ.get(
+    "SOURCE_CACHE_DIR", os.path.join(os.path.dirname(__file__), ".sources")
+)
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_STORE_DIR = os.environ.get(
+    "EMBEDDING_STORE_DIR", os.path.join(os.path.dirname(__file__), ".embeddings")
 )
 
-docs = loader.load()
+# Everything below is built on first use (get_news or warm_up), never at
+# import time, so importing this module does no network I/O.
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-text_splitter = RecursiveCharacterTextSplitter(
-    chunk_size=1000,  # chunk size (characters)
-    chunk_overlap=200,  # chunk overlap (characters)
-    add_start_index=True,  # track index in original document
-)
-all_splits = text_splitter.split_documents(docs)
+def load_chunks() -> List[Document]:
+    return load_and_split(SOURCES, SOURCE_CACHE_DIR)
 
-print(f"Split blog post into {len(all_splits)} sub-documents.")
 
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small",
-                            base_url=os.environ.get("BASE_EMBEDDING_URL"),
-                            default_headers={"FlowAgent": "Flow Api", "FlowTenant": "cit"})
+def create_embeddings() -> Embeddings:
+    from langchain_openai import OpenAIEmbeddings
+
+    return CachedEmbeddings(
+        OpenAIEmbeddings(model=EMBEDDING_MODEL,
+                         base_url=os.environ.get("BASE_EMBEDDING_URL"),
+                         default_headers={"FlowAgent": "Flow Api", "FlowTenant": "cit"}),
+        EmbeddingStore(EMBEDDING_STORE_DIR, EMBEDDING_MODEL),
+    )
 
-vector_store = InMemoryVectorStore(embeddings)
 
-document_ids = vector_store.add_documents(documents=all_splits)
+def create_index():
+    # Approximate search is opt-in: set RAG_IVF_LISTS (and optionally RAG_IVF_PROBES)
+    ivf_lists = os.environ.get("RAG_IVF_LISTS")
+    if not ivf_lists:
+        return None
+    return IVFIndex(n_lists=int(ivf_lists), n_probe=int(os.environ.get("RAG_IVF_PROBES", "8")))
+
+
+@lru_cache(maxsize=None)
+def get_vector_store() -> NumpyVectorStore:
+    """Load, split and embed the sources once per process."""
+    all_splits = load_chunks()
+    print(f"Split blog post into {len(all_splits)} sub-documents.")
+
+    vector_store = NumpyVectorStore(create_embeddings(), index=create_index())
+    ingest_documents(vector_store, all_splits)
+    return vector_store
+
+
+def warm_up():
+    """Build the RAG pipeline ahead of the first get_news call."""
+    get_vector_store()
+
 
 @tool(response_format="content_and_artifact")
 def get_news(query: str):
     """Retrieve information to help answer a query."""
-    retrieved_docs = vector_store.similarity_search(query, k=2)
+    retrieved_docs = get_vector_store().similarity_search(query, k=2)
     serialized = "\n\n".join(
         (f"Source: {doc.metadata}\nContent: {doc.page_content}")
         for doc in retrieved_docs
@@ -52,6 +91,9 @@ You have access to tool to get this year news.
 
 
 def main():
+    from langchain.chat_models import init_chat_model
+    from langchain.agents import create_agent
+
     model = init_chat_model(
         "gpt-4o-mini",
         temperature=0.5,
@@ -0,0 +1,78 @@
+"""
+Measure agent_rag import cost and first-query cost separately.
+
+Run with:
+
+    python -m src.agent_rag.startup_benchmark
+
+Import time is measured in a fresh interpreter. The first-query path runs
+with an offline, pre-split corpus and fake embeddings (with injected latency) patched
+into the factories, so it needs no network or API key.
+"""
+
+import subprocess
+import sys
+import time
+from typing import List
+
+from langchain_core.documents import Document
+
+from . import main as rag
+from .benchmark import RandomEmbeddings
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); "
+    "import src.agent_rag.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+class SlowEmbeddings(RandomEmbeddings):
+    """RandomEmbeddings that sleep like a remote embedding API would."""
+
+    def __init__(self, dim: int = 256, latency_per_call: float = 0.2):
+        super().__init__(dim)
+        self.latency_per_call = latency_per_call
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency_per_call)
+        return super().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency_per_call / 4)
+        return super().embed_query(text)
+
+
+def measure_import(runs: int = 3) -> float:
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET], capture_output=True, text=True, check=True
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return min(timings)
+
+
+def main(chunks: int = 500):
+    corpus = [Document(page_content=f"Notícia {i} de 2025. " * 40) for i in range(chunks)]
+    rag.load_chunks = lambda: corpus
+    rag.create_embeddings = lambda: SlowEmbeddings()
+    rag.get_vector_store.cache_clear()
+
+    import_s = measure_import()
+
+    start = time.perf_counter()
+    rag.get_news.invoke({"query": "fevereiro"})
+    first_query_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rag.get_news.invoke({"query": "março"})
+    warm_query_s = time.perf_counter() - start
+
+    print(f"import agent_rag.main: {import_s * 1000:9.1f} ms")
+    print(f"first get_news call:   {first_query_s * 1000:9.1f} ms (embed + search)")
+    print(f"warm get_news call:    {warm_query_s * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
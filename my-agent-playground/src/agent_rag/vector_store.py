@@ -0,0 +1,203 @@
+import uuid
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+if TYPE_CHECKING:
+    from .ivf_index import IVFIndex
+
+
+def normalize_rows(vectors) -> np.ndarray:
+    """Return float32 rows scaled to unit length (zero rows stay zero)."""
+    matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores per row, best first."""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    if k < scores.shape[1]:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1)
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Drop-in replacement for InMemoryVectorStore backed by one NumPy matrix.
+
+    Embeddings are L2-normalized on insert, so cosine similarity for every
+    stored vector is a single matrix-vector product, and top-k selection is
+    an `argpartition` instead of a full sort.
+
+    Pass an IVFIndex as `index` to switch to approximate search once the
+    store is large enough for the index to train itself.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        dim: Optional[int] = None,
+        index: Optional["IVFIndex"] = None,
+    ):
+        self.embedding = embedding
+        self.dim = dim
+        self.index = index
+        self.ids: List[str] = []
+        self.documents: List[Document] = []
+        self._matrix = np.empty((0, dim or 0), dtype=np.float32)
+        self._size = 0
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """(n, dim) view over the normalized vectors currently stored."""
+        return self._matrix[: self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add_vectors(
+        self,
+        documents: Sequence[Document],
+        vectors,
+        ids: Optional[Sequence[str]] = None,
+    ) -> List[str]:
+        """Insert documents whose embeddings were already computed."""
+        vectors = normalize_rows(vectors)
+        if not len(documents):
+            return []
+        if self.dim is None or self._matrix.shape[1] == 0:
+            self.dim = int(vectors.shape[1])
+            self._matrix = np.empty((0, self.dim), dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dim vectors, got {vectors.shape[1]}")
+
+        # Grow capacity geometrically so repeated inserts stay amortized O(1)
+        needed = self._size + len(documents)
+        if needed > self._matrix.shape[0]:
+            capacity = max(needed, 2 * self._matrix.shape[0], 1024)
+            grown = np.empty((capacity, self.dim), dtype=np.float32)
+            grown[: self._size] = self._matrix[: self._size]
+            self._matrix = grown
+        first_row = self._size
+        self._matrix[first_row:needed] = vectors
+        self._size = needed
+
+        if self.index is not None:
+            if self.index.is_trained:
+                self.index.add(vectors, first_row)
+            elif self._size >= self.index.train_size:
+                self.index.train(self.matrix)
+                self.index.add(self.matrix, 0)
+
+        ids = list(ids) if ids else [doc.id or str(uuid.uuid4()) for doc in documents]
+        for doc_id, doc in zip(ids, documents):
+            self.ids.append(doc_id)
+            self.documents.append(
+                Document(id=doc_id, page_content=doc.page_content, metadata=doc.metadata)
+            )
+        return ids
+
+    def add_documents(self, documents: List[Document], **kwargs: Any) -> List[str]:
+        vectors = self.embedding.embed_documents([doc.page_content for doc in documents])
+        return self.add_vectors(documents, vectors, kwargs.get("ids"))
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        documents = [Document(page_content=text, metadata=meta) for text, meta in zip(texts, metadatas)]
+        return self.add_documents(documents, ids=ids)
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        wanted = set(ids)
+        return [doc for doc in self.documents if doc.id in wanted]
+
+    def delete(self, ids: Optional[Sequence[str]] = None, **kwargs: Any) -> None:
+        if not ids:
+            return
+        doomed = set(ids)
+        keep = [i for i, doc_id in enumerate(self.ids) if doc_id not in doomed]
+        self._matrix = self.matrix[keep].copy()
+        self._size = len(keep)
+        self.ids = [self.ids[i] for i in keep]
+        self.documents = [self.documents[i] for i in keep]
+        if self.index is not None and self.index.is_trained:
+            self.index.reset()
+            self.index.add(self.matrix, 0)
+
+    def batch_similarity_search_with_score_by_vector(
+        self, embeddings, k: int = 4
+    ) -> List[List[Tuple[Document, float]]]:
+        """Score many query vectors against the store in one matmul."""
+        queries = normalize_rows(embeddings)
+        if not self._size:
+            return [[] for _ in range(queries.shape[0])]
+        if self.index is not None and self.index.is_trained:
+            return [
+                [(self.documents[i], float(score)) for i, score in zip(rows, scores)]
+                for rows, scores in self.index.search(self.matrix, queries, k)
+            ]
+
+        scores = queries @ self.matrix.T
+        indices = top_k(scores, k)
+        return [
+            [(self.documents[i], float(scores[row, i])) for i in indices[row]]
+            for row in range(queries.shape[0])
+        ]
+
+    def batch_similarity_search(self, queries: Sequence[str], k: int = 4) -> List[List[Document]]:
+        """Embed and answer several queries at once."""
+        vectors = [self.embedding.embed_query(query) for query in queries]
+        return [
+            [doc for doc, _ in results]
+            for results in self.batch_similarity_search_with_score_by_vector(vectors, k)
+        ]
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.batch_similarity_search_with_score_by_vector([embedding], k)[0]
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k)
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k)]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any,
+    ) -> "NumpyVectorStore":
+        store = cls(embedding)
+        store.add_texts(texts, metadatas=metadatas, ids=kwargs.get("ids"))
+        return store
@@ -0,0 +1,93 @@
+"""
+Write amplification and resume latency of SQLiteDeltaSaver.
+
+Run with:
+
+    python -m src.agent_react.checkpoint_benchmark
+
+A small message graph (one human + one AI message per turn) is driven
+through LangGraph with delta storage on and off (snapshot_every=1 means a
+full snapshot of the message list on every step, like InMemorySaver).
+Write amplification is bytes written per byte of new messages.
+"""
+
+import os
+import tempfile
+import time
+from typing import Annotated
+
+from typing_extensions import TypedDict
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import StateGraph, START, END
+from langgraph.graph.message import add_messages
+
+from .checkpointer import SQLiteDeltaSaver
+
+REPLY = "It's always sunny in Florida, so the forecast is a bright idea! " * 4
+
+
+class ChatState(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+def reply(state: ChatState) -> ChatState:
+    return {"messages": [AIMessage(REPLY)]}
+
+
+def build_app(checkpointer):
+    graph = StateGraph(ChatState)
+    graph.add_node("reply", reply)
+    graph.add_edge(START, "reply")
+    graph.add_edge("reply", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def run(path: str, snapshot_every: int, threads: int, turns: int):
+    saver = SQLiteDeltaSaver(path, snapshot_every=snapshot_every)
+    app = build_app(saver)
+    payload = 0
+
+    start = time.perf_counter()
+    for turn in range(turns):
+        for thread in range(threads):
+            question = f"what is the weather outside? (turn {turn})"
+            payload += len(saver.serde.dumps_typed([HumanMessage(question), AIMessage(REPLY)])[1])
+            app.invoke({"messages": [HumanMessage(question)]}, {"configurable": {"thread_id": str(thread)}})
+    write_s = time.perf_counter() - start
+
+    config = {"configurable": {"thread_id": "0"}}
+    start = time.perf_counter()
+    saver.get_tuple(config)
+    hot_ms = (time.perf_counter() - start) * 1000
+    saver.close()
+
+    cold = SQLiteDeltaSaver(path, snapshot_every=snapshot_every)
+    start = time.perf_counter()
+    messages = cold.get_tuple(config).checkpoint["channel_values"]["messages"]
+    cold_ms = (time.perf_counter() - start) * 1000
+    assert len(messages) == 2 * turns
+    cold.close()
+
+    return {
+        "amplification": saver.bytes_written / payload,
+        "db_mb": os.path.getsize(path) / 1e6,
+        "steps_per_s": threads * turns / write_s,
+        "hot_ms": hot_ms,
+        "cold_ms": cold_ms,
+    }
+
+
+def main(threads: int = 20, turns: int = 50):
+    print(f"threads={threads} turns={turns}")
+    print(f"{'storage':>18} {'write amp':>10} {'db MB':>8} {'turns/s':>9} {'resume hot':>11} {'resume cold':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, snapshot_every in (("full snapshots", 1), ("message deltas", 32)):
+            result = run(os.path.join(tmp, f"{snapshot_every}.db"), snapshot_every, threads, turns)
+            print(
+                f"{name:>18} {result['amplification']:>9.1f}x {result['db_mb']:>8.2f} "
+                f"{result['steps_per_s']:>9.1f} {result['hot_ms']:>9.2f}ms {result['cold_ms']:>10.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,447 @@
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    value BLOB,
+    base_version TEXT,
+    depth INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_threads_last_access ON threads (last_access);
+"""
+
+
+def same_item(a: Any, b: Any) -> bool:
+    """
+    Items are compared by value, not by message id: `add_messages` replaces
+    a message that reuses an existing id, and that edit must reach the disk.
+    """
+    return a is b or a == b
+
+
+class SQLiteDeltaSaver(BaseCheckpointSaver[str]):
+    """
+    Disk-backed LangGraph checkpointer that stores list channels as deltas.
+
+    Only channels that changed in a step are written (as LangGraph already
+    reports through `new_versions`). On top of that, a list channel such as
+    `messages` whose previous version is a prefix of the new one is stored
+    as just the appended items plus a pointer to its base version; a full
+    snapshot is written every `snapshot_every` deltas to bound resume cost.
+
+    - path: SQLite file (WAL mode)
+    - snapshot_every: longest delta chain before a full snapshot
+    - max_hot_threads: threads whose latest channel values stay in memory
+    - ttl_seconds: threads not read (get_tuple) or written for longer than
+      this are deleted (None = never)
+    """
+
+    def __init__(
+        self,
+        path: str = "checkpoints.db",
+        snapshot_every: int = 32,
+        max_hot_threads: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        evict_every: int = 1000,
+        **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self.snapshot_every = snapshot_every
+        self.max_hot_threads = max_hot_threads
+        self.ttl_seconds = ttl_seconds
+        self.evict_every = evict_every
+        self.bytes_written = 0
+        self._puts = 0
+        # thread_id -> {(checkpoint_ns, channel): (version, value, depth)}
+        self._hot: "OrderedDict[str, Dict[Tuple[str, str], Tuple[str, Any, int]]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    # ----- hot cache -----
+
+    def _hot_thread(self, thread_id: str) -> Dict[Tuple[str, str], Tuple[str, Any, int]]:
+        entry = self._hot.get(thread_id)
+        if entry is None:
+            entry = self._hot[thread_id] = {}
+        self._hot.move_to_end(thread_id)
+        while len(self._hot) > self.max_hot_threads:
+            self._hot.popitem(last=False)
+        return entry
+
+    def _touch(self, thread_id: str):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO threads (thread_id, last_access) VALUES (?, ?)",
+            (thread_id, time.time()),
+        )
+
+    # ----- channel values -----
+
+    def _load_channel(self, thread_id: str, checkpoint_ns: str, channel: str, version: str) -> Tuple[bool, Any]:
+        hot = self._hot.get(thread_id, {}).get((checkpoint_ns, channel))
+        if hot is not None and hot[0] == version:
+            value = hot[1]
+            return True, list(value) if isinstance(value, list) else value
+
+        # Walk the delta chain back to the nearest full snapshot
+        suffixes: List[list] = []
+        current: Optional[str] = version
+        while current is not None:
+            row = self.conn.execute(
+                "SELECT type, value, base_version FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, current),
+            ).fetchone()
+            if row is None:
+                return False, None
+            type_, blob, base_version = row
+            if type_ == "empty":
+                return False, None
+            value = self.serde.loads_typed((type_, blob))
+            if base_version is None:
+                for suffix in reversed(suffixes):
+                    value = value + suffix
+                return True, value
+            suffixes.append(value)
+            current = base_version
+        return False, None
+
+    def _load_blobs(self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions) -> Dict[str, Any]:
+        channel_values: Dict[str, Any] = {}
+        for channel, version in versions.items():
+            found, value = self._load_channel(thread_id, checkpoint_ns, channel, str(version))
+            if found:
+                channel_values[channel] = value
+        return channel_values
+
+    def _store_channel(self, thread_id: str, checkpoint_ns: str, channel: str, version: str, values: Dict[str, Any]):
+        hot = self._hot_thread(thread_id)
+
+        if channel not in values:
+            row = (thread_id, checkpoint_ns, channel, version, "empty", b"", None, 0)
+        else:
+            value = values[channel]
+            previous = hot.get((checkpoint_ns, channel))
+            base_version, depth, payload = None, 0, value
+
+            if (
+                isinstance(value, list)
+                and previous is not None
+                and isinstance(previous[1], list)
+                and previous[2] + 1 < self.snapshot_every
+                and len(previous[1]) <= len(value)
+                and all(same_item(a, b) for a, b in zip(previous[1], value))
+            ):
+                base_version, depth, payload = previous[0], previous[2] + 1, value[len(previous[1]):]
+
+            type_, blob = self.serde.dumps_typed(payload)
+            row = (thread_id, checkpoint_ns, channel, version, type_, blob, base_version, depth)
+            hot[(checkpoint_ns, channel)] = (version, list(value) if isinstance(value, list) else value, depth)
+
+        self.bytes_written += len(row[5])
+        self.conn.execute(
+            "INSERT OR REPLACE INTO blobs "
+            "(thread_id, checkpoint_ns, channel, version, type, value, base_version, depth) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            row,
+        )
+
+    # ----- BaseCheckpointSaver -----
+
+    def _tuple_from_row(self, thread_id: str, checkpoint_ns: str, row) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, type_, blob, metadata_type, metadata_blob = row
+        checkpoint: Checkpoint = self.serde.loads_typed((type_, blob))
+        writes = self.conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_blobs(thread_id, checkpoint_ns, checkpoint["channel_versions"]),
+            },
+            metadata=self.serde.loads_typed((metadata_type, metadata_blob)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((w_type, w_value)))
+                for task_id, channel, w_type, w_value in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id: str = config["configurable"]["thread_id"]
+        checkpoint_ns: str = config["configurable"].get("checkpoint_ns", "")
+        columns = "checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata"
+
+        with self._lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self.conn.execute(
+                    f"SELECT {columns} FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self.conn.execute(
+                    f"SELECT {columns} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            # Resuming a thread counts as activity for the LRU and the TTL
+            if thread_id in self._hot:
+                self._hot.move_to_end(thread_id)
+            self._touch(thread_id)
+            self.conn.commit()
+            return self._tuple_from_row(thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, "
+            "checkpoint, metadata_type, metadata FROM checkpoints"
+        )
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+
+        for thread_id, checkpoint_ns, *row in rows:
+            if limit is not None and limit <= 0:
+                break
+            with self._lock:
+                item = self._tuple_from_row(thread_id, checkpoint_ns, row)
+            if filter and not all(item.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            if limit is not None:
+                limit -= 1
+            yield item
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        c = checkpoint.copy()
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        values: Dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
+
+        with self._lock:
+            for channel, version in new_versions.items():
+                self._store_channel(thread_id, checkpoint_ns, channel, str(version), values)
+
+            type_, blob = self.serde.dumps_typed(c)
+            metadata_type, metadata_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+            self.bytes_written += len(blob) + len(metadata_blob)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO checkpoints "
+                "(thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    type_,
+                    blob,
+                    metadata_type,
+                    metadata_blob,
+                ),
+            )
+            self._touch(thread_id)
+            self.conn.commit()
+
+            self._puts += 1
+            if self.ttl_seconds is not None and self._puts % self.evict_every == 0:
+                self.evict_idle_threads()
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        # Special writes (errors, interrupts, ...) replace; regular writes are idempotent
+        verb = "INSERT OR REPLACE" if all(w[0] in WRITES_IDX_MAP for w in writes) else "INSERT OR IGNORE"
+
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, blob = self.serde.dumps_typed(value)
+            self.bytes_written += len(blob)
+            rows.append((
+                thread_id, checkpoint_ns, checkpoint_id, task_id,
+                WRITES_IDX_MAP.get(channel, idx), channel, type_, blob, task_path,
+            ))
+
+        with self._lock:
+            self.conn.executemany(
+                f"{verb} INTO writes "
+                "(thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, task_path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.commit()
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            for table in ("checkpoints", "blobs", "writes", "threads"):
+                self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            self.conn.commit()
+            self._hot.pop(thread_id, None)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path: str = "") -> None:
+        return self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return self.delete_thread(thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # ----- maintenance -----
+
+    def evict_idle_threads(self, ttl_seconds: Optional[float] = None) -> List[str]:
+        """Delete every thread not written to within the TTL; return their ids."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl is None:
+            return []
+        with self._lock:
+            idle = [
+                thread_id
+                for (thread_id,) in self.conn.execute(
+                    "SELECT thread_id FROM threads WHERE last_access < ?", (time.time() - ttl,)
+                )
+            ]
+            for thread_id in idle:
+                self.delete_thread(thread_id)
+        return idle
+
+    def clear_hot_cache(self):
+        with self._lock:
+            self._hot.clear()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
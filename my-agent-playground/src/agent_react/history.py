@@ -0,0 +1,294 @@
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Annotated, Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from typing_extensions import NotRequired, TypedDict
+
+from langchain.agents.middleware import AgentMiddleware, AgentState, ModelRequest, ModelResponse
+from langchain.agents.middleware.types import PrivateStateAttr
+from langchain_core.messages import AnyMessage, HumanMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.config import get_config
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:"
+
+SUMMARY_PROMPT = """You keep a running summary of a conversation between a user and an assistant.
+Update the summary below with the new messages. Keep facts the assistant may need later
+(names, locations, tool results, decisions) and drop small talk. Reply with the summary only.
+
+Current summary:
+{summary}
+
+New messages:
+{messages}"""
+
+
+class StoredSummary(TypedDict):
+    covered: int
+    text: str
+
+
+class HistoryState(AgentState):
+    """Agent state plus the thread's rolling summary, checkpointed with it."""
+    history_summary: NotRequired[Annotated[Optional[StoredSummary], PrivateStateAttr]]
+
+
+@dataclass
+class CompactionReport:
+    """What compaction did to the prompt of one model call."""
+    thread_id: Optional[str]
+    messages_before: int
+    messages_after: int
+    tokens_before: int
+    tokens_after: int
+    summarized: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+def print_report(report: CompactionReport):
+    print(
+        f"[history] {report.messages_before} -> {report.messages_after} messages, "
+        f"{report.tokens_before} -> {report.tokens_after} prompt tokens "
+        f"(saved {report.tokens_saved}, {report.summarized} summarized)"
+    )
+
+
+def is_safe_cutoff(messages: Sequence[AnyMessage], index: int) -> bool:
+    """
+    Whether history can start at `index` without orphaning tool results.
+
+    A ToolMessage must follow the AIMessage that requested it, so a window
+    may never start on one; starting right after a complete AI/tool group
+    is fine.
+    """
+    return index >= len(messages) or not isinstance(messages[index], ToolMessage)
+
+
+def next_safe_cutoff(messages: Sequence[AnyMessage], index: int) -> int:
+    """First safe window start at or after `index`."""
+    while not is_safe_cutoff(messages, index):
+        index += 1
+    return index
+
+
+def format_transcript(messages: Sequence[AnyMessage]) -> str:
+    lines = []
+    for message in messages:
+        text = message.text if isinstance(message.content, list) else message.content
+        for call in getattr(message, "tool_calls", None) or []:
+            text = f"{text} [called {call['name']}({call['args']})]".strip()
+        lines.append(f"{message.type}: {text}")
+    return "\n".join(lines)
+
+
+class HistoryCompactionMiddleware(AgentMiddleware):
+    """
+    Send the model a compact view of the thread instead of its full history.
+
+    The checkpointed state keeps every message; only the prompt is compacted:
+
+    - max_messages: sliding window over the most recent messages
+    - max_tokens: drop the oldest messages until the prompt fits the budget
+    - summary_model: fold the dropped messages into a rolling summary that
+      is sent as the first message of the window
+
+    Summaries are written in a background thread. Messages the current
+    summary does not cover yet are never dropped: the window keeps them
+    until the background summary lands, and only when the token budget
+    forces them out does the turn wait and summarize them first. A
+    finished summary is saved in the `history_summary` state channel at the
+    next model step, so it survives a restart with the checkpointed thread;
+    in memory only the `max_threads` most recent threads are kept. Window
+    starts are moved forward so an AIMessage with tool calls and its
+    ToolMessages are always kept or dropped together.
+
+    Every model call produces a CompactionReport, passed to `on_report`
+    (e.g. `print_report`) and kept in `reports`, which holds the last
+    `max_reports`.
+    """
+
+    state_schema = HistoryState
+
+    def __init__(
+        self,
+        max_messages: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        summary_model=None,
+        min_messages_to_summarize: int = 4,
+        token_counter: Callable[[Sequence[AnyMessage]], int] = count_tokens_approximately,
+        on_report: Optional[Callable[[CompactionReport], None]] = None,
+        max_threads: int = 1024,
+        max_reports: int = 1000,
+    ):
+        super().__init__()
+        self.max_messages = max_messages
+        self.max_tokens = max_tokens
+        self.summary_model = summary_model
+        self.min_messages_to_summarize = min_messages_to_summarize
+        self.token_counter = token_counter
+        self.on_report = on_report
+        self.max_threads = max_threads
+        self.reports: Deque[CompactionReport] = deque(maxlen=max_reports)
+        # thread_id -> (number of leading messages covered, summary text), LRU
+        self._summaries: "OrderedDict[Optional[str], Tuple[int, str]]" = OrderedDict()
+        self._pending: Dict[Optional[str], Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-summary")
+
+    def compact(
+        self, messages: List[AnyMessage], thread_id: Optional[str] = None, system_tokens: int = 0
+    ) -> Tuple[List[AnyMessage], CompactionReport]:
+        """Return the messages to send and a report of what was dropped."""
+        start = 0
+        if self.max_messages is not None and len(messages) > self.max_messages:
+            start = next_safe_cutoff(messages, len(messages) - self.max_messages)
+
+        with self._lock:
+            covered, summary = self._summaries.get(thread_id, (0, ""))
+        if self.summary_model is not None:
+            if start > covered:
+                self._schedule_summary(thread_id, messages[:start])
+            # Only what the summary covers may leave the window
+            start = covered
+
+        def uses_summary(start: int) -> bool:
+            return start > 0 and bool(summary) and covered <= start
+
+        def view(start: int) -> List[AnyMessage]:
+            if not uses_summary(start):
+                return messages[start:]
+            return [HumanMessage(f"{SUMMARY_PREFIX}\n{summary}"), *messages[start:]]
+
+        compacted = view(start)
+        if self.max_tokens is not None:
+            # Always keep the last message, even if it alone is over budget
+            while system_tokens + self.token_counter(compacted) > self.max_tokens:
+                candidate = next_safe_cutoff(messages, start + 1)
+                if candidate >= len(messages):
+                    break
+                start = candidate
+                compacted = view(start)
+            if self.summary_model is not None and start > covered:
+                # The budget dropped messages the summary doesn't cover yet
+                covered, summary = self._summarize_now(thread_id, messages[:start])
+                compacted = view(start)
+
+        report = CompactionReport(
+            thread_id=thread_id,
+            messages_before=len(messages),
+            messages_after=len(compacted),
+            tokens_before=system_tokens + self.token_counter(messages),
+            tokens_after=system_tokens + self.token_counter(compacted),
+            summarized=covered if uses_summary(start) else 0,
+        )
+        return compacted, report
+
+    def _set_summary(self, thread_id: Optional[str], covered: int, text: str):
+        """Store a summary and evict the least recently used threads; call with the lock held."""
+        self._summaries[thread_id] = (covered, text)
+        self._summaries.move_to_end(thread_id)
+        while len(self._summaries) > self.max_threads:
+            self._summaries.popitem(last=False)
+
+    def sync_summary(self, thread_id: Optional[str], stored: Optional[StoredSummary]) -> Optional[StoredSummary]:
+        """
+        Reconcile the in-memory summary of a thread with the checkpointed one.
+
+        A stored summary that is newer (after a restart or an eviction) is
+        loaded into memory; a newer in-memory one is returned so it can be
+        written to the state.
+        """
+        with self._lock:
+            covered, text = self._summaries.get(thread_id, (0, ""))
+            if stored and stored["covered"] > covered:
+                self._set_summary(thread_id, stored["covered"], stored["text"])
+                return None
+            if text and (not stored or covered > stored["covered"]):
+                return {"covered": covered, "text": text}
+            if thread_id in self._summaries:
+                self._summaries.move_to_end(thread_id)
+            return None
+
+    def summary(self, thread_id: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            return self._summaries.get(thread_id, (0, None))[1]
+
+    def wait_for_summaries(self, timeout: Optional[float] = None):
+        """Block until background summaries scheduled so far are written."""
+        with self._lock:
+            pending = list(self._pending.values())
+        for future in pending:
+            future.result(timeout=timeout)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def _schedule_summary(self, thread_id: Optional[str], dropped: List[AnyMessage]):
+        with self._lock:
+            covered, _ = self._summaries.get(thread_id, (0, ""))
+            if len(dropped) - covered < self.min_messages_to_summarize:
+                return
+            pending = self._pending.get(thread_id)
+            if pending is not None and not pending.done():
+                return
+            self._pending[thread_id] = self._executor.submit(self._summarize, thread_id, dropped)
+
+    def _summarize(self, thread_id: Optional[str], dropped: List[AnyMessage]):
+        try:
+            self._write_summary(thread_id, dropped)
+        finally:
+            with self._lock:
+                self._pending.pop(thread_id, None)
+
+    def _summarize_now(self, thread_id: Optional[str], dropped: List[AnyMessage]) -> Tuple[int, str]:
+        """Summarize `dropped` in this thread (after any pending summary); returns (covered, text)."""
+        with self._lock:
+            pending = self._pending.get(thread_id)
+        if pending is not None:
+            pending.result()
+        with self._lock:
+            covered, _ = self._summaries.get(thread_id, (0, ""))
+        if covered < len(dropped):
+            self._write_summary(thread_id, dropped)
+        with self._lock:
+            return self._summaries.get(thread_id, (0, ""))
+
+    def _write_summary(self, thread_id: Optional[str], dropped: List[AnyMessage]):
+        with self._lock:
+            covered, summary = self._summaries.get(thread_id, (0, ""))
+        prompt = SUMMARY_PROMPT.format(
+            summary=summary or "(empty)", messages=format_transcript(dropped[covered:])
+        )
+        response = self.summary_model.invoke([HumanMessage(prompt)])
+        with self._lock:
+            self._set_summary(thread_id, len(dropped), response.text.strip())
+
+    def before_model(self, state: HistoryState, runtime) -> Optional[Dict[str, Any]]:
+        thread_id = get_config().get("configurable", {}).get("thread_id")
+        newer = self.sync_summary(thread_id, state.get("history_summary"))
+        return {"history_summary": newer} if newer is not None else None
+
+    async def abefore_model(self, state: HistoryState, runtime) -> Optional[Dict[str, Any]]:
+        return self.before_model(state, runtime)
+
+    def _prepare(self, request: ModelRequest) -> ModelRequest:
+        thread_id = get_config().get("configurable", {}).get("thread_id")
+        system_tokens = self.token_counter([request.system_message]) if request.system_message else 0
+        messages, report = self.compact(list(request.messages), thread_id, system_tokens)
+        self.reports.append(report)
+        if self.on_report is not None:
+            self.on_report(report)
+        return request.override(messages=messages)
+
+    def wrap_model_call(
+        self, request: ModelRequest, handler: Callable[[ModelRequest], ModelResponse]
+    ) -> ModelResponse:
+        return handler(self._prepare(request))
+
+    async def awrap_model_call(self, request: ModelRequest, handler) -> ModelResponse:
+        return await handler(self._prepare(request))
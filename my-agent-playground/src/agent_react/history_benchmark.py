@@ -0,0 +1,110 @@
+"""
+Prompt size of a long agent_react thread with and without compaction.
+
+Run with:
+
+    python -m src.agent_react.history_benchmark
+
+A scripted chat model stands in for OpenAI: every user turn it calls
+get_weather_for_location, then answers. The same conversation is replayed
+with the full history, a sliding window, a token budget, and a window plus
+rolling summary, and the prompt tokens the model received are compared.
+"""
+
+import time
+from typing import Any, List, Optional
+
+from langchain.agents import create_agent
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.checkpoint.memory import InMemorySaver
+
+from .history import HistoryCompactionMiddleware
+from .tools import get_weather_for_location
+
+TURNS = 40
+CITIES = ["Lisbon", "Recife", "Tampa", "Osaka", "Nairobi"]
+SYSTEM_PROMPT = "You are an expert weather forecaster, who speaks in puns."
+ANSWER = "Looks like the forecast is sun-believable today, so don't cloud your judgement! " * 3
+
+
+class ScriptedWeatherModel(BaseChatModel):
+    """Calls the weather tool for each new question, then answers."""
+
+    prompt_tokens: List[int] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-weather"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        self.prompt_tokens.append(count_tokens_approximately(messages))
+        last = messages[-1]
+        if isinstance(last, HumanMessage) and "running summary" not in last.content:
+            city = CITIES[len(self.prompt_tokens) % len(CITIES)]
+            message = AIMessage(
+                "",
+                tool_calls=[{
+                    "name": "get_weather_for_location",
+                    "args": {"city": city},
+                    "id": f"call_{len(self.prompt_tokens)}",
+                }],
+            )
+        elif isinstance(last, ToolMessage):
+            message = AIMessage(ANSWER)
+        else:
+            message = AIMessage("The user asked about the weather in several cities; it was sunny everywhere.")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def run(label: str, middleware: Optional[HistoryCompactionMiddleware]):
+    model = ScriptedWeatherModel(prompt_tokens=[])
+    agent = create_agent(
+        model=model,
+        system_prompt=SYSTEM_PROMPT,
+        tools=[get_weather_for_location],
+        middleware=[middleware] if middleware is not None else [],
+        checkpointer=InMemorySaver(),
+    )
+    config = {"configurable": {"thread_id": "benchmark"}}
+
+    start = time.perf_counter()
+    for turn in range(TURNS):
+        agent.invoke({"messages": [{"role": "user", "content": f"What's the weather like? ({turn})"}]}, config=config)
+        if middleware is not None and middleware.summary_model is not None:
+            middleware.wait_for_summaries()
+    elapsed = time.perf_counter() - start
+    if middleware is not None:
+        middleware.close()
+
+    tokens = model.prompt_tokens
+    print(
+        f"{label:<18} total {sum(tokens):>8} prompt tokens, "
+        f"last call {tokens[-1]:>6}, max {max(tokens):>6}, {elapsed * 1000:.0f} ms"
+    )
+    return sum(tokens)
+
+
+def main():
+    print(f"{TURNS} turns, 2 model calls per turn\n")
+    baseline = run("full history", None)
+    variants = [
+        ("window=12", HistoryCompactionMiddleware(max_messages=12)),
+        ("budget=1500", HistoryCompactionMiddleware(max_tokens=1500)),
+        (
+            "window+summary",
+            HistoryCompactionMiddleware(max_messages=12, summary_model=ScriptedWeatherModel(prompt_tokens=[])),
+        ),
+    ]
+    for label, middleware in variants:
+        total = run(label, middleware)
+        print(f"{'':<18} saved {1 - total / baseline:.0%} of prompt tokens")
+
+
+if __name__ == "__main__":
+    main()
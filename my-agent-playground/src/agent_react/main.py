@@ -6,13 +6,13 @@ load_dotenv()
 from langchain.chat_models import init_chat_model
 
 from langchain.agents import create_agent
+from ..agent_examples.tool_cache import tool_cache_stats
 from .tools import Context, get_weather_for_location, get_user_location
 
 from dataclasses import dataclass
-from langgraph.checkpoint.memory import InMemorySaver
 from langchain.agents.structured_output import ToolStrategy
-
-checkpointer = InMemorySaver()
+from .checkpointer import SQLiteDeltaSaver
+from .history import HistoryCompactionMiddleware, print_report
 
 SYSTEM_PROMPT = """You are an expert weather forecaster, who speaks in puns.
 
@@ -41,13 +41,28 @@ def main():
         base_url=os.environ.get("BASE_URL"),
         default_headers={"FlowAgent": "Flow Api"})
 
+    # Prompt compaction: HISTORY_MAX_MESSAGES / HISTORY_MAX_TOKENS bound what is
+    # resent each turn; HISTORY_SUMMARY=1 summarizes the dropped turns.
+    history = HistoryCompactionMiddleware(
+        max_messages=int(os.environ["HISTORY_MAX_MESSAGES"]) if os.environ.get("HISTORY_MAX_MESSAGES") else None,
+        max_tokens=int(os.environ["HISTORY_MAX_TOKENS"]) if os.environ.get("HISTORY_MAX_TOKENS") else None,
+        summary_model=model if os.environ.get("HISTORY_SUMMARY") == "1" else None,
+        on_report=print_report,
+    )
+
+    checkpointer = SQLiteDeltaSaver(
+        os.environ.get("CHECKPOINT_DB", "checkpoints.db"),
+        ttl_seconds=float(os.environ["CHECKPOINT_TTL"]) if os.environ.get("CHECKPOINT_TTL") else None,
+    )
+
     agent = create_agent(
         model=model,
         system_prompt=SYSTEM_PROMPT,
         tools=[get_user_location, get_weather_for_location],
         context_schema=Context,
         response_format=ToolStrategy(ResponseFormat),
-        checkpointer=checkpointer
+        checkpointer=checkpointer,
+        middleware=[history],
     )
 
     config = {"configurable": {"thread_id": "1"}}
@@ -70,6 +85,9 @@ def main():
 
     print(response)
 
+    history.close()
+    checkpointer.close()
+    print("Tool cache:", tool_cache_stats())
 
 
 if __name__ == "__main__":
@@ -1,6 +1,9 @@
 from dataclasses import dataclass
 from langchain.tools import tool, ToolRuntime
 
+from ..agent_examples.tool_cache import cached_tool
+
+@cached_tool(ttl_seconds=600, stale_seconds=1800)
 @tool
 def get_weather_for_location(city: str) -> str:
     """Get weather for a given city."""
@@ -11,6 +14,8 @@ class Context:
     """Custom runtime context schema."""
     user_id: str
 
+# The runtime is injected per call, so key on the user it belongs to
+@cached_tool(ttl_seconds=3600, key=lambda runtime: runtime.context.user_id)
 @tool
 def get_user_location(runtime: ToolRuntime[Context]) -> str:
     """Retrieve user information based on user ID."""
@@ -6,6 +6,8 @@ from pydantic import BaseModel, Field
 from typing import List
 from langchain.agents.structured_output import ToolStrategy
 
+from ..agent_examples.cache import configure_response_cache
+
 class CityInfo(BaseModel):
     """City's geographic information"""
     name: str = Field(description="The name of the city")
@@ -17,6 +19,8 @@ class CitiesResponse(BaseModel):
 load_dotenv()
 
 def main():
+    configure_response_cache()
+
     model = init_chat_model(
         "gpt-4o-mini",
         temperature=0.5,
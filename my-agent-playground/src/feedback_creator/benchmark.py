@@ -0,0 +1,69 @@
+"""
+Benchmark generate_feedback_csv against a fake agent with injected latency.
+
+Run with:
+
+    python -m src.feedback_creator.benchmark
+
+Every fake call sleeps for a fixed latency, so wall clock is dominated by
+"network" wait and should shrink almost linearly with max_concurrency.
+"""
+
+import csv
+import tempfile
+import time
+from pathlib import Path
+
+from .utils import FeedbackResponse, generate_feedback_csv
+
+
+class FakeFeedbackAgent:
+    """Stand-in for the LangChain agent that only sleeps and echoes."""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+
+    def invoke(self, data):
+        time.sleep(self.latency)
+        return {"structured_response": FeedbackResponse(feedback="Obrigado!")}
+
+
+def write_roster(path: Path, rows: int):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["name", "positive experience"])
+        writer.writeheader()
+        for i in range(rows):
+            writer.writerow({"name": f"Pessoa {i}", "positive experience": "Muito carinho"})
+
+
+def run_once(input_csv: Path, output_csv: Path, agent, max_concurrency: int) -> float:
+    start = time.perf_counter()
+    generate_feedback_csv(
+        input_csv_path=input_csv,
+        output_csv_path=output_csv,
+        agent=agent,
+        max_concurrency=max_concurrency,
+        resume=False,
+    )
+    return time.perf_counter() - start
+
+
+def main(rows: int = 64, latency: float = 0.05, levels=(1, 2, 4, 8, 16, 32)):
+    agent = FakeFeedbackAgent(latency=latency)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_csv = Path(tmp) / "input.csv"
+        output_csv = Path(tmp) / "output.csv"
+        write_roster(input_csv, rows)
+
+        results = [(level, run_once(input_csv, output_csv, agent, level)) for level in levels]
+
+    baseline = results[0][1]
+    print(f"\nrows={rows} latency={latency * 1000:.0f}ms")
+    print(f"{'concurrency':>12} {'seconds':>9} {'rows/s':>9} {'speedup':>8}")
+    for level, elapsed in results:
+        print(f"{level:>12} {elapsed:>9.3f} {rows / elapsed:>9.1f} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
+import os
+
+from ..agent_examples.usage import UsageLedger
 from .utils import create_feedback_agent, generate_feedback_csv
 from pathlib import Path
 
 
+def print_progress(done: int, total: int):
+    print(f"[{done}/{total}] linhas processadas")
+
+
 def main():
     agent = create_feedback_agent()
 
@@ -9,6 +16,11 @@ def main():
     input_csv = base_path / "file.csv"
     output_csv = base_path / "output.csv"
 
+    # FEEDBACK_BUDGET_USD stops the run once the estimated spend reaches it;
+    # USAGE_LOG collects usage from every run and process in one JSONL file
+    budget = os.environ.get("FEEDBACK_BUDGET_USD")
+    usage = UsageLedger(path=os.environ.get("USAGE_LOG"), budget_usd=float(budget) if budget else None)
+
     generate_feedback_csv(
         input_csv_path=input_csv,
         output_csv_path=output_csv,
@@ -16,9 +28,13 @@ def main():
         name_column="name",
         experience_column="positive experience",
         feedback_column="feedback",
+        max_concurrency=int(os.environ.get("FEEDBACK_MAX_CONCURRENCY", "4")),
+        on_progress=print_progress,
+        usage=usage,
     )
 
     print(f"Arquivo gerado: {output_csv}")
+    usage.print_summary()
 
 
 if __name__ == "__main__":
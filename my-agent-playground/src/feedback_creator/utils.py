@@ -1,5 +1,9 @@
+import hashlib
+import json
 import os
-from typing import List, Optional, cast
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Tuple, cast
 
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
@@ -11,6 +15,9 @@ from pathlib import Path
 
 import csv
 
+from ..agent_examples.cache import configure_response_cache
+from ..agent_examples.usage import UsageLedger
+
 
 class FeedbackResponse(BaseModel):
     """LLM-generated feedback text for a person."""
@@ -25,6 +32,7 @@ class FeedbackResponse(BaseModel):
 def create_feedback_agent():
     """Create and return a LangChain agent that outputs a FeedbackResponse."""
     load_dotenv()
+    configure_response_cache()
 
     model = init_chat_model(
         "gpt-4o-mini",
@@ -41,6 +49,133 @@ def create_feedback_agent():
     return agent
 
 
+PROMPT_TEMPLATE = """
+Você é responsável por escrever pequenos textos de agradecimento para a equipe de uma escola infantil montessoriana.
+
+A partir das informações abaixo, escreva um pequeno texto de feedback em nome da família do Keita.
+para a pessoa mencionada, para ser entregue como um cartão de agradecimento.
+
+Regras:
+- Escreva em português do Brasil.
+- Use 2 a 4 frases.
+- Seja carinhoso e afetuoso, pois são pessoas muito queridas.
+- A mensagem deve ser direcionado ao agradecimento e felicitações para as festas natalinas e ano novo.
+- A mensagem deve conter agradecimentos se houver.
+- Caso não tenha muitas informações deixe a mensagem um pouco mais genérica.
+- Não invente fatos novos, apenas reformule e organize o que já está dito.
+- Se o texto original estiver confuso ou com erros de digitação, corrija na sua resposta.
+- Use o nome da pessoa no texto pelo menos uma vez.
+
+Dados:
+- Nome: {name}
+- Experiência positiva: {experience}
+"""
+
+
+def build_feedback_prompt(name: str, experience: str) -> str:
+    """Render the feedback prompt for a single person."""
+    return PROMPT_TEMPLATE.format(name=name, experience=experience).strip()
+
+
+def generate_feedback(agent, name: str, experience: str, usage: Optional[UsageLedger] = None) -> str:
+    """
+    Call the agent once and return the generated feedback text.
+
+    An empty experience short-circuits to an empty feedback, and any agent
+    error is returned as the feedback text so one bad row never aborts a run.
+    Token usage of every model call is recorded in `usage` under "feedback".
+    """
+    # If there's no experience text, just leave feedback empty
+    if not experience:
+        return ""
+
+    try:
+        response = agent.invoke(
+            {
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": build_feedback_prompt(name, experience),
+                    }
+                ]
+            }
+        )
+        if usage is not None:
+            usage.add_response(response, stage="feedback")
+
+        structured = cast(FeedbackResponse, response["structured_response"])
+        return (structured.feedback or "").strip()
+
+    except Exception as e:
+        return f"Erro ao gerar feedback: {e}"
+
+
+def map_ordered(
+    fn: Callable[[dict], dict],
+    items: Iterable[dict],
+    max_concurrency: int = 1,
+) -> Iterator[dict]:
+    """
+    Apply `fn` to every item with at most `max_concurrency` calls in flight.
+
+    Results are yielded in input order. Items are pulled from `items` lazily,
+    so only a bounded window of rows is held in memory at any time.
+    """
+    if max_concurrency <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        pending: Deque[Future] = deque()
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            # Keep the pool saturated but never buffer more than two rounds
+            if len(pending) >= max_concurrency * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def journal_path_for(output_csv_path: Path) -> Path:
+    """Return the checkpoint journal path that sits next to the output CSV."""
+    return output_csv_path.with_name(output_csv_path.name + ".journal")
+
+
+def input_fingerprint(input_csv_path: Path, fieldnames: List[str]) -> dict:
+    """Identify the input a journal belongs to: content hash plus output columns."""
+    digest = hashlib.sha256()
+    with open(input_csv_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {"sha256": digest.hexdigest(), "fieldnames": fieldnames}
+
+
+def read_journal(journal_path: Path, fingerprint: Optional[dict] = None) -> Tuple[int, int]:
+    """
+    Return (rows_done, byte_offset) from a checkpoint journal.
+
+    A missing or unreadable journal, or one written for another input
+    (`fingerprint` differs), means nothing has been committed yet.
+    """
+    try:
+        data = json.loads(journal_path.read_text(encoding="utf-8"))
+        if data.get("input") != fingerprint:
+            return 0, 0
+        return int(data["rows"]), int(data["offset"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return 0, 0
+
+
+def write_journal(journal_path: Path, rows_done: int, offset: int, fingerprint: Optional[dict] = None):
+    """Atomically record how many rows (and bytes) of output are committed."""
+    tmp_path = journal_path.with_name(journal_path.name + ".tmp")
+    tmp_path.write_text(
+        json.dumps({"rows": rows_done, "offset": offset, "input": fingerprint}), encoding="utf-8"
+    )
+    os.replace(tmp_path, journal_path)
+
+
 def generate_feedback_csv(
     input_csv_path: str,
     output_csv_path: str,
@@ -48,9 +183,22 @@ def generate_feedback_csv(
     name_column: str = "name",
     experience_column: str = "positive experience",
     feedback_column: str = "feedback",
+    max_concurrency: int = 1,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    resume: bool = True,
+    flush_every: int = 1,
+    usage: Optional[UsageLedger] = None,
 ):
     """
-    Read input CSV, call LLM for each row, and write output CSV with feedback.
+    Read input CSV, call LLM for each row, and stream output CSV with feedback.
+
+    Finished rows are appended to the output as they complete, and a small
+    journal (`<output>.journal`) records how many rows are safely on disk.
+    A rerun after a crash truncates any half-written tail and continues from
+    the first uncommitted row, so earlier LLM results are never paid twice.
+    The journal is tied to the input's content hash and columns: if the input
+    changed, the run starts over. The journal is kept after a complete run,
+    so rerunning on the same input is a no-op that leaves the output as is.
 
     - input_csv_path: path to the original CSV
     - output_csv_path: path where the completed CSV will be written
@@ -58,76 +206,75 @@ def generate_feedback_csv(
     - name_column: column with the person's name
     - experience_column: column with the positive experience text
     - feedback_column: column where we will write the generated feedback
+    - max_concurrency: maximum number of agent calls in flight at once
+    - on_progress: optional callback called as on_progress(done, total)
+    - resume: continue from the journal instead of starting over
+    - flush_every: number of rows written between fsync + journal updates (>= 1)
+    - usage: optional UsageLedger that sums tokens and cost over all rows;
+      once its budget is spent no new rows are started and
+      UsageBudgetExceeded is raised after committing the finished ones,
+      so a rerun with a new budget resumes where it stopped
     """
+    if flush_every < 1:
+        raise ValueError(f"flush_every must be at least 1, got {flush_every}")
+
     input_csv_path = Path(input_csv_path)
     output_csv_path = Path(output_csv_path)
+    journal_path = journal_path_for(output_csv_path)
 
-    with open(input_csv_path, "r", encoding="utf-8") as f_in:
-        reader = csv.DictReader(f_in)
-        fieldnames = list(reader.fieldnames or [])
+    with open(input_csv_path, "r", encoding="utf-8") as f_count:
+        counter = csv.DictReader(f_count)
+        total = sum(1 for _ in counter)
+        fieldnames = list(counter.fieldnames or [])
 
-        # Ensure feedback column exists
-        if feedback_column not in fieldnames:
-            fieldnames.append(feedback_column)
+    # Ensure feedback column exists
+    if feedback_column not in fieldnames:
+        fieldnames.append(feedback_column)
 
-        rows_out: List[dict] = []
+    fingerprint = input_fingerprint(input_csv_path, fieldnames)
+    rows_done, offset = read_journal(journal_path, fingerprint) if resume else (0, 0)
+    if rows_done and not output_csv_path.exists():
+        rows_done, offset = 0, 0
+    if rows_done:
+        print(f"Retomando {output_csv_path}: {rows_done} de {total} linhas já processadas foram puladas")
 
-        for row in reader:
-            name = (row.get(name_column) or "").strip()
-            experience = (row.get(experience_column) or "").strip()
+    def process(row: dict) -> dict:
+        if usage is not None:
+            usage.ensure_budget()
+        name = (row.get(name_column) or "").strip()
+        experience = (row.get(experience_column) or "").strip()
+        row[feedback_column] = generate_feedback(agent, name, experience, usage)
+        return row
 
-            # If there's no experience text, just leave feedback empty
-            if not experience:
-                row[feedback_column] = ""
-                rows_out.append(row)
-                continue
+    with open(input_csv_path, "r", encoding="utf-8") as f_in:
+        reader = csv.DictReader(f_in)
 
-            prompt = f"""
-Você é responsável por escrever pequenos textos de agradecimento para a equipe de uma escola infantil montessoriana.
+        mode = "r+" if rows_done else "w"
+        with open(output_csv_path, mode, encoding="utf-8", newline="") as f_out:
+            writer = csv.DictWriter(f_out, fieldnames=fieldnames)
 
-A partir das informações abaixo, escreva um pequeno texto de feedback em nome da família do Keita.
-para a pessoa mencionada, para ser entregue como um cartão de agradecimento.
+            if rows_done:
+                # Drop anything written after the last committed checkpoint
+                f_out.seek(offset)
+                f_out.truncate()
+            else:
+                writer.writeheader()
 
-Regras:
-- Escreva em português do Brasil.
-- Use 2 a 4 frases.
-- Seja carinhoso e afetuoso, pois são pessoas muito queridas.
-- A mensagem deve ser direcionado ao agradecimento e felicitações para as festas natalinas e ano novo.
-- A mensagem deve conter agradecimentos se houver.
-- Caso não tenha muitas informações deixe a mensagem um pouco mais genérica.
-- Não invente fatos novos, apenas reformule e organize o que já está dito.
-- Se o texto original estiver confuso ou com erros de digitação, corrija na sua resposta.
-- Use o nome da pessoa no texto pelo menos uma vez.
+            def checkpoint():
+                f_out.flush()
+                os.fsync(f_out.fileno())
+                write_journal(journal_path, done, f_out.tell(), fingerprint)
 
-Dados:
-- Nome: {name}
-- Experiência positiva: {experience}
-"""
+            pending_rows = (row for index, row in enumerate(reader) if index >= rows_done)
 
+            done = rows_done
             try:
-                response = agent.invoke(
-                    {
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": prompt.strip(),
-                            }
-                        ]
-                    }
-                )
-
-                structured = cast(FeedbackResponse, response["structured_response"])
-                feedback_text = structured.feedback
-                print(feedback_text)
-
-                row[feedback_column] = (feedback_text or "").strip()
-
-            except Exception as e:
-                row[feedback_column] = f"Erro ao gerar feedback: {e}"
-
-            rows_out.append(row)
-
-    with open(output_csv_path, "w", encoding="utf-8", newline="") as f_out:
-        writer = csv.DictWriter(f_out, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows_out)
+                for row in map_ordered(process, pending_rows, max_concurrency):
+                    writer.writerow(row)
+                    done += 1
+                    if done % flush_every == 0:
+                        checkpoint()
+                    if on_progress is not None:
+                        on_progress(done, total)
+            finally:
+                checkpoint()
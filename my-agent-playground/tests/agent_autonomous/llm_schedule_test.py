@@ -0,0 +1,68 @@
+import src.agent_autonomous.main as main_module
+from src.agent_autonomous.models import Classroom, Professor, Requirement, ScheduleResponse, SchoolFacts, Slot, Subject
+from src.agent_autonomous.validator import ScheduleValidator
+
+HOURS = [9, 10, 11]
+FACTS = SchoolFacts(
+    days=["mon"],
+    hours=HOURS,
+    professors=[Professor(name="Ana", available_days=["mon"], available_hours=HOURS, subjects=["Mathematics"])],
+    requirements=[
+        Requirement(classroom="1A", subject="Mathematics", lessons=1),
+        Requirement(classroom="2A", subject="Mathematics", lessons=1),
+    ],
+)
+
+
+def lesson(classroom: str, hour: int) -> Classroom:
+    return Classroom(
+        name=classroom,
+        subjects=[Subject(name="Mathematics")],
+        slots=[Slot(day="mon", hour=hour, subject="Mathematics", teacher="Ana", classroom=classroom)],
+    )
+
+
+class ScriptedAgent:
+    """Books 1A at `hour`; 2A always clashes with it."""
+
+    def __init__(self, hour: int = 10):
+        self.hour = hour
+        self.calls = []
+
+    def invoke(self, data):
+        name = "2A" if "class group 2A" in data["messages"][1]["content"] else "1A"
+        self.calls.append(name)
+        return {"structured_response": ScheduleResponse(classroom=lesson(name, self.hour)), "messages": data["messages"]}
+
+
+def test_only_rejected_classrooms_are_solved(monkeypatch):
+    agent = ScriptedAgent()
+    monkeypatch.setattr(main_module, "create_schedule_agent", lambda response_format: agent)
+
+    timetable = main_module.llm_schedule(FACTS, max_attempts=2)
+
+    assert agent.calls == ["1A", "2A", "2A"]
+    assert [c.name for c in timetable] == ["1A", "2A"]
+    assert timetable[0] == lesson("1A", 10)  # the model's accepted timetable is kept
+    assert timetable[1].slots[0].hour != 10
+    assert ScheduleValidator(FACTS.professors, FACTS.requirements, FACTS.days, FACTS.hours).validate(timetable) == []
+
+
+def test_everything_is_solved_when_the_rest_no_longer_fits(monkeypatch):
+    agent = ScriptedAgent(hour=9)
+    monkeypatch.setattr(main_module, "create_schedule_agent", lambda response_format: agent)
+    facts = FACTS.model_copy(update={
+        "hours": [9, 10],
+        "professors": [
+            Professor(name="Ana", available_days=["mon"], available_hours=[9, 10], subjects=["Mathematics"]),
+            Professor(name="Bruno", available_days=["mon"], available_hours=[10], subjects=["History"]),
+        ],
+        "requirements": FACTS.requirements + [Requirement(classroom="2A", subject="History", lessons=1)],
+    })
+
+    timetable = main_module.llm_schedule(facts, max_attempts=1)
+
+    # With 1A at 9h, 2A needs Ana and Bruno both at 10h; solving both moves 1A
+    assert [c.name for c in timetable] == ["1A", "2A"]
+    assert timetable[0].slots[0].hour == 10
+    assert ScheduleValidator(facts.professors, facts.requirements, facts.days, facts.hours).validate(timetable) == []
@@ -0,0 +1,87 @@
+import pytest
+
+from src.agent_autonomous.models import Classroom, Professor, Requirement, SchoolFacts, Slot, Subject
+from src.agent_autonomous.solver import UnsatisfiableError, partition, solve, solve_batch
+from src.agent_autonomous.validator import ScheduleValidator
+
+DAYS = ["Monday", "Tuesday", "Wednesday"]
+HOURS = [8, 9, 10, 11]
+
+
+def make_facts(classrooms=("1A", "2A")) -> SchoolFacts:
+    professors = [
+        Professor(name="Ana", available_days=["mon", "tue"], available_hours=HOURS, subjects=["Mathematics"]),
+        Professor(name="Bruno", available_days=DAYS, available_hours=[9, 10], subjects=["History", "Art"]),
+        Professor(name="Carla", available_days=["wed"], available_hours=HOURS, subjects=["Chemistry"]),
+    ]
+    requirements = [
+        Requirement(classroom=name, subject=subject, lessons=lessons)
+        for name in classrooms
+        for subject, lessons in (("Mathematics", 3), ("History", 2), ("Chemistry", 1))
+    ]
+    return SchoolFacts(days=DAYS, hours=HOURS, professors=professors, requirements=requirements)
+
+
+def validator_for(facts: SchoolFacts) -> ScheduleValidator:
+    return ScheduleValidator(facts.professors, facts.requirements, facts.days, facts.hours)
+
+
+def test_solved_timetable_has_no_violations():
+    facts = make_facts()
+    timetable = solve(facts)
+
+    assert [c.name for c in timetable] == ["1A", "2A"]
+    assert validator_for(facts).validate(timetable) == []
+
+
+def test_unsatisfiable_input_raises():
+    facts = make_facts()
+    # Carla only has wednesday's four hours
+    facts.requirements.append(Requirement(classroom="3A", subject="Chemistry", lessons=3))
+
+    with pytest.raises(UnsatisfiableError, match="Carla"):
+        solve(facts)
+
+
+def test_unknown_subject_raises():
+    facts = make_facts(["1A"])
+    facts.requirements.append(Requirement(classroom="1A", subject="Latin", lessons=1))
+
+    with pytest.raises(UnsatisfiableError, match="Latin"):
+        solve(facts)
+
+
+def test_booked_lessons_of_other_classrooms_are_avoided():
+    facts = make_facts(["2A"])
+    booked = [Slot(day="Monday", hour=hour, subject="Mathematics", teacher="Ana", classroom="1A") for hour in HOURS]
+
+    timetable = solve(facts, booked=booked)
+
+    assert all(not (slot.teacher == "Ana" and slot.day == "mon") for slot in timetable[0].slots)
+    assert validator_for(facts).validate(timetable, booked) == []
+
+
+def test_validator_reports_clashes_with_booked_lessons():
+    facts = make_facts(["2A"])
+    booked = [Slot(day="mon", hour=8, subject="Mathematics", teacher="Ana", classroom="1A")]
+    classroom = Classroom(
+        name="2A",
+        subjects=[Subject(name="Mathematics")],
+        slots=[Slot(day="mon", hour=8, subject="Mathematics", teacher="Ana", classroom="2A")],
+    )
+
+    clashes = [v for v in validator_for(facts).validate([classroom], booked) if v.kind == "teacher_double_booked"]
+
+    assert [v.message for v in clashes] == ["Ana already teaches 1A on mon at 8h"]
+
+
+def test_solve_batch_in_processes_matches_a_single_solve():
+    facts = make_facts(["1A"])
+    facts.professors.append(Professor(name="Davi", available_days=DAYS, available_hours=HOURS, subjects=["Music"]))
+    facts.requirements.append(Requirement(classroom="4B", subject="Music", lessons=2))
+    assert len(partition(facts)) == 2
+
+    timetable = solve_batch(facts, max_workers=2)
+
+    assert [c.name for c in timetable] == ["1A", "4B"]
+    assert validator_for(facts).validate(timetable) == []
@@ -0,0 +1,81 @@
+import sqlite3
+
+import pytest
+
+from src.agent_autonomous.models import Classroom, Professor, Requirement, SchoolFacts, Slot, Subject
+from src.agent_autonomous.queries import other_bookings, teacher_schedule
+from src.agent_autonomous.solver import solve
+from src.agent_autonomous.storage import MIGRATIONS, ScheduleConflictError, SchoolStore, schema_version
+from src.agent_autonomous.validator import ScheduleValidator
+
+HOURS = [9, 10, 11]
+ANA = Professor(name="Ana", available_days=["mon"], available_hours=HOURS, subjects=["Mathematics"])
+
+
+def facts_for(classroom: str, lessons: int) -> SchoolFacts:
+    return SchoolFacts(
+        days=["mon"],
+        hours=HOURS,
+        professors=[ANA],
+        requirements=[Requirement(classroom=classroom, subject="Mathematics", lessons=lessons)],
+    )
+
+
+def test_migration_from_v1_keeps_slots_and_sets_conflicts_aside(tmp_path):
+    path = str(tmp_path / "school.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(MIGRATIONS[0] + "PRAGMA user_version = 1;")
+    conn.executemany("INSERT INTO slot (day, hour, subject, teacher, classroom) VALUES (?, ?, ?, ?, ?)", [
+        ("mon", 9, "Mathematics", "Ana", "1A"),
+        ("mon", 10, "History", "Bruno", "1A"),
+        ("mon", 9, "Mathematics", "Ana", "2A"),  # Ana double-booked
+    ])
+    conn.commit()
+    conn.close()
+
+    with SchoolStore(path) as store:
+        assert schema_version(store.conn) == len(MIGRATIONS)
+        assert store.fetchall("SELECT classroom, hour FROM slot ORDER BY id") == [("1A", 9), ("1A", 10)]
+        assert store.fetchall("SELECT classroom FROM slot_conflict") == [("2A",)]
+        assert store.fetchall("SELECT name FROM professor ORDER BY name") == [("Ana",), ("Bruno",)]
+
+
+def test_persist_rejects_double_booking_and_writes_nothing(tmp_path):
+    with SchoolStore(str(tmp_path / "school.db")) as store:
+        store.persist_classrooms(solve(facts_for("1A", 1)))
+        clash = Classroom(
+            name="2A",
+            subjects=[Subject(name="Mathematics")],
+            slots=[Slot(day="mon", hour=9, subject="Mathematics", teacher="Ana", classroom="2A")],
+        )
+
+        with pytest.raises(ScheduleConflictError):
+            store.persist_classrooms([clash])
+        assert [slot.classroom for slot in teacher_schedule(store, "Ana")] == ["1A"]
+
+
+def test_rerun_for_other_classrooms_schedules_around_stored_lessons(tmp_path):
+    with SchoolStore(str(tmp_path / "school.db")) as store:
+        store.persist_classrooms(solve(facts_for("1A", 2)))
+
+        facts = facts_for("2A", 1)
+        booked = other_bookings(store, ["2A"])
+        timetable = solve(facts, booked=booked)
+        assert ScheduleValidator(facts.professors, facts.requirements, facts.days, facts.hours).validate(
+            timetable, booked
+        ) == []
+        store.persist_classrooms(timetable)
+
+        assert sorted((s.hour, s.classroom) for s in teacher_schedule(store, "Ana")) == [
+            (9, "1A"), (10, "1A"), (11, "2A"),
+        ]
+
+
+def test_rerun_of_the_same_classroom_replaces_its_lessons(tmp_path):
+    with SchoolStore(str(tmp_path / "school.db")) as store:
+        store.persist_classrooms(solve(facts_for("1A", 2)))
+        assert other_bookings(store, ["1A"]) == []
+
+        store.persist_classrooms(solve(facts_for("1A", 3)))
+
+        assert [s.hour for s in teacher_schedule(store, "Ana")] == HOURS
@@ -0,0 +1,86 @@
+import asyncio
+
+from src.agent_examples.tool_cache import ToolResultCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_concurrent_async_misses_share_one_call():
+    cache = ToolResultCache("t")
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(*(cache.aget_or_compute("k", slow) for _ in range(8)))
+
+    assert asyncio.run(run()) == ["value"] * 8
+    assert len(calls) == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_concurrent_async_misses_share_the_failure():
+    cache = ToolResultCache("t")
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise RuntimeError("backend down")
+
+    async def run():
+        return await asyncio.gather(*(cache.aget_or_compute("k", fail) for _ in range(4)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert asyncio.run(cache.aget_or_compute("k", lambda: asyncio.sleep(0, "ok"))) == "ok"
+
+
+def test_async_refresh_dropped_with_its_loop_is_retried():
+    clock = FakeClock()
+    cache = ToolResultCache("t", ttl_seconds=10, stale_seconds=60, clock=clock)
+    cache.get_or_compute("k", lambda: "old")
+    clock.now = 20
+
+    async def never():
+        await asyncio.Event().wait()
+
+    # The refresh task is still pending when its loop is closed
+    loop = asyncio.new_event_loop()
+    loop.set_exception_handler(lambda loop, context: None)  # "Task was destroyed but it is pending!"
+    assert loop.run_until_complete(cache.aget_or_compute("k", never)) == "old"
+    loop.close()
+
+    async def refresh_again():
+        stale = await cache.aget_or_compute("k", lambda: asyncio.sleep(0, "new"))
+        await asyncio.sleep(0.01)
+        return stale
+
+    assert asyncio.run(refresh_again()) == "old"
+    assert cache.stats()["refreshes"] == 1
+    assert cache.get_or_compute("k", lambda: "unused") == "new"
+
+
+def test_cancelled_async_refresh_is_cleared():
+    clock = FakeClock()
+    cache = ToolResultCache("t", ttl_seconds=10, stale_seconds=60, clock=clock)
+    cache.get_or_compute("k", lambda: "old")
+    clock.now = 20
+
+    async def never():
+        await asyncio.Event().wait()
+
+    # asyncio.run cancels the pending refresh on exit
+    assert asyncio.run(cache.aget_or_compute("k", never)) == "old"
+
+    assert cache._refreshing == {}
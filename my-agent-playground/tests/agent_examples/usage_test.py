@@ -0,0 +1,153 @@
+import csv
+import itertools
+import json
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.agent_examples.usage import (
+    ModelPrice,
+    Usage,
+    UsageBudgetExceeded,
+    UsageLedger,
+    message_usage,
+    price_for,
+)
+from src.feedback_creator.utils import FeedbackResponse, generate_feedback_csv
+
+MINI = "gpt-4o-mini-2024-07-18"
+
+
+def ai(id=None, model=MINI, input_tokens=1000, output_tokens=100, cached=0, **usage):
+    return AIMessage(
+        "ok",
+        id=id,
+        response_metadata={"model_name": model},
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "input_token_details": {"cache_read": cached},
+            **usage,
+        },
+    )
+
+
+def test_message_usage_reads_usage_metadata():
+    assert message_usage(ai(cached=400)) == (MINI, Usage(1, 1000, 400, 100))
+
+
+def test_message_usage_falls_back_to_openai_token_usage():
+    message = AIMessage("ok", response_metadata={"model_name": "gpt-4o", "token_usage": {
+        "prompt_tokens": 30, "completion_tokens": 5, "prompt_tokens_details": {"cached_tokens": 10},
+    }})
+    assert message_usage(message) == ("gpt-4o", Usage(1, 30, 10, 5))
+
+
+def test_message_usage_ignores_other_messages_and_counts_cache_hits():
+    assert message_usage(HumanMessage("hi")) is None
+    assert message_usage(AIMessage("no usage")) is None
+    assert message_usage(ai(total_cost=0)) == (MINI, Usage(cache_hits=1))
+
+
+def test_price_is_matched_by_longest_prefix():
+    assert price_for(MINI).input == 0.15
+    assert price_for("gpt-4o-2024-08-06").input == 2.50
+    assert price_for("claude") is None
+
+
+def test_add_response_counts_each_message_once():
+    ledger = UsageLedger()
+    history = [HumanMessage("hi"), ai("a"), HumanMessage("again"), ai("b")]
+
+    assert ledger.add_response({"messages": history[:2]}) == 1
+    assert ledger.add_response({"messages": history}) == 1
+    assert ledger.add_response({"messages": history}) == 0
+
+    assert ledger.total() == Usage(2, 2000, 0, 200)
+    assert ledger.cost() == pytest.approx(2 * (1000 * 0.15 + 100 * 0.60) / 1e6)
+
+
+def test_cache_hits_are_counted_apart_at_zero_cost():
+    ledger = UsageLedger()
+    ledger.add_response({"messages": [ai("a")]}, stage="feedback")
+    # A response cache hit replays the original message id with total_cost 0
+    ledger.add_response({"messages": [ai("a", total_cost=0), ai("b", total_cost=0)]}, stage="feedback")
+
+    assert ledger.total() == Usage(calls=1, input_tokens=1000, output_tokens=100, cache_hits=2)
+    assert ledger.by_stage()["feedback"].cache_hits == 2
+    assert ledger.cost() == pytest.approx((1000 * 0.15 + 100 * 0.60) / 1e6)
+
+
+def test_cached_input_tokens_use_the_cached_price():
+    prices = {"m": ModelPrice(input=1.0, cached_input=0.5, output=2.0)}
+    ledger = UsageLedger(prices=prices)
+    ledger.add("m", Usage(1, 1_000_000, 400_000, 1_000_000))
+
+    assert ledger.cost() == pytest.approx(0.6 + 0.2 + 2.0)
+
+
+def test_load_sums_calls_appended_by_several_ledgers(tmp_path):
+    path = str(tmp_path / "usage.jsonl")
+    first, second = UsageLedger(path=path), UsageLedger(path=path)
+    first.add_message(ai("a"), stage="feedback")
+    second.add_message(ai("b", model="gpt-4o"), stage="summary")
+    second.add_message(ai("c", total_cost=0), stage="summary")
+
+    with open(path, encoding="utf-8") as f:
+        assert len([json.loads(line) for line in f]) == 3
+    loaded = UsageLedger.load(path)
+    assert loaded.total() == Usage(calls=2, input_tokens=2000, output_tokens=200, cache_hits=1)
+    assert set(loaded.by_model()) == {MINI, "gpt-4o"}
+    assert loaded.cost() == pytest.approx(first.cost() + second.cost())
+
+
+def test_token_budget_and_unknown_prices():
+    ledger = UsageLedger(token_budget=2000)
+    ledger.add_message(ai("a"))
+    ledger.ensure_budget()
+    ledger.add_message(ai("b"))
+    with pytest.raises(UsageBudgetExceeded):
+        ledger.ensure_budget()
+
+    priced = UsageLedger(budget_usd=1.0)
+    with pytest.warns(RuntimeWarning, match="no price"):
+        priced.add_message(ai("c", model="some-local-model"))
+    assert priced.cost() == 0
+
+
+class UsageAgent:
+    """Fake feedback agent whose every call costs 1000 input + 100 output gpt-4o-mini tokens."""
+
+    def __init__(self):
+        self.ids = itertools.count()
+        self.calls = 0
+
+    def invoke(self, data):
+        self.calls += 1
+        return {
+            "messages": [ai(f"call-{next(self.ids)}")],
+            "structured_response": FeedbackResponse(feedback="Obrigado!"),
+        }
+
+
+def test_budget_stops_the_feedback_run_and_a_rerun_resumes(tmp_path):
+    input_csv, output_csv = tmp_path / "input.csv", tmp_path / "output.csv"
+    with open(input_csv, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "positive experience"])
+        writer.writerows([f"Pessoa {i}", "Carinho"] for i in range(6))
+
+    agent = UsageAgent()
+    # Each row costs $0.00021, so the budget is spent during the third row
+    usage = UsageLedger(budget_usd=0.0005)
+    with pytest.raises(UsageBudgetExceeded):
+        generate_feedback_csv(input_csv, output_csv, agent, usage=usage)
+    assert agent.calls == 3
+    with open(output_csv, encoding="utf-8") as f:
+        assert len(list(csv.DictReader(f))) == 3
+
+    generate_feedback_csv(input_csv, output_csv, agent, usage=UsageLedger(budget_usd=1.0))
+    assert agent.calls == 6
+    with open(output_csv, encoding="utf-8") as f:
+        assert [row["name"] for row in csv.DictReader(f)] == [f"Pessoa {i}" for i in range(6)]
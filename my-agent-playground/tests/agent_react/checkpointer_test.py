@@ -0,0 +1,78 @@
+import time
+from typing import Annotated
+
+from typing_extensions import TypedDict
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import StateGraph, START, END
+from langgraph.graph.message import add_messages
+
+from src.agent_react.checkpointer import SQLiteDeltaSaver
+
+
+class ChatState(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+def reply(state: ChatState) -> ChatState:
+    return {"messages": [AIMessage("reply")]}
+
+
+def edit_first(state: ChatState) -> ChatState:
+    return {"messages": [HumanMessage("EDITED", id=state["messages"][0].id)]}
+
+
+def build_app(checkpointer, node=reply):
+    graph = StateGraph(ChatState)
+    graph.add_node("node", node)
+    graph.add_edge(START, "node")
+    graph.add_edge("node", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def contents(saver, thread_id):
+    config = {"configurable": {"thread_id": thread_id}}
+    return [m.content for m in saver.get_tuple(config).checkpoint["channel_values"]["messages"]]
+
+
+def test_appended_messages_are_stored_as_deltas_and_resume(tmp_path):
+    path = str(tmp_path / "checkpoints.db")
+    saver = SQLiteDeltaSaver(path)
+    app = build_app(saver)
+    config = {"configurable": {"thread_id": "1"}}
+    for turn in range(3):
+        app.invoke({"messages": [HumanMessage(f"turn {turn}")]}, config)
+    saver.close()
+
+    cold = SQLiteDeltaSaver(path)
+    assert contents(cold, "1") == ["turn 0", "reply", "turn 1", "reply", "turn 2", "reply"]
+    depths = [d for (d,) in cold.conn.execute("SELECT depth FROM blobs WHERE channel = 'messages'")]
+    assert max(depths) > 0
+    cold.close()
+
+
+def test_message_replaced_through_its_id_survives_a_restart(tmp_path):
+    path = str(tmp_path / "checkpoints.db")
+    saver = SQLiteDeltaSaver(path)
+    config = {"configurable": {"thread_id": "1"}}
+    build_app(saver).invoke({"messages": [HumanMessage("first")]}, config)
+    build_app(saver, edit_first).invoke({"messages": [HumanMessage("second")]}, config)
+    assert contents(saver, "1") == ["EDITED", "reply", "second"]
+    saver.close()
+
+    cold = SQLiteDeltaSaver(path)
+    assert contents(cold, "1") == ["EDITED", "reply", "second"]
+    cold.close()
+
+
+def test_reading_a_thread_refreshes_its_ttl(tmp_path):
+    saver = SQLiteDeltaSaver(str(tmp_path / "checkpoints.db"), ttl_seconds=60)
+    app = build_app(saver)
+    for thread_id in ("read", "idle"):
+        app.invoke({"messages": [HumanMessage("hi")]}, {"configurable": {"thread_id": thread_id}})
+    saver.conn.execute("UPDATE threads SET last_access = ?", (time.time() - 120,))
+
+    saver.get_tuple({"configurable": {"thread_id": "read"}})
+
+    assert saver.evict_idle_threads() == ["idle"]
+    assert saver.get_tuple({"configurable": {"thread_id": "idle"}}) is None
+    saver.close()
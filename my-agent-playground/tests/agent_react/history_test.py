@@ -0,0 +1,84 @@
+import itertools
+import threading
+
+from langchain.agents import create_agent
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.agent_react.history import SUMMARY_PREFIX, HistoryCompactionMiddleware
+
+
+class FakeSummaryModel:
+    """Summarizes by counting; `release` holds background summaries back."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def invoke(self, messages):
+        self.release.wait(timeout=5)
+        self.calls += 1
+        return AIMessage(f"summary #{self.calls}")
+
+
+def conversation(turns: int):
+    return [
+        message
+        for turn in range(turns)
+        for message in (HumanMessage(f"question {turn}"), AIMessage(f"answer {turn}"))
+    ]
+
+
+def test_reports_are_bounded_and_not_printed_by_default(capsys):
+    history = HistoryCompactionMiddleware(max_messages=4, max_reports=2)
+    agent = create_agent(model=GenericFakeChatModel(messages=itertools.repeat(AIMessage("hi"))), middleware=[history])
+
+    for _ in range(3):
+        agent.invoke({"messages": [{"role": "user", "content": "hello"}]})
+
+    assert len(history.reports) == 2
+    assert capsys.readouterr().out == ""
+
+
+def test_window_without_summary_model_drops_old_messages():
+    history = HistoryCompactionMiddleware(max_messages=4)
+    messages = conversation(10)
+
+    compacted, report = history.compact(messages)
+
+    assert compacted == messages[-4:]
+    assert report.summarized == 0
+
+
+def test_window_keeps_messages_until_their_summary_is_ready():
+    model = FakeSummaryModel()
+    history = HistoryCompactionMiddleware(max_messages=4, summary_model=model)
+    messages = conversation(10)
+
+    model.release.clear()
+    compacted, _ = history.compact(messages, "t")
+    assert compacted == messages  # nothing is dropped before it is summarized
+
+    model.release.set()
+    history.wait_for_summaries(timeout=5)
+    compacted, report = history.compact(messages, "t")
+
+    assert compacted[0].content == f"{SUMMARY_PREFIX}\nsummary #1"
+    assert compacted[1:] == messages[-4:]
+    assert report.summarized == 16
+    history.close()
+
+
+def test_token_budget_summarizes_what_it_drops():
+    model = FakeSummaryModel()
+    history = HistoryCompactionMiddleware(max_tokens=60, summary_model=model)
+    messages = conversation(10)
+
+    compacted, report = history.compact(messages, "t")
+
+    assert model.calls == 1
+    assert compacted[0].content.startswith(SUMMARY_PREFIX)
+    assert report.summarized == len(messages) - (len(compacted) - 1)
+    assert compacted[1:] == messages[report.summarized:]
+    history.close()
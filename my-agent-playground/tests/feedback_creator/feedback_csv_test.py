@@ -0,0 +1,93 @@
+import csv
+import threading
+import time
+
+import pytest
+
+from src.feedback_creator.benchmark import FakeFeedbackAgent, write_roster
+from src.feedback_creator.utils import generate_feedback, generate_feedback_csv, map_ordered
+
+
+def test_map_ordered_keeps_input_order_within_max_concurrency():
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def slow(item: dict) -> dict:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        # Later items finish first
+        time.sleep(0.002 * (20 - item["i"] % 20))
+        with lock:
+            in_flight -= 1
+        return {"i": item["i"], "done": True}
+
+    results = list(map_ordered(slow, ({"i": i} for i in range(40)), max_concurrency=4))
+
+    assert [row["i"] for row in results] == list(range(40))
+    assert 1 < peak <= 4
+
+
+def test_map_ordered_pulls_items_lazily():
+    pulled = []
+
+    def items():
+        for i in range(100):
+            pulled.append(i)
+            yield {"i": i}
+
+    results = map_ordered(lambda item: item, items(), max_concurrency=3)
+    assert next(results) == {"i": 0}
+    assert len(pulled) <= 2 * 3
+    results.close()
+
+
+def test_generate_feedback_prints_nothing(capsys):
+    assert generate_feedback(FakeFeedbackAgent(latency=0), "Ana", "Muito carinho") == "Obrigado!"
+    assert capsys.readouterr().out == ""
+
+
+class InterruptingAgent(FakeFeedbackAgent):
+    """Counts calls and is interrupted (like Ctrl+C) on call number `stop_at`."""
+
+    def __init__(self, stop_at=None):
+        super().__init__(latency=0)
+        self.stop_at = stop_at
+        self.calls = 0
+
+    def invoke(self, data):
+        self.calls += 1
+        if self.calls == self.stop_at:
+            raise KeyboardInterrupt
+        return super().invoke(data)
+
+
+def test_interrupted_run_resumes_from_the_last_committed_row(tmp_path, capsys):
+    input_csv, output_csv = tmp_path / "input.csv", tmp_path / "output.csv"
+    write_roster(input_csv, 10)
+
+    with pytest.raises(KeyboardInterrupt):
+        generate_feedback_csv(input_csv, output_csv, InterruptingAgent(stop_at=6), flush_every=4)
+    # A crash can also leave a half-written row after the last checkpoint
+    with open(output_csv, "a", encoding="utf-8") as f:
+        f.write("Pessoa 5,Muito car")
+
+    agent = InterruptingAgent()
+    generate_feedback_csv(input_csv, output_csv, agent, flush_every=4)
+
+    assert agent.calls == 5
+    assert "5 de 10 linhas já processadas foram puladas" in capsys.readouterr().out
+    with open(output_csv, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["name"] for row in rows] == [f"Pessoa {i}" for i in range(10)]
+    assert {row["feedback"] for row in rows} == {"Obrigado!"}
+
+
+def test_flush_every_must_be_positive(tmp_path):
+    input_csv = tmp_path / "input.csv"
+    write_roster(input_csv, 1)
+
+    with pytest.raises(ValueError, match="flush_every"):
+        generate_feedback_csv(input_csv, tmp_path / "output.csv", FakeFeedbackAgent(0), flush_every=0)